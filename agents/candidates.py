@@ -0,0 +1,83 @@
+"""
+Local, deterministic token candidate extraction run before the token finder.
+
+The token finder is a gpt-4o ReAct loop with up to four tool calls, and most
+posts ("gm", replies, general chat) name no token at all. extract_token_candidates()
+looks for the things a purchasable-token mention almost always carries: an EVM
+0x address, a base58 Solana mint, a $CASHTAG or a link to a DEX, launchpad or
+explorer token page. Posts with none of them get no_candidates_report() instead
+of an LLM run.
+
+The patterns favour recall: a false candidate only costs the LLM call the post
+would have had anyway, while a missed one loses a token mention. Run
+db/scripts/check_candidate_extractor.py to measure both against stored reports.
+"""
+import re
+from typing import Any, Dict, List, NamedTuple
+
+# Reasoning recorded on reports created without the token finder, so they can be told apart
+NO_CANDIDATES_REASONING = "No contract address, $cashtag or DEX link in the text; the token finder was skipped."
+
+# Hosts whose links point at a specific token or pool
+DEX_HOSTS = (
+    'dexscreener.com', 'geckoterminal.com', 'dextools.io', 'birdeye.so', 'defined.fi',
+    'gmgn.ai', 'photon-sol.tinyastro.io', 'bullx.io', 'jup.ag', 'raydium.io',
+    'pump.fun', 'letsbonk.fun', 'believe.app', 'moonshot.money', 'clanker.world',
+    'zora.co', 'app.uniswap.org', 'aerodrome.finance', 'basescan.org', 'solscan.io',
+    'etherscan.io', 'coingecko.com', 'coinmarketcap.com'
+)
+
+_EVM_ADDRESS = re.compile(r'\b0x[0-9a-fA-F]{40}\b')
+# Base58 without 0, O, I and l; real mints mix cases and digits, which keeps long words out
+_SOLANA_MINT = re.compile(r'(?<![0-9A-Za-z])[1-9A-HJ-NP-Za-km-z]{32,44}(?![0-9A-Za-z])')
+# $ followed by a letter, so prices ("$5k") are not cashtags
+_CASHTAG = re.compile(r'(?<![\w$])\$([A-Za-z][A-Za-z0-9]{0,14})\b')
+_DEX_URL = re.compile(
+    r'(?:https?://)?(?:[\w-]+\.)*(?:' + '|'.join(re.escape(host) for host in DEX_HOSTS) + r')(?:/[^\s]*)?',
+    re.IGNORECASE
+)
+
+def _mentions_dex_host(text: str) -> bool:
+    # Substring checks rule most posts out far faster than _DEX_URL scanning every position
+    lowered = text.lower()
+    return any(host in lowered for host in DEX_HOSTS)
+
+def _is_solana_mint(candidate: str) -> bool:
+    return (
+        any(c.isdigit() for c in candidate)
+        and any(c.isupper() for c in candidate)
+        and any(c.islower() for c in candidate)
+    )
+
+class TokenCandidates(NamedTuple):
+    """Token references found in a post's text"""
+    evm_addresses: List[str]
+    solana_mints: List[str]
+    cashtags: List[str]
+    dex_urls: List[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.evm_addresses or self.solana_mints or self.cashtags or self.dex_urls)
+
+def extract_token_candidates(text: str) -> TokenCandidates:
+    """Find contract addresses, Solana mints, $cashtags and DEX links in text."""
+    text = text or ''
+    return TokenCandidates(
+        evm_addresses=_EVM_ADDRESS.findall(text),
+        solana_mints=[m for m in _SOLANA_MINT.findall(text) if _is_solana_mint(m)],
+        cashtags=[tag.upper() for tag in _CASHTAG.findall(text)],
+        dex_urls=_DEX_URL.findall(text) if _mentions_dex_host(text) else []
+    )
+
+def no_candidates_report() -> Dict[str, Any]:
+    """Token report, in the token finder's format, for a post with no token candidates."""
+    return {
+        'mentions_purchasable_token': False,
+        'token_symbol': None,
+        'token_chain': None,
+        'token_address': None,
+        'is_listed_on_dex': None,
+        'trading_pairs': [],
+        'confidence_score': 8,
+        'reasoning': NO_CANDIDATES_REASONING
+    }
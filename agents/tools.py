@@ -5,6 +5,7 @@ import requests
 
 from agents.models import TokenData, TransactionData
 from chains.tavily_chain import retriever as long_retriever, short_retriever
+from observability import observe_external_call
 
 # Tools
 @tool("quick_search")
@@ -81,8 +82,11 @@ def search_tokens(
     headers = {"accept": "application/json"}
     params = {"query": token_symbol, "page": 1}
     
-    response = requests.get(url, headers=headers, params=params)
-    return response.json()
+    with observe_external_call("geckoterminal") as call:
+        response = requests.get(url, headers=headers, params=params)
+        if not response.ok:
+            call.outcome = "error"
+        return response.json()
 
 
 @tool("get_token_data")
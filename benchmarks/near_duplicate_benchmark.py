@@ -0,0 +1,203 @@
+"""
+Benchmark the near-duplicate post index (db/near_duplicates.py) at 1M posts.
+
+Synthesizes a day of KOL-style posts (no database needed): each names one of a
+few thousand tokens, drawn with a long tail, by $cashtag or contract address in
+15 to 40 words of shill vocabulary. All posts are fingerprinted and indexed,
+then the index is queried with:
+
+    emojis       an indexed post with emojis sprinkled in
+    punctuation  an indexed post re-cased, with "!!!" and "..." added
+    sentence     an indexed post with a sentence of 4 to 8 words appended
+    word         an indexed post with one word replaced
+    same token   a new post about the same token as an indexed one (negative)
+    other token  an indexed post's text naming a different token (negative)
+    unrelated    a new post about a token not in the index (negative)
+
+and reports recall per variant, the false match rate per negative, precision
+over all matches (a match is correct when it returns the post the query was
+derived from), lookup latency, build time, peak memory and the fingerprint cost,
+for each similarity threshold.
+
+Usage:
+    python benchmarks/near_duplicate_benchmark.py [--posts 1000000] [--queries 20000] [--thresholds 0.6,0.7,0.8]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import resource
+import itertools
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.near_duplicates import NearDuplicateIndex, post_fingerprint
+
+EMOJIS = ['🚀', '🔥', '💎', '🙌', '📈', '🐸', '👀', '✅', '💰', '🌕']
+VARIANTS = ['emojis', 'punctuation', 'sentence', 'word']
+NEGATIVES = ['same token', 'other token', 'unrelated']
+
+
+def build_vocabulary(rng: random.Random, size: int = 5000):
+    """Pseudo-words, the first few hundred of which (shill staples) are drawn far more often."""
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = list(dict.fromkeys(
+        ''.join(rng.choice(letters) for _ in range(rng.randint(2, 9))) for _ in range(size * 2)
+    ))[:size]
+    return words, list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+
+
+def build_tokens(rng: random.Random, count: int):
+    tokens = []
+    for i in range(count):
+        if rng.random() < 0.5:
+            tokens.append(f"${'ABCDEFGHJKLMNPQRSTUVWXYZ'[i % 24]}{i:X}")
+        else:
+            tokens.append('0x' + ''.join(rng.choice('0123456789abcdef') for _ in range(40)))
+    return tokens
+
+
+class PostGenerator:
+    """Random posts and their near-duplicate and negative variants."""
+
+    def __init__(self, seed: int, tokens: int):
+        self.rng = random.Random(seed)
+        self.words, self.cum_weights = build_vocabulary(self.rng)
+        self.tokens = build_tokens(self.rng, tokens)
+        # Token popularity follows a long tail, so popular tokens share buckets with many posts
+        self.token_cum_weights = list(itertools.accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(self.tokens))))
+
+    def sentence(self, low: int, high: int):
+        return self.rng.choices(self.words, cum_weights=self.cum_weights, k=self.rng.randint(low, high))
+
+    def post(self, token: str):
+        words = self.sentence(15, 40)
+        words.insert(self.rng.randint(0, len(words)), token)
+        return words
+
+    def token(self):
+        return self.rng.choices(self.tokens, cum_weights=self.token_cum_weights)[0]
+
+    def variant(self, words, kind: str) -> str:
+        rng = self.rng
+        words = list(words)
+        if kind == 'emojis':
+            for _ in range(rng.randint(1, 4)):
+                words.insert(rng.randint(0, len(words)), rng.choice(EMOJIS))
+        elif kind == 'punctuation':
+            words = [w.upper() if rng.random() < 0.2 and not w.startswith(('0x', '$')) else w for w in words]
+            words[-1] += rng.choice(['!!!', '...', ' 👇'])
+            words[0] = words[0].capitalize() if not words[0].startswith(('0x', '$')) else words[0]
+        elif kind == 'sentence':
+            words[-1] += '.'
+            words += self.sentence(4, 8)
+        elif kind == 'word':
+            positions = [i for i, w in enumerate(words) if not w.startswith(('0x', '$'))]
+            words[rng.choice(positions)] = rng.choice(self.words)
+        return ' '.join(words)
+
+    def other_token(self, words, token: str) -> str:
+        other = self.token()
+        while other == token:
+            other = self.token()
+        return ' '.join(other if w == token else w for w in words)
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the near-duplicate post index')
+    parser.add_argument('--posts', type=int, default=1_000_000, help='Posts in the index')
+    parser.add_argument('--queries', type=int, default=20_000, help='Queries per variant and negative kind')
+    parser.add_argument('--tokens', type=int, default=20_000, help='Distinct tokens the posts name')
+    parser.add_argument('--thresholds', default='0.6,0.7,0.8', help='Comma-separated similarity thresholds')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    generator = PostGenerator(args.seed, args.tokens)
+    # Tokens the unrelated negatives name, kept out of the index
+    unseen_tokens = build_tokens(random.Random(args.seed + 1), 1000)
+    unseen_tokens = [t + 'x' if t.startswith('$') else '0x' + t[2:][::-1] for t in unseen_tokens]
+
+    print(f"Generating and fingerprinting {args.posts} posts...")
+    start = time.perf_counter()
+    fingerprints = []
+    sources = {}  # post number -> (words, token) of the posts queries are derived from
+    sample = set(random.Random(args.seed + 2).sample(range(args.posts), min(args.posts, args.queries * 3)))
+    for n in range(args.posts):
+        token = generator.token()
+        words = generator.post(token)
+        fingerprints.append(post_fingerprint(' '.join(words)))
+        if n in sample:
+            sources[n] = (words, token)
+    elapsed = time.perf_counter() - start
+    print(f"  {elapsed:.1f}s, {elapsed / args.posts * 1e6:.1f} us per post (generation included)")
+
+    # Fingerprint cost alone, on texts of the same length
+    texts = [' '.join(generator.post(generator.token())) for _ in range(10_000)]
+    start = time.perf_counter()
+    for text in texts:
+        post_fingerprint(text)
+    fingerprint_us = (time.perf_counter() - start) / len(texts) * 1e6
+    print(f"  post_fingerprint: {fingerprint_us:.1f} us per post")
+
+    source_ids = sorted(sources)
+    query_rng = random.Random(args.seed + 3)
+    queries = []  # (kind, expected post number or None, fingerprint)
+    for kind in VARIANTS:
+        for n in query_rng.sample(source_ids, min(len(source_ids), args.queries)):
+            words, _ = sources[n]
+            queries.append((kind, n, post_fingerprint(generator.variant(words, kind))))
+    for n in query_rng.sample(source_ids, min(len(source_ids), args.queries)):
+        words, token = sources[n]
+        queries.append(('same token', None, post_fingerprint(' '.join(generator.post(token)))))
+        queries.append(('other token', None, post_fingerprint(generator.other_token(words, token))))
+        unrelated = generator.post(query_rng.choice(unseen_tokens))
+        queries.append(('unrelated', None, post_fingerprint(' '.join(unrelated))))
+
+    for threshold in (float(t) for t in args.thresholds.split(',')):
+        index = NearDuplicateIndex(threshold=threshold, max_age_seconds=7 * 24 * 3600)
+        start = time.perf_counter()
+        for n, fingerprint in enumerate(fingerprints):
+            if fingerprint is not None:
+                index.add(fingerprint, n)
+        build_seconds = time.perf_counter() - start
+
+        found = {kind: 0 for kind in VARIANTS + NEGATIVES}
+        asked = {kind: 0 for kind in VARIANTS + NEGATIVES}
+        correct = matches = 0
+        latencies = []
+        for kind, expected, fingerprint in queries:
+            asked[kind] += 1
+            if fingerprint is None:
+                continue
+            start = time.perf_counter()
+            match = index.find(fingerprint)
+            latencies.append((time.perf_counter() - start) * 1e6)
+            if match is None:
+                continue
+            matches += 1
+            found[kind] += 1
+            if match[0] == expected:
+                correct += 1
+
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"\nthreshold {threshold}: {len(index)} posts indexed in {build_seconds:.1f}s "
+              f"({build_seconds / args.posts * 1e6:.1f} us per post), peak RSS {peak_mb:.0f} MB")
+        for kind in VARIANTS:
+            print(f"  recall {kind:<12} {found[kind] / asked[kind]:7.2%}")
+        for kind in NEGATIVES:
+            print(f"  false matches {kind:<12} {found[kind] / asked[kind]:7.3%}")
+        print(f"  precision            {correct / matches if matches else 0:7.2%} ({correct}/{matches})")
+        print(f"  lookup latency       p50 {statistics.median(latencies):.1f} us, "
+              f"p99 {percentile(latencies, 0.99):.1f} us, max {max(latencies):.1f} us")
+        del index
+
+
+if __name__ == "__main__":
+    main()
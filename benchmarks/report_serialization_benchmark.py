@@ -0,0 +1,217 @@
+"""
+Benchmark /api/alpha_reports serialization on a realistic day of reports.
+
+Builds an in-memory day of alpha reports (no database needed), each with one to
+three opportunities linked to a token and to a token report with its social
+media post, then times rendering the response body two ways:
+
+    legacy   SQLModel rows -> Pydantic AlphaReport models -> .dict() ->
+             jsonable_encoder(exclude_none, custom datetime encoder) -> JSONResponse
+    orjson   SQLModel rows -> plain dicts (_alpha_report_dict) -> orjson.dumps
+
+Both bodies are decoded and compared before timing, so the fast path is checked
+to produce the same JSON.
+
+Usage:
+    python benchmarks/report_serialization_benchmark.py [--reports 1000] [--repeats 20]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from db.models.alpha import AlphaReportDB, TokenOpportunityDB
+from db.models.social import SocialMediaPostDB, TokenReportDB
+from db.models.token import TokenDB
+from routers.api_models import AlphaReport, TokenOpportunity, TokenData
+from routers.api_queries import _alpha_report_dict
+
+
+def build_day(n_reports: int, seed: int = 42):
+    """Transient AlphaReportDB rows for one day, with relationships populated."""
+    rng = random.Random(seed)
+    day = datetime(2025, 5, 17)
+    tokens = [
+        TokenDB(
+            id=i,
+            symbol=f"TKN{i}",
+            name=f"Token {i}",
+            chain=rng.choice(['base', 'solana']),
+            address='0x' + f"{i:040x}",
+            image_url=f"https://example.com/{i}.png",
+            website_url=f"https://token{i}.xyz" if i % 2 else None,
+            twitter_url=f"https://x.com/token{i}",
+            warpcast_url=None,
+            telegram_url=f"https://t.me/token{i}" if i % 3 else None,
+            signal_url=None,
+            created_at=day - timedelta(days=rng.randint(0, 90))
+        )
+        for i in range(1, n_reports // 2 + 2)
+    ]
+
+    reports = []
+    opp_id = 1
+    for report_id in range(1, n_reports + 1):
+        created_at = day + timedelta(seconds=rng.randint(0, 86399), microseconds=rng.randint(0, 999999))
+        report = AlphaReportDB(
+            id=report_id,
+            is_relevant=True,
+            analysis="Strong community momentum and a fresh listing. " * 6,
+            message="New opportunity spotted on " + created_at.strftime('%H:%M'),
+            created_at=created_at
+        )
+        for _ in range(rng.randint(1, 3)):
+            token = rng.choice(tokens)
+            post = SocialMediaPostDB(
+                id=opp_id,
+                source='warpcast',
+                post_id=f"0x{opp_id:016x}",
+                author_id=str(rng.randint(1, 5000)),
+                author_username=f"user{opp_id % 300}",
+                author_display_name=f"User {opp_id % 300}" if opp_id % 4 else None,
+                text=f"${token.symbol} is sending, contract {token.address} " * 3,
+                original_timestamp=created_at - timedelta(minutes=5),
+                timestamp=created_at - timedelta(minutes=4),
+                reactions_count=rng.randint(0, 200),
+                replies_count=rng.randint(0, 50),
+                reposts_count=rng.randint(0, 30),
+                raw_data={}
+            )
+            token_report = TokenReportDB(
+                id=opp_id,
+                mentions_purchasable_token=True,
+                token_symbol=token.symbol,
+                token_chain=token.chain,
+                token_address=token.address,
+                is_listed_on_dex=True,
+                trading_pairs=['WETH'],
+                confidence_score=rng.randint(1, 10),
+                reasoning="Mentions a listed token with a contract address.",
+                created_at=created_at
+            )
+            token_report.social_media_post = post
+            opportunity = TokenOpportunityDB(
+                id=opp_id,
+                name=token.name,
+                chain=token.chain,
+                contract_address=token.address,
+                market_cap=rng.choice([None, round(rng.uniform(1e4, 5e8), 2)]),
+                community_score=rng.randint(1, 10),
+                safety_score=rng.randint(1, 10),
+                justification="Growing holder count, locked liquidity and active devs. " * 3,
+                sources=[f"https://warpcast.com/~/conversations/0x{opp_id:016x}", "https://dexscreener.com"],
+                recommendation=rng.choice(['Buy', 'Hold', 'Sell']),
+                created_at=created_at
+            )
+            opportunity.token = token
+            opportunity.token_report = token_report
+            report.opportunities.append(opportunity)
+            opp_id += 1
+        reports.append(report)
+    return reports
+
+
+def legacy_body(reports) -> bytes:
+    """The pre-orjson /alpha_reports path, kept here for comparison."""
+    reports_data = [
+        AlphaReport(
+            id=report.id,
+            is_relevant=report.is_relevant,
+            analysis=report.analysis,
+            message=report.message,
+            created_at=report.created_at,
+            opportunities=[
+                TokenOpportunity(
+                    name=opp.name,
+                    chain=str(opp.chain),
+                    contract_address=opp.contract_address,
+                    market_cap=float(opp.market_cap) if opp.market_cap else None,
+                    community_score=opp.community_score,
+                    safety_score=opp.safety_score,
+                    justification=opp.justification,
+                    sources=opp.sources,
+                    recommendation=opp.recommendation,
+                    created_at=opp.created_at,
+                    token=TokenData(
+                        symbol=opp.token.symbol,
+                        name=opp.token.name,
+                        chain=str(opp.token.chain),
+                        address=opp.token.address,
+                        image_url=opp.token.image_url,
+                        website_url=opp.token.website_url,
+                        warpcast_url=opp.token.warpcast_url,
+                        twitter_url=opp.token.twitter_url,
+                        telegram_url=opp.token.telegram_url,
+                        signal_url=opp.token.signal_url
+                    ) if opp.token else None,
+                    token_report={
+                        "social_media_post": {
+                            "source": opp.token_report.social_media_post.source,
+                            "author_display_name": opp.token_report.social_media_post.author_display_name,
+                            "text": opp.token_report.social_media_post.text,
+                            "timestamp": opp.token_report.social_media_post.timestamp
+                        } if opp.token_report.social_media_post else None
+                    } if opp.token_report else None
+                )
+                for opp in report.opportunities
+            ]
+        )
+        for report in reports
+    ]
+    json_data = jsonable_encoder(
+        [report.dict(by_alias=True) for report in reports_data],
+        exclude_none=True,
+        custom_encoder={
+            datetime: lambda dt: dt.isoformat()
+        }
+    )
+    return JSONResponse(content=json_data).body
+
+
+def orjson_body(reports) -> bytes:
+    return orjson.dumps([_alpha_report_dict(report) for report in reports])
+
+
+def measure(render, reports, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        body = render(reports)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark /api/alpha_reports serialization')
+    parser.add_argument('--reports', type=int, default=1000, help='Reports in the synthetic day')
+    parser.add_argument('--repeats', type=int, default=20, help='Timed runs per path')
+    args = parser.parse_args()
+
+    reports = build_day(args.reports)
+    opportunities = sum(len(report.opportunities) for report in reports)
+    print(f"{args.reports:,} reports, {opportunities:,} opportunities")
+
+    if json.loads(legacy_body(reports)) != json.loads(orjson_body(reports)):
+        raise SystemExit("orjson path output differs from the legacy path")
+
+    legacy_ms, legacy_bytes = measure(legacy_body, reports, args.repeats)
+    orjson_ms, orjson_bytes = measure(orjson_body, reports, args.repeats)
+
+    print(f"\n{'path':<10}{'median ms':>12}{'bytes':>12}")
+    print(f"{'legacy':<10}{legacy_ms:>12.1f}{legacy_bytes:>12,}")
+    print(f"{'orjson':<10}{orjson_ms:>12.1f}{orjson_bytes:>12,}")
+    print(f"\nspeedup: {legacy_ms / orjson_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark keyset pagination of /api/tokens on a synthetic dataset.
+
+Builds the tokens and token_stats tables (with the model's keyset indexes) in an
+isolated `bench_tokens` schema, fills them with synthetic rows, then runs the exact
+query issued by get_tokens for page 1 and for pages deep into the scroll of every
+sort mode. With the composite indexes each page should read the same handful of
+buffers and take roughly the same time no matter how deep it is.
+
+Usage:
+    python benchmarks/token_pagination_benchmark.py [--tokens 1000000] [--per-page 10] [--keep]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+
+from db.models.token import TokenDB
+from db.models.stats import TokenStatsDB
+from routers.api_queries import build_tokens_query, _encode_token_cursor, _token_keyset_columns, TOKEN_SORT_COLUMNS
+
+load_dotenv()
+
+SCHEMA = "bench_tokens"
+SORT_MODES = [None] + list(TOKEN_SORT_COLUMNS)
+
+
+def create_bench_engine():
+    """Engine whose connections resolve unqualified table names to the benchmark schema."""
+    database_url = os.environ.get('DATABASE_URL')
+    if not database_url:
+        raise ValueError("DATABASE_URL environment variable not set")
+
+    engine = create_engine(database_url)
+
+    @event.listens_for(engine, "connect")
+    def set_search_path(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}")
+        cursor.execute(f"SET search_path TO {SCHEMA}")
+        cursor.close()
+        dbapi_connection.commit()
+
+    return engine
+
+
+def populate(engine, n_tokens: int):
+    """Create the benchmark tables and fill them with synthetic tokens and stats."""
+    tokens = TokenDB.__table__.name
+    stats = TokenStatsDB.__table__.name
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {stats}, {tokens} CASCADE"))
+        SQLModel.metadata.create_all(conn, tables=[TokenDB.__table__, TokenStatsDB.__table__])
+
+        print(f"Inserting {n_tokens:,} tokens...")
+        conn.execute(text(f"""
+            INSERT INTO {tokens} (id, symbol, name, chain, address, created_at)
+            SELECT g,
+                   'TKN' || g,
+                   'Token ' || g,
+                   (ARRAY['base', 'solana', 'ethereum'])[1 + (g % 3)],
+                   '0x' || lpad(to_hex(g), 40, '0'),
+                   NOW() - (random() * INTERVAL '365 days')
+            FROM generate_series(1, :n) AS g
+        """), {'n': n_tokens})
+
+        # Roughly 80% of tokens have reports, 40% have opportunities
+        print("Inserting token_stats...")
+        conn.execute(text(f"""
+            INSERT INTO {stats} (token_id, max_market_cap, last_opportunity_at, kol_events, last_social_at, updated_at)
+            SELECT g,
+                   CASE WHEN g % 5 < 2 THEN round((random() * 1e9)::numeric, 2) END,
+                   CASE WHEN g % 5 < 2 THEN NOW() - (random() * INTERVAL '180 days') END,
+                   CASE WHEN g % 5 < 4 THEN (random() * 5000)::int ELSE 0 END,
+                   CASE WHEN g % 5 < 4 THEN NOW() - (random() * INTERVAL '180 days') END,
+                   NOW()
+            FROM generate_series(1, :n) AS g
+        """), {'n': n_tokens})
+
+        conn.execute(text(f"ANALYZE {tokens}"))
+        conn.execute(text(f"ANALYZE {stats}"))
+
+
+def cursor_at_depth(session, sort_by, depth: int):
+    """Cursor pointing just before row `depth` of a sort mode (setup only, uses OFFSET)."""
+    if depth == 0:
+        return None
+    row = session.execute(build_tokens_query(sort_by).offset(depth - 1).limit(1)).first()
+    if row is None:
+        return None
+    token, stats = row
+    sort_column, _ = _token_keyset_columns(sort_by)
+    value = getattr(stats, sort_column.key) if sort_by in TOKEN_SORT_COLUMNS else token.created_at
+    return _encode_token_cursor(value, token.id)
+
+
+def measure_page(session, sort_by, cursor, per_page: int, repeats: int):
+    """Return (median ms, shared buffers touched, plan top node) for one page query."""
+    query = build_tokens_query(sort_by, cursor=cursor).limit(per_page + 1)
+    statement = query.compile(
+        dialect=session.bind.dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        session.execute(text(str(statement))).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    plan = session.execute(
+        text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}")
+    ).scalar()[0]
+    buffers = plan['Plan'].get('Shared Hit Blocks', 0) + plan['Plan'].get('Shared Read Blocks', 0)
+    scan = plan['Plan']
+    while scan.get('Plans') and not scan['Node Type'].endswith('Scan'):
+        scan = scan['Plans'][0]
+    return statistics.median(timings), buffers, scan.get('Index Name') or scan['Node Type']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark /api/tokens keyset pagination')
+    parser.add_argument('--tokens', type=int, default=1_000_000, help='Number of synthetic tokens')
+    parser.add_argument('--per-page', type=int, default=10, help='Page size')
+    parser.add_argument('--repeats', type=int, default=20, help='Timed runs per page')
+    parser.add_argument('--skip-populate', action='store_true', help='Reuse the existing benchmark schema')
+    parser.add_argument('--keep', action='store_true', help='Keep the benchmark schema afterwards')
+    args = parser.parse_args()
+
+    engine = create_bench_engine()
+    if not args.skip_populate:
+        populate(engine, args.tokens)
+
+    depths = [0, args.tokens // 100, args.tokens // 10, args.tokens // 4]
+
+    print(f"\n{'sort_by':<20}{'row depth':>12}{'median ms':>12}{'buffers':>10}  index")
+    try:
+        with Session(engine) as session:
+            for sort_by in SORT_MODES:
+                for depth in depths:
+                    cursor = cursor_at_depth(session, sort_by, depth)
+                    if depth and cursor is None:
+                        continue
+                    median_ms, buffers, index = measure_page(
+                        session, sort_by, cursor, args.per_page, args.repeats
+                    )
+                    print(f"{sort_by or 'created_at':<20}{depth:>12,}{median_ms:>12.2f}{buffers:>10}  {index}")
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
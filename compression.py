@@ -0,0 +1,166 @@
+"""
+Response compression middleware for the API and pages.
+
+Responses are brotli-compressed when the brotli package is installed and the
+client accepts br, and gzip-compressed otherwise. Only text-like content types
+are touched; responses below the size threshold, partial or empty responses,
+responses that already carry a Content-Encoding (e.g. precompressed static
+files) and server-sent event streams pass through unchanged. Streaming bodies
+(the NDJSON exports) are compressed chunk by chunk and flushed after each one.
+"""
+import zlib
+from typing import Dict, Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content types worth compressing; anything else (images, event streams) is sent as is
+COMPRESSIBLE_CONTENT_TYPES = (
+    'text/html', 'text/css', 'text/plain', 'text/javascript', 'application/javascript',
+    'application/json', 'application/x-ndjson', 'image/svg+xml', 'application/xml'
+)
+
+# Bodies at least this large are compressed in a worker thread rather than on the event loop
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+def accepted_encodings(headers: Headers) -> Dict[str, float]:
+    """Parse Accept-Encoding into {encoding: q}, leaving out encodings refused with q=0."""
+    encodings = {}
+    for item in headers.get("accept-encoding", "").split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        if q > 0:
+            encodings[name] = q
+    return encodings
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.partition(";")[0].strip().lower() in COMPRESSIBLE_CONTENT_TYPES
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+class CompressionMiddleware:
+    """Compress eligible responses of at least minimum_size bytes with brotli or gzip."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000, gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose_encoding(self, scope: Scope) -> Optional[str]:
+        accepted = accepted_encodings(Headers(scope=scope))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _encoder(self, encoding: str):
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose_encoding(scope)
+        start_message: Optional[Message] = None
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, encoder, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                compressible = is_compressible(headers.get("content-type", ""))
+                vary = headers.get("vary", "")
+                if compressible and "accept-encoding" not in vary.lower():
+                    MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+                passthrough = (
+                    encoding is None
+                    or not compressible
+                    or "content-encoding" in headers
+                    or message["status"] in (204, 206, 304)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    # Hold the start message until the first body chunk shows the response size
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                if start_message is not None:
+                    # e.g. http.response.pathsend: the body never passes through here
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                encoder = self._encoder(encoding)
+                headers["Content-Encoding"] = encoding
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                if not more_body:
+                    body = await self._compress(encoder, body, True)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+                start_message = None
+
+            await send({
+                "type": "http.response.body",
+                "body": await self._compress(encoder, body, not more_body),
+                "more_body": more_body
+            })
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    async def _compress(encoder, body: bytes, final: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await run_in_threadpool(encoder.compress, body, final)
+        return encoder.compress(body, final)
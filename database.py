@@ -9,6 +9,10 @@ from db import (
     get_engine,
     get_env_prefix,
     get_session,
+    get_async_engine,
+    get_async_session,
+    get_async_read_engine,
+    get_async_read_session,
     
     # Models
     SQLModel,
@@ -17,6 +21,11 @@ from db import (
     SocialMediaPostDB,
     TokenReportDB,
     TokenDB,
+    TokenStatsDB,
+    TokenHourlyStatsDB,
+    TokenHourlyAuthorDB,
+    JobDB,
+    canonical_token_address,
     
     # Operations
     create_alpha_report,
@@ -25,6 +34,8 @@ from db import (
     create_social_media_post,
     create_token_report,
     get_or_create_token,
+    rebuild_token_stats,
+    rebuild_token_hourly_stats,
     
     # Utils
     create_db_and_tables,
@@ -37,18 +48,29 @@ __all__ = [
     'get_engine',
     'get_env_prefix',
     'get_session',
+    'get_async_engine',
+    'get_async_session',
+    'get_async_read_engine',
+    'get_async_read_session',
     'SQLModel',
     'AlphaReportDB',
     'TokenOpportunityDB',
     'SocialMediaPostDB',
     'TokenReportDB',
     'TokenDB',
+    'TokenStatsDB',
+    'TokenHourlyStatsDB',
+    'TokenHourlyAuthorDB',
+    'JobDB',
+    'canonical_token_address',
     'create_alpha_report',
     'get_alpha_report',
     'get_all_alpha_reports',
     'create_social_media_post',
     'create_token_report',
     'get_or_create_token',
+    'rebuild_token_stats',
+    'rebuild_token_hourly_stats',
     'create_db_and_tables',
     'reset_db',
     'tables_exist'
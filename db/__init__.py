@@ -4,11 +4,16 @@ This module provides a clean interface to the database functionality
 while maintaining backward compatibility with the original database.py.
 """
 
-from .connection import get_engine, get_env_prefix
+from .connection import (
+    get_engine, get_env_prefix, get_async_engine, get_async_session,
+    get_async_read_engine, get_async_read_session
+)
 from .models.base import get_session
 from .models.alpha import AlphaReportDB, TokenOpportunityDB
-from .models.token import TokenDB
+from .models.token import TokenDB, canonical_token_address
 from .models.social import SocialMediaPostDB, TokenReportDB
+from .models.stats import TokenStatsDB, TokenHourlyStatsDB, TokenHourlyAuthorDB
+from .models.job import JobDB
 from .operations.alpha import (
     create_alpha_report,
     get_alpha_report,
@@ -19,6 +24,7 @@ from .operations.social import (
     create_token_report
 )
 from .operations.token import get_or_create_token
+from .operations.stats import rebuild_token_stats, rebuild_token_hourly_stats
 from .utils import (
     create_db_and_tables,
     reset_db,
@@ -33,6 +39,10 @@ __all__ = [
     'get_engine',
     'get_env_prefix',
     'get_session',
+    'get_async_engine',
+    'get_async_session',
+    'get_async_read_engine',
+    'get_async_read_session',
     
     # Models
     'SQLModel',
@@ -41,6 +51,11 @@ __all__ = [
     'SocialMediaPostDB',
     'TokenReportDB',
     'TokenDB',
+    'TokenStatsDB',
+    'TokenHourlyStatsDB',
+    'TokenHourlyAuthorDB',
+    'JobDB',
+    'canonical_token_address',
     
     # Operations
     'create_alpha_report',
@@ -49,6 +64,8 @@ __all__ = [
     'create_social_media_post',
     'create_token_report',
     'get_or_create_token',
+    'rebuild_token_stats',
+    'rebuild_token_hourly_stats',
     
     # Utils
     'create_db_and_tables',
@@ -0,0 +1,256 @@
+"""
+In-process response cache for the read-heavy query endpoints.
+
+Entries are keyed by normalized query parameters, bounded in number (LRU) and
+age (TTL), and tagged with the data they were built from. Write paths call
+invalidate_on_commit() with the tags they affect, so only entries that could
+have changed are dropped, and only once the write has committed.
+
+Tags:
+    token:<id>              any cached response embedding that token
+    tokens:<sort mode>      /tokens listings whose order or membership depends on the sort column
+    tokens:market_cap_max   /tokens listings filtered by market cap
+    alpha_reports:<date>    /alpha_reports for one day (YYYY-MM-DD)
+    alpha_reports:all       /alpha_reports without a date, and /alpha_reports/dates
+
+The same module holds the token identity cache, which maps a canonical token
+address to its token id for every address lookup path (get_or_create_token,
+/token/{address}, the social summary).
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+from .hooks import on_commit
+from .models.token import canonical_token_address
+
+class ResponseCache:
+    """Thread-safe LRU + TTL cache with tag-based invalidation and hit/miss counters."""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 60.0, settle_seconds: float = 0.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.settle_seconds = settle_seconds
+        # Tag -> when it was last invalidated, kept for settle_seconds
+        self._invalidated_at: Dict[str, float] = {}
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Set[str]]]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every invalidation; read it before building a response."""
+        return self._version
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = (), version: Optional[int] = None) -> None:
+        """Store value under key, tagged with the data it depends on.
+
+        If version is given and an invalidation happened since it was read, the value
+        may predate a committed write and is not stored. Nor is it within
+        settle_seconds of the last invalidation of one of its tags, while a lagging
+        read replica may still be serving the data from before it.
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            tags = set(tags)
+            now = time.monotonic()
+            if any(now - self._invalidated_at.get(tag, float('-inf')) < self.settle_seconds for tag in tags):
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry carrying any of the given tags. Returns the number dropped."""
+        with self._lock:
+            self._version += 1
+            if self.settle_seconds > 0:
+                self._settle(tags)
+            keys = set()
+            for tag in tags:
+                keys.update(self._keys_by_tag.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "settle_seconds": self.settle_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def _settle(self, tags: Iterable[str]) -> None:
+        now = time.monotonic()
+        # Forget tags that have settled, so the map only holds recently written ones
+        if len(self._invalidated_at) > self.max_entries:
+            self._invalidated_at = {
+                tag: at for tag, at in self._invalidated_at.items() if now - at < self.settle_seconds
+            }
+        for tag in tags:
+            self._invalidated_at[tag] = now
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60")),
+    # Query endpoints read from DATABASE_READ_URL when set; don't cache what a lagging replica returns
+    settle_seconds=float(os.getenv("READ_REPLICA_MAX_LAG_SECONDS", "2")) if os.getenv("DATABASE_READ_URL") else 0.0
+)
+
+def token_tag(token_id: int) -> str:
+    return f"token:{token_id}"
+
+def tokens_sort_tag(sort_by: Optional[str]) -> str:
+    return f"tokens:{sort_by or 'created_at'}"
+
+TOKENS_MARKET_CAP_FILTER_TAG = "tokens:market_cap_max"
+ALPHA_REPORTS_ALL_TAG = "alpha_reports:all"
+
+def alpha_reports_date_tag(date: datetime) -> str:
+    return f"alpha_reports:{date.strftime('%Y-%m-%d')}"
+
+def invalidate_on_commit(session, *tags: str) -> None:
+    """Drop cached responses carrying any of tags once the session's transaction commits."""
+    if tags:
+        on_commit(session, lambda: response_cache.invalidate(*tags))
+
+class TokenIdentityCache:
+    """Thread-safe LRU map from a token's canonical address to its id, with hit/miss counters.
+
+    Entries are keyed by (chain, canonical address) for chain-qualified lookups and
+    by (None, canonical address) for address-only ones. Tokens are never updated in
+    a way that changes their id, so entries only go stale when a token row is
+    deleted; callers load the token by id and discard() the entry if it is gone.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._ids: "OrderedDict[Tuple[Optional[str], str], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(address: str, chain: Optional[str]) -> Tuple[Optional[str], str]:
+        return (chain.lower() if chain else None, canonical_token_address(address, chain))
+
+    def get(self, address: Optional[str], chain: Optional[str] = None) -> Optional[int]:
+        """Return the cached token id for address (on chain, if given), or None on a miss."""
+        if not address:
+            return None
+        key = self._key(address, chain)
+        with self._lock:
+            token_id = self._ids.get(key)
+            if token_id is None:
+                self.misses += 1
+                return None
+            self._ids.move_to_end(key)
+            self.hits += 1
+            return token_id
+
+    def set(self, token_id: int, address: Optional[str], chain: Optional[str]) -> None:
+        """Remember token_id under its chain-qualified key and, if unclaimed, its address-only key."""
+        if not address or token_id is None or self.max_entries <= 0:
+            return
+        with self._lock:
+            for key, replace in ((self._key(address, chain), True), (self._key(address, None), False)):
+                if key in self._ids and not replace:
+                    continue
+                self._ids[key] = token_id
+                self._ids.move_to_end(key)
+            while len(self._ids) > self.max_entries:
+                self._ids.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, token_id: int) -> None:
+        """Forget every key pointing at token_id."""
+        with self._lock:
+            for key in [key for key, cached_id in self._ids.items() if cached_id == token_id]:
+                del self._ids[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._ids),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+token_identity_cache = TokenIdentityCache(
+    max_entries=int(os.getenv("TOKEN_IDENTITY_CACHE_MAX_ENTRIES", "10000"))
+)
+
+def remember_token_on_commit(session, token) -> None:
+    """Add a newly inserted (and flushed) token to the identity cache once its row has committed."""
+    token_id, address, chain = token.id, token.address, token.chain
+    on_commit(session, lambda: token_identity_cache.set(token_id, address, chain))
@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from dotenv import load_dotenv
 import os
 from urllib.parse import urlparse, parse_qs, urlencode
@@ -8,6 +10,16 @@ load_dotenv()
 # Global variables for database connection
 _engine = None
 _env_prefix = None
+_async_engine = None
+_async_env_prefix = None
+_async_read_engine = None
+_async_read_env_prefix = None
+
+# libpq connection parameters that asyncpg does not accept as connect() arguments
+_LIBPQ_ONLY_PARAMS = (
+    'application_name', 'channel_binding', 'connect_timeout', 'options',
+    'keepalives', 'keepalives_idle', 'keepalives_interval', 'keepalives_count'
+)
 
 def get_env_prefix() -> str:
     """Get the current environment prefix for table names."""
@@ -67,6 +79,120 @@ def get_engine():
     
     return _engine
 
+def _create_async_engine(database_url: str, application_name: str):
+    """Build an asyncpg-backed AsyncEngine for database_url."""
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    query_params = dict(url.query)
+    sslmode = query_params.pop('sslmode', None)
+    for param in _LIBPQ_ONLY_PARAMS:
+        query_params.pop(param, None)
+    url = url.set(query=query_params)
+
+    connect_args = {
+        "timeout": 10,  # Connection timeout in seconds
+        "server_settings": {
+            "application_name": application_name
+        }
+    }
+    if sslmode and sslmode != 'disable':
+        connect_args["ssl"] = sslmode
+
+    return create_async_engine(
+        url,
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+        echo=get_env_prefix().startswith("dev_")
+    )
+
+def get_async_engine():
+    """Get or create the asyncpg-backed AsyncEngine used by the async request handlers."""
+    global _async_engine, _async_env_prefix
+
+    new_prefix = get_env_prefix()
+
+    if _async_engine is None or new_prefix != _async_env_prefix:
+        # Drop the old pool without awaiting; its connections close as they are released
+        if _async_engine is not None:
+            _async_engine.sync_engine.dispose(close=False)
+
+        _async_env_prefix = new_prefix
+        DATABASE_URL = os.getenv("DATABASE_URL")
+        if not DATABASE_URL:
+            raise ValueError("DATABASE_URL environment variable is required")
+
+        _async_engine = _create_async_engine(
+            DATABASE_URL, 'prod' if new_prefix == 'prod_' else 'dev'
+        )
+
+    return _async_engine
+
+def get_async_read_engine():
+    """Get the AsyncEngine for read-only query handlers.
+
+    With DATABASE_READ_URL set (e.g. a streaming replica) this is a separate pool
+    on that server, so heavy reads don't compete with ingestion writes for
+    connections; otherwise it is the primary engine.
+    """
+    global _async_read_engine, _async_read_env_prefix
+
+    DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+    if not DATABASE_READ_URL:
+        return get_async_engine()
+
+    new_prefix = get_env_prefix()
+
+    if _async_read_engine is None or new_prefix != _async_read_env_prefix:
+        if _async_read_engine is not None:
+            _async_read_engine.sync_engine.dispose(close=False)
+
+        _async_read_env_prefix = new_prefix
+        _async_read_engine = _create_async_engine(
+            DATABASE_READ_URL, 'prod-read' if new_prefix == 'prod_' else 'dev-read'
+        )
+
+    return _async_read_engine
+
+def get_async_session() -> AsyncSession:
+    """Get a new async database session.
+
+    Use as `async with get_async_session() as session:`. Objects stay usable after
+    commit, but lazy loading is not available, so relationships must be eager-loaded.
+    """
+    return AsyncSession(get_async_engine(), expire_on_commit=False)
+
+def get_async_read_session() -> AsyncSession:
+    """Get a new async session on the read engine, for handlers that only read.
+
+    A replica can lag the primary, so anything that must see a write it just made
+    (or is about to write) uses get_async_session() instead.
+    """
+    return AsyncSession(get_async_read_engine(), expire_on_commit=False)
+
+async def dispose_async_engine() -> None:
+    """Close all pooled async connections (called on application shutdown)."""
+    global _async_engine, _async_read_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+    if _async_read_engine is not None:
+        await _async_read_engine.dispose()
+        _async_read_engine = None
+
+def get_pools() -> dict:
+    """Connection pools of the engines created so far, by name (for monitoring)."""
+    pools = {}
+    if _engine is not None:
+        pools["sync"] = _engine.pool
+    if _async_engine is not None:
+        pools["async"] = _async_engine.sync_engine.pool
+    if _async_read_engine is not None:
+        pools["async_read"] = _async_read_engine.sync_engine.pool
+    return pools
+
 def tables_exist() -> bool:
     """Check if all required tables exist."""
     engine = get_engine()
@@ -77,7 +203,11 @@ def tables_exist() -> bool:
         f"{env_prefix}alpha_reports",
         f"{env_prefix}social_media_posts",
         f"{env_prefix}token_reports",
-        f"{env_prefix}tokens"
+        f"{env_prefix}tokens",
+        f"{env_prefix}token_stats",
+        f"{env_prefix}token_hourly_stats",
+        f"{env_prefix}token_hourly_authors",
+        f"{env_prefix}jobs"
     ]
     existing_tables = inspector.get_table_names()
     return all(table in existing_tables for table in required_tables)
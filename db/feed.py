@@ -0,0 +1,160 @@
+"""
+In-process broadcast of newly committed token opportunities and token reports.
+
+Write paths call publish_on_commit() with a summary of each new row. Once the
+transaction commits, the event is numbered, kept in a short replay buffer and
+handed to every subscriber's asyncio queue. Commits can happen on any thread,
+so delivery goes through the subscriber loop's call_soon_threadsafe.
+/api/feed streams subscriptions as server-sent events.
+
+Events reach subscribers of the process that made the write only.
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from .hooks import on_commit
+
+class FeedEvent(NamedTuple):
+    id: int
+    type: str
+    data: Dict[str, Any]
+
+class FeedSubscriber:
+    """One client's queue on its event loop. Overflowing ends the stream; the client
+    reconnects with Last-Event-ID and catches up from the replay buffer."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.loop = loop
+        self.queue: "asyncio.Queue[FeedEvent]" = asyncio.Queue(max_queue)
+        self.overflowed = False
+
+    def deliver(self, event: FeedEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+class FeedBroadcaster:
+    """Fan-out of feed events to subscribers, with a bounded replay buffer."""
+
+    def __init__(self, history_size: int = 200, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._history: "deque[FeedEvent]" = deque(maxlen=history_size)
+        self._subscribers: List[FeedSubscriber] = []
+        self._lock = threading.Lock()
+        self._last_id = 0
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> FeedEvent:
+        """Number the event, remember it and deliver it to every subscriber."""
+        with self._lock:
+            self._last_id += 1
+            event = FeedEvent(self._last_id, event_type, data)
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop has been closed
+                self.unsubscribe(subscriber)
+        return event
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Tuple[FeedSubscriber, List[FeedEvent]]:
+        """Register a subscriber on the running loop.
+
+        Returns it with the buffered events after last_event_id, taken atomically
+        with the registration so none are missed or sent twice. An id from before a
+        restart (greater than anything published since) replays nothing.
+        """
+        subscriber = FeedSubscriber(asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscribers.append(subscriber)
+            backlog = []
+            if last_event_id is not None and last_event_id <= self._last_id:
+                backlog = [event for event in self._history if event.id > last_event_id]
+        return subscriber, backlog
+
+    def unsubscribe(self, subscriber: FeedSubscriber) -> None:
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "last_event_id": self._last_id,
+                "buffered": len(self._history)
+            }
+
+feed = FeedBroadcaster(
+    history_size=int(os.getenv("FEED_HISTORY_SIZE", "200")),
+    max_queue=int(os.getenv("FEED_MAX_QUEUE", "100"))
+)
+
+def publish_on_commit(session, event_type: str, data: Dict[str, Any]) -> None:
+    """Broadcast data as an event_type feed event once the session's transaction commits."""
+    on_commit(session, lambda: feed.publish(event_type, data))
+
+def _chain(value) -> Optional[str]:
+    # Rows built in this transaction still hold the Chain enum rather than its stored string
+    return value.value if isinstance(value, Enum) else value
+
+def _feed_token(token) -> Optional[Dict[str, Any]]:
+    if token is None:
+        return None
+    return {
+        "id": token.id,
+        "symbol": token.symbol,
+        "name": token.name,
+        "chain": _chain(token.chain),
+        "address": token.address,
+        "image_url": token.image_url
+    }
+
+def opportunity_event(opportunity, token=None) -> Dict[str, Any]:
+    """Feed summary of a flushed TokenOpportunityDB with its token."""
+    return {
+        "id": opportunity.id,
+        "report_id": opportunity.report_id,
+        "token_id": opportunity.token_id,
+        "name": opportunity.name,
+        "chain": _chain(opportunity.chain),
+        "contract_address": opportunity.contract_address,
+        "market_cap": float(opportunity.market_cap) if opportunity.market_cap else None,
+        "community_score": opportunity.community_score,
+        "safety_score": opportunity.safety_score,
+        "justification": opportunity.justification,
+        "sources": opportunity.sources,
+        "recommendation": opportunity.recommendation,
+        "created_at": opportunity.created_at,
+        "token": _feed_token(token)
+    }
+
+def token_report_event(report, token=None, post=None) -> Dict[str, Any]:
+    """Feed summary of a flushed TokenReportDB with its token and social media post."""
+    return {
+        "id": report.id,
+        "token_id": report.token_id,
+        "token_symbol": report.token_symbol,
+        "token_chain": report.token_chain,
+        "token_address": report.token_address,
+        "confidence_score": report.confidence_score,
+        "reasoning": report.reasoning,
+        "created_at": report.created_at,
+        "token": _feed_token(token),
+        "social_media_post": {
+            "source": post.source,
+            "author_username": post.author_username,
+            "author_display_name": post.author_display_name,
+            "text": post.text,
+            "timestamp": post.timestamp,
+            "reactions_count": post.reactions_count,
+            "replies_count": post.replies_count,
+            "reposts_count": post.reposts_count
+        } if post else None
+    }
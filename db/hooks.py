@@ -0,0 +1,43 @@
+"""
+Session lifecycle hooks.
+
+Write paths register callbacks with on_commit() so side effects that must only
+happen once data is durable (cache invalidation, notifications) run after the
+outermost transaction commits, and are discarded if it rolls back.
+"""
+from contextlib import contextmanager
+from typing import Callable
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_CALLBACKS_KEY = "after_commit_callbacks"
+
+def on_commit(session, callback: Callable[[], None]) -> None:
+    """Run callback after the session's current transaction commits."""
+    session.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+
+@contextmanager
+def savepoint(session):
+    """Run a block in a SAVEPOINT; if it raises, roll back to it and drop the callbacks it registered."""
+    registered = len(session.info.get(_CALLBACKS_KEY, []))
+    nested = session.begin_nested()
+    try:
+        yield
+    except Exception:
+        nested.rollback()
+        del session.info.get(_CALLBACKS_KEY, [])[registered:]
+        raise
+    nested.commit()
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session):
+    callbacks = session.info.pop(_CALLBACKS_KEY, [])
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            print(f"Error in after-commit callback: {str(e)}")
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit_callbacks(session):
+    session.info.pop(_CALLBACKS_KEY, None)
@@ -1,7 +1,7 @@
 from .base import *
 from agents.models import Chain
 from pydantic import validator
-from sqlalchemy import String, Integer, Sequence
+from sqlalchemy import String, Integer, Sequence, Index
 from .social import TokenReportDB
 from .token import TokenDB
 
@@ -33,6 +33,11 @@ class TokenOpportunityDB(SQLModel, table=True):
     token_id: Optional[int] = Field(default=None, foreign_key=f"{get_env_prefix()}tokens.id")
     token: Optional["TokenDB"] = Relationship(back_populates="token_opportunities")
 
+    __table_args__ = (
+        # Newest-first per token, for the top-N and paginated opportunities of a token
+        Index(f'ix_{get_env_prefix()}token_opportunities_token_recent', 'token_id', 'created_at', 'id'),
+    )
+
     @validator('chain', pre=True)
     def validate_chain(cls, v):
         if isinstance(v, Chain):
@@ -64,3 +69,8 @@ class AlphaReportDB(SQLModel, table=True):
     
     # Relationship with TokenOpportunity
     opportunities: List[TokenOpportunityDB] = Relationship(back_populates="report")
+
+    __table_args__ = (
+        # Keyset index for /api/alpha_reports pagination and per-day counts
+        Index(f'ix_{get_env_prefix()}alpha_reports_created_at_keyset', 'created_at', 'id'),
+    )
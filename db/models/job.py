@@ -0,0 +1,26 @@
+from .base import *
+from sqlalchemy import Index, text
+
+class JobDB(SQLModel, table=True):
+    """Background job queued by the generation endpoints and run by the worker pool (see job_queue.py)"""
+    __tablename__ = f"{get_env_prefix()}jobs"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str  # Name of the registered handler, e.g. analyze_and_scout
+    status: str = Field(default="queued")  # queued, running, succeeded or failed
+    payload: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    result: Optional[Any] = Field(default=None, sa_column=Column(JSON(none_as_null=True)))
+    error: Optional[str] = Field(default=None)
+    attempts: int = Field(default=0)  # Times a worker has claimed the job
+    max_attempts: int = Field(default=3)
+    locked_by: Optional[str] = Field(default=None)  # Worker running the job
+    locked_until: Optional[datetime] = Field(default=None)  # Lease; a running job past it is reclaimed
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = Field(default=None)
+    finished_at: Optional[datetime] = Field(default=None)
+
+    __table_args__ = (
+        # Claim order for queued jobs and leases to reclaim, kept small by leaving out finished jobs
+        Index(f'ix_{get_env_prefix()}jobs_claimable', 'status', 'id',
+              postgresql_where=text("status IN ('queued', 'running')")),
+    )
@@ -1,6 +1,12 @@
 from .base import *
 from .token import TokenDB
 from pydantic import validator
+from sqlalchemy import Index, String, Computed
+
+# Hash of a post's text with Unicode compatibility forms folded (NFKC) and runs of
+# whitespace collapsed, so recasts and copy-pasted shill posts share one value.
+# Postgres computes it on every write.
+TEXT_HASH_SQL = r"md5(btrim(regexp_replace(normalize(text, NFKC), '\s+', ' ', 'g')))"
 
 class SocialMediaPostDB(SQLModel, table=True):
     """Database model for social media posts"""
@@ -19,12 +25,21 @@ class SocialMediaPostDB(SQLModel, table=True):
     replies_count: int = Field(default=0)
     reposts_count: int = Field(default=0)
     raw_data: Dict[str, Any] = Field(sa_column=Column(JSON))
+    text_hash: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String, Computed(TEXT_HASH_SQL, persisted=True))
+    )
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     # Relationship with TokenReport
     token_report_id: Optional[int] = Field(default=None, foreign_key=f"{get_env_prefix()}token_reports.id")
     token_report: Optional["TokenReportDB"] = Relationship(back_populates="social_media_post")
 
+    __table_args__ = (
+        # Recent posts with the same text, whose token report a new post can reuse
+        Index(f'ix_{get_env_prefix()}social_media_posts_text_hash', 'text_hash', 'timestamp'),
+    )
+
 class TokenReportDB(SQLModel, table=True):
     """Database model for token reports"""
     __tablename__ = f"{get_env_prefix()}token_reports"
@@ -47,14 +62,18 @@ class TokenReportDB(SQLModel, table=True):
     opportunities: List["TokenOpportunityDB"] = Relationship(
         back_populates="token_report",
         sa_relationship_kwargs={
-            "cascade": "all, delete-orphan",
-            "lazy": "joined"
+            "cascade": "all, delete-orphan"
         }
     )
 
     # Relationship with Token
     token_id: Optional[int] = Field(default=None, foreign_key=f"{get_env_prefix()}tokens.id")
     token: Optional["TokenDB"] = Relationship(back_populates="token_reports")
+
+    __table_args__ = (
+        # Newest-first per token, for the top-N and paginated reports of a token
+        Index(f'ix_{get_env_prefix()}token_reports_token_recent', 'token_id', 'created_at', 'id'),
+    )
     
     @validator('token_address', pre=True)
     def validate_token_address(cls, v):
@@ -0,0 +1,49 @@
+from .base import *
+from .token import TokenDB
+from sqlalchemy import Index, text
+
+class TokenStatsDB(SQLModel, table=True):
+    """Incrementally maintained per-token aggregates used to sort and filter /api/tokens"""
+    __tablename__ = f"{get_env_prefix()}token_stats"
+
+    token_id: int = Field(primary_key=True, foreign_key=f"{get_env_prefix()}tokens.id", ondelete="CASCADE")
+    max_market_cap: Optional[float] = Field(default=None)
+    last_opportunity_at: Optional[datetime] = Field(default=None)
+    kol_events: int = Field(default=0)  # Token reports plus reactions, replies and reposts of their posts
+    last_social_at: Optional[datetime] = Field(default=None)
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})  # Bumped on every write to the token's reports or opportunities, used as its ETag
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Keyset indexes, one per /api/tokens sort mode: (sort column, token_id), scanned backwards
+    # for ORDER BY <column> DESC, token_id DESC and restricted to rows that sort mode can return
+    __table_args__ = (
+        Index(f'ix_{get_env_prefix()}token_stats_market_cap_keyset', 'max_market_cap', 'token_id',
+              postgresql_where=text('max_market_cap IS NOT NULL')),
+        Index(f'ix_{get_env_prefix()}token_stats_opportunity_keyset', 'last_opportunity_at', 'token_id',
+              postgresql_where=text('last_opportunity_at IS NOT NULL')),
+        Index(f'ix_{get_env_prefix()}token_stats_kol_events_keyset', 'kol_events', 'token_id',
+              postgresql_where=text('kol_events > 0')),
+        Index(f'ix_{get_env_prefix()}token_stats_social_keyset', 'last_social_at', 'token_id',
+              postgresql_where=text('last_social_at IS NOT NULL')),
+    )
+
+class TokenHourlyStatsDB(SQLModel, table=True):
+    """Per-token, per-hour social mention and engagement rollups behind /api/token/{address}/timeseries"""
+    __tablename__ = f"{get_env_prefix()}token_hourly_stats"
+
+    token_id: int = Field(primary_key=True, foreign_key=f"{get_env_prefix()}tokens.id", ondelete="CASCADE")
+    bucket: datetime = Field(primary_key=True)  # Hour the posts were published in (original_timestamp, truncated)
+    mentions: int = Field(default=0)  # Posts linked to the token through a token report
+    unique_authors: int = Field(default=0)
+    reactions: int = Field(default=0)
+    replies: int = Field(default=0)
+    reposts: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class TokenHourlyAuthorDB(SQLModel, table=True):
+    """Authors already counted in a token's hourly unique_authors, so each is counted once per hour"""
+    __tablename__ = f"{get_env_prefix()}token_hourly_authors"
+
+    token_id: int = Field(primary_key=True, foreign_key=f"{get_env_prefix()}tokens.id", ondelete="CASCADE")
+    bucket: datetime = Field(primary_key=True)
+    author_id: str = Field(primary_key=True)
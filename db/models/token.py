@@ -1,7 +1,28 @@
 from .base import *
 from agents.models import Chain
 from pydantic import validator
-from sqlalchemy import String, UniqueConstraint
+from sqlalchemy import String, UniqueConstraint, Index, Computed
+
+# Lookup form of a token address: EVM hex is case-insensitive and lowercased,
+# Solana base58 is case-sensitive and kept verbatim. Postgres computes it on
+# every write; canonical_token_address() is the Python mirror used by lookups.
+CANONICAL_ADDRESS_SQL = (
+    "CASE WHEN lower(left(address, 2)) = '0x' OR lower(chain) <> 'solana' "
+    "THEN lower(address) ELSE address END"
+)
+
+def canonical_token_address(address: Optional[str], chain: Optional[str] = None) -> Optional[str]:
+    """Canonical form of address as stored in tokens.canonical_address.
+
+    Without a chain, 0x addresses are lowercased and anything else is taken as
+    Solana base58 and left as is.
+    """
+    if address is None:
+        return None
+    chain = chain.value if isinstance(chain, Chain) else chain
+    if address[:2].lower() == '0x' or (chain and chain.lower() != 'solana'):
+        return address.lower()
+    return address
 
 class TokenDB(SQLModel, table=True):
     """Database model for unique tokens being tracked"""
@@ -12,6 +33,10 @@ class TokenDB(SQLModel, table=True):
     name: str
     chain: Chain = Field(sa_column=Column(String, nullable=False))
     address: Optional[str] = Field(index=True)
+    canonical_address: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String, Computed(CANONICAL_ADDRESS_SQL, persisted=True))
+    )
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     # Social URLs
@@ -30,6 +55,11 @@ class TokenDB(SQLModel, table=True):
     # Ensure uniqueness of token across chain and address
     __table_args__ = (
         UniqueConstraint('chain', 'address', name='uq_token_chain_address'),
+        # Keyset index for the default /api/tokens ordering (created_at DESC, id DESC)
+        Index(f'ix_{get_env_prefix()}tokens_created_at_keyset', 'created_at', 'id'),
+        # Single-probe address lookups, with and without a known chain
+        Index(f'ix_{get_env_prefix()}tokens_chain_canonical_address', 'chain', 'canonical_address', unique=True),
+        Index(f'ix_{get_env_prefix()}tokens_canonical_address', 'canonical_address'),
     )
     
     @validator('chain', pre=True)
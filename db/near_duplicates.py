@@ -0,0 +1,248 @@
+"""
+In-process near-duplicate index over recent post text.
+
+KOL posts about one token often repeat each other with emojis changed or a
+sentence added, which the exact text hash (social_media_posts.text_hash) misses.
+Each post is reduced to its set of words and adjacent word pairs (emojis and
+punctuation dropped, case folded) and that set to a MinHash signature, whose
+positions agree between two posts with probability equal to the Jaccard
+similarity of their sets. Signatures are split into BANDS bands of ROWS
+positions (LSH banding), and a lookup compares only the posts sharing a whole
+band with the query, keeping the ones whose signatures agree on at least
+`threshold` of their positions.
+
+Only posts naming exactly the same token references (addresses, mints, cashtags
+and DEX links, from agents/candidates.py) can match, so an added sentence that
+points at a different token never inherits another token's report. Posts of
+fewer than MIN_WORDS words are left to the exact hash: a handful of words
+changes too much with every edit.
+
+The index holds the posts processed in the last TEXT_REUSE_HOURS, is filled from
+the database at startup (load_recent_posts) and after every committed token
+report (remember_post_on_commit), and is per process. Measured by
+benchmarks/near_duplicate_benchmark.py.
+"""
+import os
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from sqlalchemy import select
+from agents.candidates import extract_token_candidates, NO_CANDIDATES_REASONING
+from .hooks import on_commit
+from .models.social import SocialMediaPostDB, TokenReportDB
+
+# Signature positions, and how they are banded: two posts share a band with probability
+# 1 - (1 - J**ROWS)**BANDS, about 0.9 at Jaccard similarity J = 0.7 and 0.05 at J = 0.3
+SIGNATURE_SIZE = 64
+BANDS = 8
+ROWS = 4
+MIN_WORDS = 5
+
+_WORD = re.compile(r"[\w$]+")
+# Multiply-shift hash functions, one per signature position, fixed so signatures are reproducible
+_rng = np.random.default_rng(20250517)
+_MULTIPLIERS = _rng.integers(1, 2**63, SIGNATURE_SIZE, dtype=np.uint64) | np.uint64(1)
+_INCREMENTS = _rng.integers(0, 2**63, SIGNATURE_SIZE, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+def post_words(text: str) -> List[str]:
+    """Lowercased words, cashtags and addresses of a post, without emojis and punctuation."""
+    return _WORD.findall(unicodedata.normalize('NFKC', text or '').lower())
+
+def minhash(words: List[str]) -> np.ndarray:
+    """MinHash signature (SIGNATURE_SIZE uint32s) of a post's words and adjacent word pairs."""
+    features = set(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    hashes = np.fromiter((zlib.crc32(f.encode()) for f in features), dtype=np.uint64, count=len(features))
+    return ((hashes[:, None] * _MULTIPLIERS + _INCREMENTS) >> _SHIFT).min(axis=0).astype(np.uint32)
+
+def token_reference_key(text: str) -> Tuple[str, ...]:
+    """The token references a post names, in a canonical form; near duplicates must agree on them."""
+    candidates = extract_token_candidates(text)
+    return tuple(sorted(set(
+        [address.lower() for address in candidates.evm_addresses]
+        + candidates.solana_mints
+        + ['$' + tag for tag in candidates.cashtags]
+        + [url.lower().split('://')[-1].rstrip('/') for url in candidates.dex_urls]
+    )))
+
+class PostFingerprint(NamedTuple):
+    """What the index stores and looks up per post"""
+    signature: bytes
+    key: Tuple[str, ...]
+
+def post_fingerprint(text: str) -> Optional[PostFingerprint]:
+    """MinHash signature and token reference key of a post, or None if it is too short to compare."""
+    words = post_words(text)
+    if len(words) < MIN_WORDS:
+        return None
+    return PostFingerprint(minhash(words).tobytes(), token_reference_key(text))
+
+class NearDuplicateIndex:
+    """Thread-safe MinHash LSH index of recent posts, with hit/miss counters."""
+
+    def __init__(self, threshold: float = 0.7, max_age_seconds: float = 24 * 3600):
+        self.threshold = threshold
+        self.max_age_seconds = max_age_seconds
+        self._min_agreeing = int(np.ceil(threshold * SIGNATURE_SIZE))
+        # Band hash -> id of the one entry in the bucket, or a list of ids once it has several
+        self._bands: List[Dict[int, Any]] = [{} for _ in range(BANDS)]
+        self._entries: Dict[int, Tuple[PostFingerprint, Any, float]] = {}
+        self._order: Deque[int] = deque()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return 0 < self.threshold <= 1 and self.max_age_seconds > 0
+
+    @staticmethod
+    def _band_hashes(fingerprint: PostFingerprint):
+        # Four bytes per signature position; the token key is part of every band
+        width = ROWS * 4
+        for band in range(BANDS):
+            yield band, hash((fingerprint.key, fingerprint.signature[band * width:(band + 1) * width]))
+
+    def add(self, fingerprint: PostFingerprint, value: Any, timestamp: Optional[float] = None) -> None:
+        """Index a post's fingerprint with the value a match returns."""
+        if not self.enabled:
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (fingerprint, value, timestamp)
+            self._order.append(entry_id)
+            for band, band_hash in self._band_hashes(fingerprint):
+                bucket = self._bands[band].get(band_hash)
+                if bucket is None:
+                    self._bands[band][band_hash] = entry_id
+                elif isinstance(bucket, list):
+                    bucket.append(entry_id)
+                else:
+                    self._bands[band][band_hash] = [bucket, entry_id]
+            self._expire(time.time())
+
+    def find(self, fingerprint: PostFingerprint) -> Optional[Tuple[Any, float]]:
+        """(value, estimated similarity) of the most similar indexed post, newest first among equals, or None."""
+        if not self.enabled:
+            return None
+        query = np.frombuffer(fingerprint.signature, dtype=np.uint32)
+        best = None
+        with self._lock:
+            oldest = time.time() - self.max_age_seconds
+            seen = set()
+            for band, band_hash in self._band_hashes(fingerprint):
+                bucket = self._bands[band].get(band_hash)
+                if bucket is None:
+                    continue
+                for entry_id in bucket if isinstance(bucket, list) else (bucket,):
+                    if entry_id in seen:
+                        continue
+                    seen.add(entry_id)
+                    other, value, timestamp = self._entries[entry_id]
+                    if timestamp < oldest or other.key != fingerprint.key:
+                        continue
+                    agreeing = int(np.count_nonzero(np.frombuffer(other.signature, dtype=np.uint32) == query))
+                    if agreeing >= self._min_agreeing and (
+                        best is None or (agreeing, timestamp) > (best[1], best[2])
+                    ):
+                        best = (value, agreeing, timestamp)
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return best[0], best[1] / SIGNATURE_SIZE
+
+    def _expire(self, now: float) -> None:
+        # Entries arrive roughly in time order; drop them from the front once out of the window
+        oldest = now - self.max_age_seconds
+        while self._order and self._entries[self._order[0]][2] < oldest:
+            entry_id = self._order.popleft()
+            fingerprint, _, _ = self._entries.pop(entry_id)
+            for band, band_hash in self._band_hashes(fingerprint):
+                bucket = self._bands[band][band_hash]
+                if isinstance(bucket, list):
+                    bucket.remove(entry_id)
+                    if len(bucket) == 1:
+                        self._bands[band][band_hash] = bucket[0]
+                else:
+                    del self._bands[band][band_hash]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            for band in self._bands:
+                band.clear()
+            self._entries.clear()
+            self._order.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+# A post reuses the token report of a post processed within TEXT_REUSE_HOURS whose
+# signature agrees on this share of positions (0 turns near-duplicate reuse off)
+near_duplicate_index = NearDuplicateIndex(
+    threshold=float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.7")),
+    max_age_seconds=float(os.getenv("TEXT_REUSE_HOURS", "24")) * 3600
+)
+
+def find_near_duplicate_report(text: str) -> Optional[int]:
+    """Id of the token report of a recent post nearly identical to text, if any."""
+    if not near_duplicate_index.enabled:
+        return None
+    fingerprint = post_fingerprint(text)
+    if fingerprint is None:
+        return None
+    match = near_duplicate_index.find(fingerprint)
+    return match[0] if match else None
+
+def remember_post_on_commit(session, text: str, token_report_id: int) -> None:
+    """Index a post and its new token report once the session's transaction commits."""
+    if not near_duplicate_index.enabled:
+        return
+    fingerprint = post_fingerprint(text)
+    if fingerprint is not None:
+        on_commit(session, lambda: near_duplicate_index.add(fingerprint, token_report_id))
+
+def load_recent_posts(session, since: datetime) -> int:
+    """Fill the index with the posts processed since `since` that the token finder classified; returns how many."""
+    if not near_duplicate_index.enabled:
+        return 0
+    rows = session.execute(
+        select(SocialMediaPostDB.text, SocialMediaPostDB.token_report_id, SocialMediaPostDB.timestamp)
+        .join(TokenReportDB, TokenReportDB.id == SocialMediaPostDB.token_report_id)
+        .where(
+            SocialMediaPostDB.timestamp >= since,
+            TokenReportDB.reasoning.is_distinct_from(NO_CANDIDATES_REASONING)
+        )
+        .order_by(SocialMediaPostDB.timestamp)
+        .execution_options(yield_per=1000)
+    )
+    loaded = 0
+    # Post timestamps are naive UTC
+    utc_offset = time.time() - datetime.utcnow().timestamp()
+    for text, token_report_id, timestamp in rows:
+        fingerprint = post_fingerprint(text)
+        if fingerprint is not None:
+            near_duplicate_index.add(fingerprint, token_report_id, timestamp.timestamp() + utc_offset)
+            loaded += 1
+    return loaded
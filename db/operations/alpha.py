@@ -2,6 +2,12 @@ from typing import Dict, Any, List, Optional
 from ..models.base import get_session
 from ..models.alpha import AlphaReportDB, TokenOpportunityDB
 from ..models.social import TokenReportDB
+from .stats import record_opportunity_stats
+from ..feed import publish_on_commit, opportunity_event
+from ..cache import (
+    invalidate_on_commit, token_tag, tokens_sort_tag,
+    alpha_reports_date_tag, ALPHA_REPORTS_ALL_TAG, TOKENS_MARKET_CAP_FILTER_TAG
+)
 from agents.models import Chain
 import time
 from datetime import datetime, timedelta
@@ -38,12 +44,15 @@ def create_alpha_report(report_data: Dict[str, Any], existing_session=None) -> O
         )
         session.add(report)
         
-        # Get token report if ID provided
+        # Get token report (and its token, loaded once for all opportunities) if ID provided
         token_report = None
+        token = None
         if "token_report_id" in report_data:
             token_report = session.get(TokenReportDB, report_data["token_report_id"])
             if not token_report:
                 print(f"Warning: TokenReport with ID {report_data['token_report_id']} not found")
+            else:
+                token = token_report.token
         
         # Create opportunities
         for opp_data in report_data["opportunities"]:
@@ -63,13 +72,29 @@ def create_alpha_report(report_data: Dict[str, Any], existing_session=None) -> O
             opportunity.report = report
             if token_report:
                 opportunity.token_report = token_report
-                if token_report.token:
-                    opportunity.token = token_report.token
+                if token:
+                    opportunity.token = token
             
             session.add(opportunity)
         
         session.flush()
         
+        # Keep the token leaderboard stats in the same transaction as the opportunities
+        stale_tags = {alpha_reports_date_tag(report.created_at), ALPHA_REPORTS_ALL_TAG}
+        for opportunity in report.opportunities:
+            record_opportunity_stats(
+                session,
+                opportunity.token_id,
+                opportunity.market_cap,
+                opportunity.created_at
+            )
+            if opportunity.token_id:
+                stale_tags.update([token_tag(opportunity.token_id), tokens_sort_tag('recent_opportunity')])
+                if opportunity.market_cap is not None:
+                    stale_tags.update([tokens_sort_tag('market_cap'), TOKENS_MARKET_CAP_FILTER_TAG])
+            publish_on_commit(session, 'opportunity', opportunity_event(opportunity, token))
+        invalidate_on_commit(session, *stale_tags)
+        
         if manage_session:
             session.commit()
         
@@ -0,0 +1,96 @@
+"""Background job queue operations.
+
+Jobs live in the jobs table. Workers claim them with FOR UPDATE SKIP LOCKED, so
+any number of workers, in any number of processes, each take a different job
+without blocking one another. A claimed job holds a lease (locked_until); if its
+worker dies, the job becomes claimable again once the lease runs out.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy import and_, or_, select, update
+from ..models.job import JobDB
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+async def enqueue_job(session, kind: str, payload: Dict[str, Any], max_attempts: int = 3) -> JobDB:
+    """Add a job to the queue; it is visible to workers once the session commits."""
+    job = JobDB(kind=kind, payload=payload, max_attempts=max_attempts)
+    session.add(job)
+    await session.flush()
+    return job
+
+async def claim_job(session, worker_id: str, lease_seconds: int) -> Optional[JobDB]:
+    """Claim the oldest queued job, or a running one whose lease has expired.
+
+    Runs one UPDATE ... WHERE id = (SELECT ... FOR UPDATE SKIP LOCKED) and commits,
+    so the claim is durable before the job starts. Returns None when there is
+    nothing to claim.
+    """
+    now = datetime.utcnow()
+    table = JobDB.__table__
+    claimable = select(table.c.id).where(or_(
+        table.c.status == JOB_QUEUED,
+        and_(table.c.status == JOB_RUNNING, table.c.locked_until < now)
+    )).order_by(table.c.id).limit(1).with_for_update(skip_locked=True).scalar_subquery()
+
+    result = await session.execute(
+        update(table).where(table.c.id == claimable).values(
+            status=JOB_RUNNING,
+            attempts=table.c.attempts + 1,
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=lease_seconds),
+            started_at=now
+        ).returning(*table.c)
+    )
+    row = result.mappings().first()
+    await session.commit()
+    return JobDB(**row) if row else None
+
+async def finish_job(session, job: JobDB, status: str, result: Any = None, error: Optional[str] = None) -> bool:
+    """Record a claimed job's outcome and release its lease.
+
+    Only applies while the job is still held by the same claim; returns False if
+    the lease expired and another worker has since reclaimed it.
+    """
+    table = JobDB.__table__
+    updated = await session.execute(
+        update(table).where(
+            table.c.id == job.id,
+            table.c.status == JOB_RUNNING,
+            table.c.locked_by == job.locked_by,
+            table.c.attempts == job.attempts
+        ).values(
+            status=status,
+            result=result,
+            error=error,
+            locked_until=None,
+            finished_at=datetime.utcnow()
+        )
+    )
+    await session.commit()
+    return updated.rowcount == 1
+
+async def release_job(session, job: JobDB) -> None:
+    """Put a claimed job back in the queue without counting the attempt (e.g. on shutdown)."""
+    table = JobDB.__table__
+    await session.execute(
+        update(table).where(
+            table.c.id == job.id,
+            table.c.status == JOB_RUNNING,
+            table.c.locked_by == job.locked_by,
+            table.c.attempts == job.attempts
+        ).values(
+            status=JOB_QUEUED,
+            attempts=table.c.attempts - 1,
+            locked_by=None,
+            locked_until=None,
+            started_at=None
+        )
+    )
+    await session.commit()
+
+async def get_job(session, job_id: int) -> Optional[JobDB]:
+    return await session.get(JobDB, job_id)
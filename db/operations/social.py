@@ -1,21 +1,30 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 import aiohttp
 from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from ..models.base import get_session
 from ..models.social import SocialMediaPostDB, TokenReportDB
 from ..models.token import TokenDB
+from .stats import record_token_report_stats
+from ..cache import invalidate_on_commit, token_tag, tokens_sort_tag, remember_token_on_commit
+from .token import find_token_by_address
+from ..feed import publish_on_commit, token_report_event
+from observability import observe_external_call
 
 async def fetch_dex_screener_data(token_address: str) -> Optional[Dict[str, Any]]:
     """Fetch token data from DEX Screener API and extract relevant fields."""
     try:
         async with aiohttp.ClientSession() as session:
-            async with session.get(f"https://api.dexscreener.com/latest/dex/tokens/{token_address}") as response:
-                if response.status != 200:
-                    print(f"DEX Screener API error: {response.status}")
-                    return None
-                    
-                data = await response.json()
+            with observe_external_call("dexscreener") as call:
+                async with session.get(f"https://api.dexscreener.com/latest/dex/tokens/{token_address}") as response:
+                    if response.status != 200:
+                        call.outcome = "error"
+                        print(f"DEX Screener API error: {response.status}")
+                        return None
+
+                    data = await response.json()
                 
                 # Get first pair from response as it's typically the most relevant
                 if not data.get('pairs') or len(data['pairs']) == 0:
@@ -84,6 +93,64 @@ def create_social_media_post(post_data: Dict[str, Any], existing_session=None) -
         if manage_session:
             session.close()
 
+def find_social_media_posts(session, post_ids: Iterable[str]) -> Dict[str, Tuple[int, Optional[int], Optional[str]]]:
+    """Existing posts among post_ids, in one IN query: {post_id: (id, token_report_id, text_hash)}."""
+    post_ids = list(post_ids)
+    if not post_ids:
+        return {}
+    rows = session.execute(
+        select(
+            SocialMediaPostDB.post_id, SocialMediaPostDB.id,
+            SocialMediaPostDB.token_report_id, SocialMediaPostDB.text_hash
+        ).where(SocialMediaPostDB.post_id.in_(post_ids))
+    ).all()
+    return {row.post_id: (row.id, row.token_report_id, row.text_hash) for row in rows}
+
+def insert_social_media_posts(session, posts: List[Dict[str, Any]]) -> Dict[str, Tuple[int, Optional[str]]]:
+    """Insert posts with one multi-row INSERT and return {post_id: (id, text_hash)} for those inserted.
+
+    Posts whose post_id was inserted concurrently by another request are skipped
+    (ON CONFLICT DO NOTHING) and left out of the result.
+    """
+    if not posts:
+        return {}
+    table = SocialMediaPostDB.__table__
+    rows = session.execute(
+        insert(table).values(posts).on_conflict_do_nothing(index_elements=['post_id'])
+        .returning(table.c.post_id, table.c.id, table.c.text_hash)
+    ).all()
+    return {row.post_id: (row.id, row.text_hash) for row in rows}
+
+def find_reusable_token_reports(session, text_hashes: Iterable[str], since: datetime) -> Dict[str, TokenReportDB]:
+    """Newest token report per text hash among posts processed since `since`: {text_hash: report}.
+
+    One DISTINCT ON query over the text hash index.
+    """
+    text_hashes = [text_hash for text_hash in set(text_hashes) if text_hash]
+    if not text_hashes:
+        return {}
+    rows = session.execute(
+        select(SocialMediaPostDB.text_hash, TokenReportDB)
+        .join(TokenReportDB, TokenReportDB.id == SocialMediaPostDB.token_report_id)
+        .where(SocialMediaPostDB.text_hash.in_(text_hashes), SocialMediaPostDB.timestamp >= since)
+        .order_by(SocialMediaPostDB.text_hash, SocialMediaPostDB.timestamp.desc())
+        .distinct(SocialMediaPostDB.text_hash)
+    ).all()
+    return {row[0]: row[1] for row in rows}
+
+def token_report_data(report: TokenReportDB) -> Dict[str, Any]:
+    """A stored report's classification, in the token finder's format, for create_token_report() to clone."""
+    return {
+        'mentions_purchasable_token': report.mentions_purchasable_token,
+        'token_symbol': report.token_symbol,
+        'token_chain': report.token_chain,
+        'token_address': report.token_address,
+        'is_listed_on_dex': report.is_listed_on_dex,
+        'trading_pairs': report.trading_pairs or [],
+        'confidence_score': report.confidence_score,
+        'reasoning': report.reasoning
+    }
+
 def get_or_create_token(session, report_data: Dict[str, Any]) -> Optional[TokenDB]:
     """Helper function to get or create a token based on report data."""
     if not (report_data.get('mentions_purchasable_token') and report_data.get('token_chain')):
@@ -97,10 +164,7 @@ def get_or_create_token(session, report_data: Dict[str, Any]) -> Optional[TokenD
         if chain.lower() != 'solana':
             address = address.lower()
             
-        token = session.query(TokenDB).filter(
-            TokenDB.chain == chain,
-            TokenDB.address == address
-        ).first()
+        token = find_token_by_address(session, address, chain)
         
         if not token and report_data.get('token_symbol'):
             token_data = {
@@ -117,6 +181,8 @@ def get_or_create_token(session, report_data: Dict[str, Any]) -> Optional[TokenD
             token = TokenDB(**token_data)
             session.add(token)
             session.flush()
+            invalidate_on_commit(session, tokens_sort_tag(None))
+            remember_token_on_commit(session, token)
             
     # Try to find by symbol if no address
     elif report_data.get('token_symbol'):
@@ -157,6 +223,7 @@ def create_token_report(report_data: Dict[str, Any], post_id: Optional[int] = No
         session.add(report)
         
         # If we have a post_id, establish the relationship
+        post = None
         if post_id:
             # First try to find by ID
             post = session.query(SocialMediaPostDB).filter(
@@ -177,6 +244,17 @@ def create_token_report(report_data: Dict[str, Any], post_id: Optional[int] = No
             
         session.flush()
         
+        # Keep the token leaderboard stats in the same transaction as the report
+        record_token_report_stats(session, report.token_id, post)
+        if report.token_id:
+            invalidate_on_commit(
+                session,
+                token_tag(report.token_id),
+                tokens_sort_tag('kol_events'),
+                tokens_sort_tag('recent_social')
+            )
+            publish_on_commit(session, 'token_report', token_report_event(report, token, post))
+        
         if manage_session:
             session.commit()
             
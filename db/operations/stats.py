@@ -0,0 +1,200 @@
+"""Token leaderboard statistics operations"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from ..cache import invalidate_on_commit, token_tag
+from ..connection import get_env_prefix
+from ..models.stats import TokenStatsDB, TokenHourlyStatsDB, TokenHourlyAuthorDB
+from ..models.social import SocialMediaPostDB
+
+def _upsert_token_stats(session, token_id: int, **values) -> None:
+    """Insert a token_stats row or fold the given values into the existing one.
+
+    Timestamps and market caps keep the greatest value seen (GREATEST ignores NULLs),
+    kol_events is added to the running total and version is bumped.
+    """
+    stmt = insert(TokenStatsDB.__table__).values(
+        token_id=token_id,
+        updated_at=datetime.utcnow(),
+        **values
+    )
+    excluded = stmt.excluded
+    table = TokenStatsDB.__table__.c
+
+    set_ = {'updated_at': excluded.updated_at, 'version': table.version + 1}
+    for column in ('max_market_cap', 'last_opportunity_at', 'last_social_at'):
+        if column in values:
+            set_[column] = func.greatest(table[column], excluded[column])
+    if 'kol_events' in values:
+        set_['kol_events'] = table.kol_events + excluded.kol_events
+
+    session.execute(stmt.on_conflict_do_update(index_elements=['token_id'], set_=set_))
+
+def record_token_report_stats(session, token_id: Optional[int], post: Optional[SocialMediaPostDB] = None) -> None:
+    """Fold a new token report (and its social media post, if any) into the token's stats.
+
+    Must be called with the session that created the report so the stats change
+    commits or rolls back together with it.
+    """
+    if not token_id:
+        return
+
+    values = {'kol_events': 1}
+    if post is not None:
+        values['kol_events'] += (
+            (post.reactions_count or 0) +
+            (post.replies_count or 0) +
+            (post.reposts_count or 0)
+        )
+        values['last_social_at'] = post.timestamp
+        _record_hourly_mention(session, token_id, post)
+
+    _upsert_token_stats(session, token_id, **values)
+
+def _record_hourly_mention(session, token_id: int, post: SocialMediaPostDB) -> None:
+    """Fold a post into the token's rollup for the hour it was published, in one statement.
+
+    The author is counted towards unique_authors only if the insert into the
+    hourly authors table went through, i.e. they had not posted about the token
+    in that hour yet.
+    """
+    hourly = TokenHourlyStatsDB.__tablename__
+    authors = TokenHourlyAuthorDB.__tablename__
+    session.execute(text(f"""
+        WITH new_author AS (
+            INSERT INTO {authors} (token_id, bucket, author_id)
+            VALUES (:token_id, date_trunc('hour', CAST(:published_at AS timestamp)), :author_id)
+            ON CONFLICT DO NOTHING
+            RETURNING 1
+        )
+        INSERT INTO {hourly}
+            (token_id, bucket, mentions, unique_authors, reactions, replies, reposts, updated_at)
+        VALUES (
+            :token_id, date_trunc('hour', CAST(:published_at AS timestamp)), 1,
+            (SELECT COUNT(*) FROM new_author), :reactions, :replies, :reposts, NOW()
+        )
+        ON CONFLICT (token_id, bucket) DO UPDATE SET
+            mentions = {hourly}.mentions + 1,
+            unique_authors = {hourly}.unique_authors + EXCLUDED.unique_authors,
+            reactions = {hourly}.reactions + EXCLUDED.reactions,
+            replies = {hourly}.replies + EXCLUDED.replies,
+            reposts = {hourly}.reposts + EXCLUDED.reposts,
+            updated_at = EXCLUDED.updated_at
+    """), {
+        'token_id': token_id,
+        'published_at': post.original_timestamp or post.timestamp,
+        'author_id': post.author_id,
+        'reactions': post.reactions_count or 0,
+        'replies': post.replies_count or 0,
+        'reposts': post.reposts_count or 0
+    })
+
+def record_opportunity_stats(session, token_id: Optional[int], market_cap: Optional[float], created_at: datetime) -> None:
+    """Fold a new token opportunity into the token's stats."""
+    if not token_id:
+        return
+
+    _upsert_token_stats(
+        session,
+        token_id,
+        max_market_cap=market_cap,
+        last_opportunity_at=created_at
+    )
+
+def bump_token_version(session, token_id: Optional[int]) -> None:
+    """Bump a token's version after changing its own fields, so cached copies and ETags go stale."""
+    if not token_id:
+        return
+
+    _upsert_token_stats(session, token_id)
+    invalidate_on_commit(session, token_tag(token_id))
+
+def rebuild_token_stats(connection) -> int:
+    """Recompute token_stats from the full report/opportunity history.
+
+    Used to backfill the table and to repair it after bulk data fixes that
+    bypass the regular write paths. Returns the number of rows written.
+    """
+    prefix = get_env_prefix()
+    result = connection.execute(text(f"""
+        INSERT INTO {prefix}token_stats
+            (token_id, max_market_cap, last_opportunity_at, kol_events, last_social_at, updated_at)
+        SELECT
+            t.id,
+            o.max_market_cap,
+            o.max_created_at,
+            COALESCE(k.total_events, 0),
+            k.max_timestamp,
+            NOW()
+        FROM {prefix}tokens t
+        LEFT JOIN (
+            SELECT token_id,
+                   MAX(market_cap) AS max_market_cap,
+                   MAX(created_at) AS max_created_at
+            FROM {prefix}token_opportunities
+            WHERE token_id IS NOT NULL
+            GROUP BY token_id
+        ) o ON o.token_id = t.id
+        LEFT JOIN (
+            SELECT r.token_id,
+                   COUNT(r.id)
+                   + COALESCE(SUM(p.reactions_count), 0)
+                   + COALESCE(SUM(p.replies_count), 0)
+                   + COALESCE(SUM(p.reposts_count), 0) AS total_events,
+                   MAX(p.timestamp) AS max_timestamp
+            FROM {prefix}token_reports r
+            LEFT JOIN {prefix}social_media_posts p ON p.token_report_id = r.id
+            WHERE r.token_id IS NOT NULL
+            GROUP BY r.token_id
+        ) k ON k.token_id = t.id
+        WHERE o.token_id IS NOT NULL OR k.token_id IS NOT NULL
+        ON CONFLICT (token_id) DO UPDATE SET
+            max_market_cap = EXCLUDED.max_market_cap,
+            last_opportunity_at = EXCLUDED.last_opportunity_at,
+            kol_events = EXCLUDED.kol_events,
+            last_social_at = EXCLUDED.last_social_at,
+            version = {prefix}token_stats.version + 1,
+            updated_at = EXCLUDED.updated_at
+    """))
+    return result.rowcount
+
+def rebuild_token_hourly_stats(connection) -> int:
+    """Recompute the hourly mention rollups (and their author sets) from all linked posts.
+
+    Returns the number of hourly rows written.
+    """
+    prefix = get_env_prefix()
+    connection.execute(text(f"""
+        INSERT INTO {prefix}token_hourly_authors (token_id, bucket, author_id)
+        SELECT DISTINCT r.token_id, date_trunc('hour', p.original_timestamp), p.author_id
+        FROM {prefix}token_reports r
+        JOIN {prefix}social_media_posts p ON p.token_report_id = r.id
+        WHERE r.token_id IS NOT NULL
+        ON CONFLICT DO NOTHING
+    """))
+    result = connection.execute(text(f"""
+        INSERT INTO {prefix}token_hourly_stats
+            (token_id, bucket, mentions, unique_authors, reactions, replies, reposts, updated_at)
+        SELECT
+            r.token_id,
+            date_trunc('hour', p.original_timestamp),
+            COUNT(*),
+            COUNT(DISTINCT p.author_id),
+            COALESCE(SUM(p.reactions_count), 0),
+            COALESCE(SUM(p.replies_count), 0),
+            COALESCE(SUM(p.reposts_count), 0),
+            NOW()
+        FROM {prefix}token_reports r
+        JOIN {prefix}social_media_posts p ON p.token_report_id = r.id
+        WHERE r.token_id IS NOT NULL
+        GROUP BY 1, 2
+        ON CONFLICT (token_id, bucket) DO UPDATE SET
+            mentions = EXCLUDED.mentions,
+            unique_authors = EXCLUDED.unique_authors,
+            reactions = EXCLUDED.reactions,
+            replies = EXCLUDED.replies,
+            reposts = EXCLUDED.reposts,
+            updated_at = EXCLUDED.updated_at
+    """))
+    return result.rowcount
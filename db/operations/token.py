@@ -1,7 +1,108 @@
 """Token database operations"""
-from typing import Dict, Optional
-from sqlalchemy import or_, and_, func
-from ..models.token import TokenDB
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from sqlalchemy import or_, and_, tuple_
+from ..models.token import TokenDB, canonical_token_address
+from ..cache import invalidate_on_commit, tokens_sort_tag, token_identity_cache, remember_token_on_commit
+
+def find_token_by_address(session, address: str, chain: Optional[str] = None) -> Optional[TokenDB]:
+    """Find a token by address (on chain, if given) through the token identity cache.
+
+    A cached id is loaded by primary key, which is free when the token is already
+    in the session; otherwise the canonical address index is probed and the result
+    remembered.
+    """
+    token_id = token_identity_cache.get(address, chain)
+    if token_id is not None:
+        token = session.get(TokenDB, token_id)
+        if token is not None:
+            return token
+        token_identity_cache.discard(token_id)
+
+    query = session.query(TokenDB).filter(
+        TokenDB.canonical_address == canonical_token_address(address, chain)
+    )
+    if chain:
+        query = query.filter(TokenDB.chain == chain)
+    token = query.first()
+    if token is not None:
+        token_identity_cache.set(token.id, token.address, token.chain)
+    return token
+
+async def find_token_row_by_address(session, address: str, build_query: Callable):
+    """Async counterpart of find_token_by_address for the API's address-only lookups.
+
+    build_query(condition) must return a select whose first column is TokenDB.id or
+    the TokenDB entity, filtered by condition. Returns the first row, or None.
+    """
+    token_id = token_identity_cache.get(address)
+    if token_id is not None:
+        result = await session.execute(build_query(TokenDB.id == token_id))
+        row = result.first()
+        if row is not None:
+            return row
+        token_identity_cache.discard(token_id)
+
+    result = await session.execute(
+        build_query(TokenDB.canonical_address == canonical_token_address(address))
+    )
+    row = result.first()
+    if row is not None:
+        token = row[0]
+        if isinstance(token, TokenDB):
+            token_identity_cache.set(token.id, token.address, token.chain)
+        else:
+            token_identity_cache.set(token, address, None)
+    return row
+
+async def find_token_rows_by_chain_addresses(session, pairs: Iterable[Tuple[str, str]], build_query: Callable) -> Dict:
+    """Resolve many (chain, address) pairs in one query, through the token identity cache.
+
+    build_query(condition) must return a select whose first column is the TokenDB
+    entity with chain and canonical_address loaded, filtered by condition. Cached ids
+    and uncached (chain, canonical address) keys go into the same statement.
+    Returns {(chain, canonical address): row} for the pairs that matched.
+    """
+    keys = {(chain.lower(), canonical_token_address(address, chain)): (chain, address) for chain, address in pairs}
+    if not keys:
+        return {}
+
+    cached_ids = {}
+    misses = []
+    for key, (chain, address) in keys.items():
+        token_id = token_identity_cache.get(address, chain)
+        if token_id is None:
+            misses.append(key)
+        else:
+            cached_ids[token_id] = key
+
+    conditions = []
+    if cached_ids:
+        conditions.append(TokenDB.id.in_(list(cached_ids)))
+    if misses:
+        conditions.append(tuple_(TokenDB.chain, TokenDB.canonical_address).in_(misses))
+    result = await session.execute(build_query(or_(*conditions)))
+
+    rows = {}
+    for row in result.all():
+        token = row[0]
+        key = (token.chain.lower(), token.canonical_address)
+        if key in keys:
+            rows[key] = row
+            token_identity_cache.set(token.id, token.address, token.chain)
+
+    # Cached ids whose token row is gone: forget them and probe their keys by address
+    stale = []
+    for token_id, key in cached_ids.items():
+        if key not in rows:
+            token_identity_cache.discard(token_id)
+            stale.append(key)
+    if stale:
+        result = await session.execute(build_query(tuple_(TokenDB.chain, TokenDB.canonical_address).in_(stale)))
+        for row in result.all():
+            token = row[0]
+            rows[(token.chain.lower(), token.canonical_address)] = row
+            token_identity_cache.set(token.id, token.address, token.chain)
+    return rows
 
 def get_or_create_token(session, token_report: Dict) -> Optional[TokenDB]:
     """Get an existing token or create a new one based on token report data.
@@ -19,22 +120,8 @@ def get_or_create_token(session, token_report: Dict) -> Optional[TokenDB]:
     # Try to find existing token
     token = None
     if token_report.get('token_address'):
-        # Handle case sensitivity for Solana addresses
-        if token_report['token_chain'].lower() == 'solana':
-            token = session.query(TokenDB).filter(
-                and_(
-                    TokenDB.chain == token_report['token_chain'],
-                    TokenDB.address == token_report['token_address']
-                )
-            ).first()
-        else:
-            # Case insensitive match for other chains
-            token = session.query(TokenDB).filter(
-                and_(
-                    TokenDB.chain == token_report['token_chain'],
-                    func.lower(TokenDB.address) == token_report['token_address'].lower()
-                )
-            ).first()
+        # Case-sensitive for Solana addresses, case-insensitive for other chains
+        token = find_token_by_address(session, token_report['token_address'], token_report['token_chain'])
     
     # If no token found by address, try to find by chain and symbol
     if not token:
@@ -62,5 +149,7 @@ def get_or_create_token(session, token_report: Dict) -> Optional[TokenDB]:
         )
         session.add(token)
         session.flush()  # Get ID without committing
+        invalidate_on_commit(session, tokens_sort_tag(None))
+        remember_token_on_commit(session, token)
         
     return token
@@ -0,0 +1,73 @@
+"""
+Per-request SQL statement counting.
+
+Engine-level cursor events add every statement's count and duration to the
+QueryStats bound to the current context by track_queries(). The binding is a
+ContextVar, so it follows the request through async handlers and into the
+threadpool that runs sync ones; statements issued outside any tracked context
+(startup, after-commit callbacks on other threads) are not counted.
+
+Statements are also counted by their SQL text: the same statement running many
+times in one request is the signature of an N+1 lazy load.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+_START_KEY = "query_stats_start"
+
+class QueryStats:
+    """Statement count, total database time and per-statement counts for one unit of work."""
+
+    def __init__(self):
+        self.statements = 0
+        self.duration = 0.0
+        self.by_statement: Counter = Counter()
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements run at least threshold times, most frequent first."""
+        return [(sql, count) for sql, count in self.by_statement.most_common() if count >= threshold]
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count the statements executed within the block (including in threads it hands work to)."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    starts = conn.info.get(_START_KEY)
+    if stats is None or not starts:
+        return
+    stats.statements += 1
+    stats.duration += time.perf_counter() - starts.pop()
+    stats.by_statement[statement] += 1
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(_START_KEY):
+        conn.info[_START_KEY].pop()
@@ -0,0 +1,67 @@
+"""
+Check the token candidate extractor (agents/candidates.py) against stored token reports.
+
+Runs the extractor over every post whose token report came from the token finder
+and prints:
+  - skip rate: posts the extractor would have kept from the token finder
+  - skip precision: of those, posts the token finder also found no purchasable token in
+  - recall: posts with a purchasable token in which the extractor found a candidate
+followed by the missed positives, so the patterns can be extended.
+
+Usage: python db/scripts/check_candidate_extractor.py [--show N]
+"""
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from sqlalchemy import text
+from database import get_engine, get_env_prefix
+from agents.candidates import extract_token_candidates, NO_CANDIDATES_REASONING
+
+def check_candidate_extractor(show: int = 20):
+    """Compare the extractor's skip decisions with the token finder's reports"""
+    prefix = get_env_prefix()
+    total = skipped = skipped_negative = positives = positives_found = 0
+    missed = []
+
+    with get_engine().connect() as conn:
+        rows = conn.execution_options(yield_per=1000).execute(text(f"""
+            SELECT p.post_id, p.text, r.mentions_purchasable_token, r.token_symbol, r.token_address
+            FROM {prefix}social_media_posts p
+            JOIN {prefix}token_reports r ON r.id = p.token_report_id
+            WHERE r.reasoning IS DISTINCT FROM :skipped_reasoning
+        """), {"skipped_reasoning": NO_CANDIDATES_REASONING})
+
+        for row in rows:
+            total += 1
+            has_candidates = bool(extract_token_candidates(row.text))
+            if not has_candidates:
+                skipped += 1
+                if not row.mentions_purchasable_token:
+                    skipped_negative += 1
+            if row.mentions_purchasable_token:
+                positives += 1
+                if has_candidates:
+                    positives_found += 1
+                elif len(missed) < show:
+                    missed.append(row)
+
+    def share(part: int, whole: int) -> str:
+        return f"{part}/{whole} ({part / whole:.1%})" if whole else f"{part}/0"
+
+    print(f"Posts with token finder reports: {total}")
+    print(f"Skip rate:      {share(skipped, total)}")
+    print(f"Skip precision: {share(skipped_negative, skipped)} of skipped posts had no purchasable token")
+    print(f"Recall:         {share(positives_found, positives)} of purchasable-token posts had a candidate")
+
+    if missed:
+        print(f"\nPurchasable-token posts without a candidate (first {len(missed)}):")
+        for row in missed:
+            print(f"  {row.post_id}: {row.token_symbol} {row.token_address or ''}")
+            print(f"    {' '.join(row.text.split())[:200]}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--show', type=int, default=20, help='Missed positives to print')
+    args = parser.parse_args()
+    check_candidate_extractor(show=args.show)
@@ -2,6 +2,7 @@ import os
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
 import logging
+from db.models.token import canonical_token_address
 
 # Configure logging
 logging.basicConfig(
@@ -46,15 +47,15 @@ def sync_tokens():
 
                 # Process tokens with addresses
                 for token in address_tokens:
-                    # Check if token already exists by address (case-insensitive)
+                    # Check if token already exists by address (case-insensitive for EVM chains)
                     existing = conn.execute(text("""
                         SELECT id
                         FROM prod_tokens
                         WHERE chain = :chain
-                        AND LOWER(address) = LOWER(:address)
+                        AND canonical_address = :canonical_address
                     """), {
                         'chain': token.chain,
-                        'address': token.address
+                        'canonical_address': canonical_token_address(token.address, token.chain)
                     }).first()
 
                     if existing:
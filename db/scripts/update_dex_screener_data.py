@@ -9,6 +9,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 from db.models.token import TokenDB
 from db.models.base import get_session
 from db.operations.social import fetch_dex_screener_data
+from db.operations.stats import bump_token_version
 
 async def update_tokens_with_dex_data():
     """Update all tokens with data from DEX Screener."""
@@ -34,6 +35,7 @@ async def update_tokens_with_dex_data():
                 token.twitter_url = dex_data.get('twitter_url') or token.twitter_url
                 token.telegram_url = dex_data.get('telegram_url') or token.telegram_url
                 token.token_created_at = dex_data.get('token_created_at') or token.token_created_at
+                bump_token_version(session, token.id)
             else:
                 print(f"No data found for {token.symbol}")
         
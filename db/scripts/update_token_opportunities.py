@@ -1,7 +1,7 @@
 from sqlalchemy import text, Column, String, JSON, Integer, Float, DateTime, ForeignKey, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from database import get_session
+from database import get_session, canonical_token_address
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List
 from agents.models import Chain
@@ -16,6 +16,7 @@ class ProdTokenDB(SQLModel, table=True):
     name: str
     chain: Chain = Field(sa_column=Column(String, nullable=False))
     address: Optional[str] = Field(index=True)
+    canonical_address: Optional[str] = Field(default=None)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     token_opportunities: List["ProdTokenOpportunityDB"] = Relationship(back_populates="token")
@@ -54,10 +55,10 @@ def update_token_relationships():
         
         updates = 0
         for opp in opportunities:
-            # Find matching token by chain and contract address (case insensitive)
+            # Find matching token by chain and contract address (case insensitive for EVM chains)
             matching_token = session.query(ProdTokenDB).filter(
                 ProdTokenDB.chain == opp.chain,
-                func.lower(ProdTokenDB.address) == func.lower(opp.contract_address)
+                ProdTokenDB.canonical_address == canonical_token_address(opp.contract_address, opp.chain)
             ).first()
             
             if matching_token:
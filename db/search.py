@@ -0,0 +1,46 @@
+"""
+Full-text search over what KOLs said about tokens.
+
+Social media post text, token report reasoning and token opportunity
+justification each carry a search_vector tsvector column with a GIN index.
+The columns are stored generated columns, so Postgres fills them in the same
+statement that writes the row and ingestion pays no extra round trip.
+
+They are deliberately left out of the ORM models so regular loads don't carry
+them; queries reach them through search_vector(model).
+"""
+from sqlalchemy import func, literal_column, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from .models.alpha import TokenOpportunityDB
+from .models.social import SocialMediaPostDB, TokenReportDB
+
+# Text search configuration used for both the stored vectors and the queries
+SEARCH_CONFIG = 'english'
+
+# Searchable sources: name -> (model, text column)
+SEARCH_SOURCES = {
+    'post': (SocialMediaPostDB, 'text'),
+    'report': (TokenReportDB, 'reasoning'),
+    'opportunity': (TokenOpportunityDB, 'justification'),
+}
+
+def search_vector(model):
+    """The model table's search_vector column, for use in queries."""
+    return literal_column(f"{model.__tablename__}.search_vector", type_=TSVECTOR)
+
+def search_query(q: str):
+    """Parse user input (quoted phrases, OR, -negation) into a tsquery."""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+def ensure_search_schema(connection) -> None:
+    """Add the search_vector columns and GIN indexes if missing. Safe to run repeatedly."""
+    for model, column in SEARCH_SOURCES.values():
+        table = model.__tablename__
+        connection.execute(text(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', coalesce({column}, ''))) STORED"
+        ))
+        connection.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+            f"ON {table} USING GIN (search_vector)"
+        ))
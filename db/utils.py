@@ -6,6 +6,10 @@ from .connection import get_engine, get_env_prefix, tables_exist
 from .models.alpha import AlphaReportDB, TokenOpportunityDB
 from .models.token import TokenDB
 from .models.social import SocialMediaPostDB, TokenReportDB
+from .models.stats import TokenStatsDB, TokenHourlyStatsDB, TokenHourlyAuthorDB
+from .models.job import JobDB
+from .operations.stats import rebuild_token_stats, rebuild_token_hourly_stats
+from .search import ensure_search_schema
 from .models.base import get_session
 from agents.models import Chain
 
@@ -315,6 +319,10 @@ def reset_db():
             
             # Drop dev tables in correct order
             tables_to_drop = [
+                "dev_token_stats",
+                "dev_token_hourly_stats",
+                "dev_token_hourly_authors",
+                "dev_jobs",
                 "dev_token_opportunities",
                 "dev_alpha_reports",
                 "dev_social_media_posts",
@@ -334,8 +342,13 @@ def reset_db():
         print("Recreating tables...")
         # Recreate tables
         SQLModel.metadata.create_all(engine)
+        with engine.begin() as conn:
+            ensure_search_schema(conn)
         print("Populating development data...")
         populate_dev_data()
+        with engine.begin() as conn:
+            rebuild_token_stats(conn)
+            rebuild_token_hourly_stats(conn)
         print("Database reset complete")
     except Exception as e:
         print(f"Error resetting database: {e}")
@@ -349,7 +362,12 @@ def create_db_and_tables(force_reset: bool = False):
         engine = get_engine()
         try:
             SQLModel.metadata.create_all(engine)
+            with engine.begin() as conn:
+                ensure_search_schema(conn)
             populate_dev_data()
+            with engine.begin() as conn:
+                rebuild_token_stats(conn)
+                rebuild_token_hourly_stats(conn)
         except Exception as e:
             print(f"Warning: Some tables already exist - {str(e)}")
 
@@ -0,0 +1,172 @@
+"""
+Postgres-backed background jobs for the agent endpoints.
+
+/api/analyze_and_scout and /api/multi_agent_alpha_scout run the token finder and
+alpha scout graphs, which take minutes. They enqueue a job with submit_job(),
+answer 202 with its id, and a pool of async workers runs the graph; clients poll
+/api/jobs/{id} for the status and result.
+
+Handlers are registered per job kind with @job_handler(kind). JobWorkerPool runs
+JOB_WORKERS (default 2) workers on the server's event loop; set JOB_WORKERS=0 to
+keep the web process out of it and run `python job_queue.py` as separate worker
+processes instead. Claiming uses FOR UPDATE SKIP LOCKED (db/operations/job.py),
+so any mix of the two is safe. Idle workers poll every JOB_POLL_INTERVAL seconds
+(default 1) and are woken at once by jobs submitted in their own process.
+
+A job runs for at most JOB_LEASE_SECONDS (default 900) less a minute's margin. A
+job whose worker died is run again when its lease expires, up to max_attempts
+times; jobs interrupted by a shutdown go straight back to the queue.
+"""
+import asyncio
+import os
+import socket
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from db.connection import get_async_session
+from db.models.job import JobDB
+from db.operations.job import (
+    enqueue_job, claim_job, finish_job, release_job,
+    JOB_SUCCEEDED, JOB_FAILED
+)
+from observability import JOB_DURATION
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the decorated coroutine function to run jobs of this kind with their payload."""
+    def decorator(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        return handler
+    return decorator
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+class JobWorkerPool:
+    """A fixed number of asyncio tasks that claim and run queued jobs."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[int] = None
+    ):
+        self.workers = workers if workers is not None else int(os.getenv("JOB_WORKERS", "2"))
+        self.poll_interval = poll_interval if poll_interval is not None else _env_float("JOB_POLL_INTERVAL", 1.0)
+        self.lease_seconds = lease_seconds if lease_seconds is not None else int(os.getenv("JOB_LEASE_SECONDS", "900"))
+        # Leave a margin so a job times out here before its lease lets another worker take it
+        self.timeout = max(self.lease_seconds - 60, self.lease_seconds / 2)
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    def start(self) -> None:
+        self._stopping = False
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for n in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._work(f"{prefix}:{n}")))
+        if self.workers:
+            print(f"Started {self.workers} job workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running are put back in the queue."""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def _work(self, worker_id: str) -> None:
+        while not self._stopping:
+            try:
+                async with get_async_session() as session:
+                    job = await claim_job(session, worker_id, self.lease_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error claiming job in {worker_id}: {str(e)}")
+                job = None
+
+            if job is not None:
+                await self._run(job)
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, job: JobDB) -> None:
+        status, result, error = JOB_FAILED, None, None
+        start = time.perf_counter()
+        try:
+            handler = _handlers.get(job.kind)
+            if job.attempts > job.max_attempts:
+                error = f"Gave up after {job.max_attempts} attempts"
+            elif handler is None:
+                error = f"No handler for job kind {job.kind}"
+            else:
+                result = jsonable_encoder(await asyncio.wait_for(handler(job.payload), self.timeout))
+                status = JOB_SUCCEEDED
+        except asyncio.CancelledError:
+            async with get_async_session() as session:
+                await release_job(session, job)
+            raise
+        except asyncio.TimeoutError:
+            error = f"Timed out after {self.timeout:.0f} seconds"
+        except HTTPException as e:
+            error = str(e.detail)
+        except Exception as e:
+            error = str(e)
+
+        JOB_DURATION.labels(job.kind, status).observe(time.perf_counter() - start)
+        if error:
+            print(f"Job {job.id} ({job.kind}) failed: {error}")
+        try:
+            async with get_async_session() as session:
+                if not await finish_job(session, job, status, result=result, error=error):
+                    print(f"Job {job.id} was reclaimed by another worker before it finished here")
+        except Exception as e:
+            print(f"Error recording outcome of job {job.id}: {str(e)}")
+
+job_workers = JobWorkerPool()
+
+async def submit_job(kind: str, payload: Dict[str, Any]) -> JobDB:
+    """Queue a job of a registered kind and wake this process's idle workers."""
+    if kind not in _handlers:
+        raise ValueError(f"No handler for job kind {kind}")
+    async with get_async_session() as session:
+        job = await enqueue_job(session, kind, jsonable_encoder(payload))
+        await session.commit()
+    job_workers.wake()
+    return job
+
+async def _run_workers() -> None:
+    job_workers.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await job_workers.stop()
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    # Importing the generation endpoints registers their job handlers, with the
+    # job_queue module they import rather than with this __main__ copy of it
+    import routers.api_generation  # noqa: F401
+    import job_queue
+
+    try:
+        asyncio.run(job_queue._run_workers())
+    except KeyboardInterrupt:
+        pass
@@ -1,51 +1,99 @@
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import uvicorn
 import os
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from routers import api
-from database import create_db_and_tables
+from database import create_db_and_tables, get_session
+from db.connection import dispose_async_engine
+from db.near_duplicates import load_recent_posts, near_duplicate_index
+from job_queue import job_workers
+from compression import CompressionMiddleware
+from query_budget import QueryStatsMiddleware
+from observability import MetricsMiddleware, metrics_endpoint
+from static_assets import (
+    build_static_assets, static_url, StaticAssetFiles,
+    DIST_DIR, STATIC_DIR, IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+)
 
 load_dotenv()
 
 app = FastAPI(name="AlphaDRY")
 
+# Compress API responses and pages above the size threshold
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1000"))
+)
+
+# Count each request's SQL statements (X-DB-Queries / Server-Timing) and check query budgets
+app.add_middleware(QueryStatsMiddleware)
+
+# Per-route latency histograms, served with the pool and agent metrics at /metrics
+app.add_middleware(MetricsMiddleware)
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
 
 # Create database tables on startup
 @app.on_event("startup")
 async def startup_event():
     create_db_and_tables(force_reset=False)
+    # Index the posts processed within the reuse window for near-duplicate lookups
+    if near_duplicate_index.enabled:
+        try:
+            since = datetime.utcnow() - timedelta(seconds=near_duplicate_index.max_age_seconds)
+            with get_session() as session:
+                print(f"Indexed {load_recent_posts(session, since)} recent posts for near-duplicate lookups")
+        except Exception as e:
+            print(f"Error indexing recent posts for near-duplicate lookups: {str(e)}")
+    # Run queued agent jobs (JOB_WORKERS, default 2; 0 when separate worker processes run them)
+    job_workers.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await job_workers.stop()
+    await dispose_async_engine()
 
 
 # Mount the API router
 app.include_router(api.router)
 
-# Serve static files from the static directory
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Build hashed, precompressed static assets and serve them as immutable;
+# the unhashed files stay available for paths assembled at runtime
+try:
+    build_static_assets()
+except Exception as e:
+    # E.g. a read-only deploy: static_url() falls back to the unhashed /static files
+    print(f"Error building static assets, serving them unhashed: {str(e)}")
+app.mount(
+    "/static/dist",
+    StaticAssetFiles(directory=DIST_DIR, cache_control=IMMUTABLE_CACHE_CONTROL, check_dir=False),
+    name="static_dist"
+)
+app.mount("/static", StaticAssetFiles(directory=STATIC_DIR, cache_control=REVALIDATE_CACHE_CONTROL), name="static")
 
 # Configure templates
 templates = Jinja2Templates(directory=".")
+templates.env.globals["static_url"] = static_url
 
 
 @app.get("/")
 async def read_index(request: Request):
-    return templates.TemplateResponse("index.html", {
-        "request": request,
+    return templates.TemplateResponse(request, "index.html", {
         "api_key": os.getenv("API_KEY", "")
     })
 
 @app.get("/token")
 async def read_token(request: Request):
-    return templates.TemplateResponse("token.html", {
-        "request": request,
+    return templates.TemplateResponse(request, "token.html", {
         "api_key": os.getenv("API_KEY", "")
     })
 
 @app.get("/tokens")
 async def read_tokens(request: Request):
-    return templates.TemplateResponse("tokens.html", {
-        "request": request,
+    return templates.TemplateResponse(request, "tokens.html", {
         "api_key": os.getenv("API_KEY", "")
     })
 
@@ -11,6 +11,8 @@ from dotenv import load_dotenv
 # Import all models to ensure they are registered with SQLModel metadata
 from db.models.alpha import *
 from db.models.social import *
+from db.models.stats import *
+from db.models.job import *
 from db.connection import get_env_prefix
 
 # Load environment variables
@@ -0,0 +1,31 @@
+"""add (created_at, id) keyset index on alpha_reports
+
+Revision ID: add_alpha_reports_keyset_index
+Revises: add_token_child_recent_indexes
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from db.connection import get_env_prefix
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_alpha_reports_keyset_index'
+down_revision: Union[str, None] = 'add_token_child_recent_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    prefix = get_env_prefix()
+    op.execute(
+        f'CREATE INDEX IF NOT EXISTS ix_{prefix}alpha_reports_created_at_keyset '
+        f'ON {prefix}alpha_reports (created_at, id)'
+    )
+    op.execute(f'ANALYZE {prefix}alpha_reports')
+
+
+def downgrade() -> None:
+    prefix = get_env_prefix()
+    op.execute(f'DROP INDEX IF EXISTS ix_{prefix}alpha_reports_created_at_keyset')
@@ -0,0 +1,53 @@
+"""add jobs table for the background job queue
+
+Revision ID: add_jobs_table
+Revises: add_token_hourly_stats
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from db.connection import get_env_prefix
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_jobs_table'
+down_revision: Union[str, None] = 'add_token_hourly_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    prefix = get_env_prefix()
+    conn = op.get_bind()
+    existing = set(sa.inspect(conn).get_table_names())
+
+    if f'{prefix}jobs' not in existing:
+        op.create_table(
+            f'{prefix}jobs',
+            Column('id', Integer, primary_key=True),
+            Column('kind', String, nullable=False),
+            Column('status', String, nullable=False, server_default='queued'),
+            Column('payload', JSON, nullable=False),
+            Column('result', JSON),
+            Column('error', String),
+            Column('attempts', Integer, nullable=False, server_default='0'),
+            Column('max_attempts', Integer, nullable=False, server_default='3'),
+            Column('locked_by', String),
+            Column('locked_until', DateTime),
+            Column('created_at', DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+            Column('started_at', DateTime),
+            Column('finished_at', DateTime)
+        )
+
+    op.execute(f"""
+        CREATE INDEX IF NOT EXISTS ix_{prefix}jobs_claimable
+        ON {prefix}jobs (status, id)
+        WHERE status IN ('queued', 'running')
+    """)
+
+
+def downgrade() -> None:
+    prefix = get_env_prefix()
+    op.execute(f'DROP TABLE IF EXISTS {prefix}jobs')
@@ -0,0 +1,41 @@
+"""add generated text_hash column on social_media_posts
+
+Revision ID: add_post_text_hash
+Revises: add_jobs_table
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+from db.connection import get_env_prefix
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_post_text_hash'
+down_revision: Union[str, None] = 'add_jobs_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of db.models.social.TEXT_HASH_SQL
+TEXT_HASH_SQL = r"md5(btrim(regexp_replace(normalize(text, NFKC), '\s+', ' ', 'g')))"
+
+
+def upgrade() -> None:
+    prefix = get_env_prefix()
+
+    # A stored generated column is computed for every existing row when added,
+    # which doubles as the backfill
+    op.execute(
+        f'ALTER TABLE {prefix}social_media_posts ADD COLUMN IF NOT EXISTS text_hash VARCHAR '
+        f'GENERATED ALWAYS AS ({TEXT_HASH_SQL}) STORED'
+    )
+    op.execute(
+        f'CREATE INDEX IF NOT EXISTS ix_{prefix}social_media_posts_text_hash '
+        f'ON {prefix}social_media_posts (text_hash, timestamp)'
+    )
+    op.execute(f'ANALYZE {prefix}social_media_posts')
+
+
+def downgrade() -> None:
+    prefix = get_env_prefix()
+    op.execute(f'DROP INDEX IF EXISTS ix_{prefix}social_media_posts_text_hash')
+    op.execute(f'ALTER TABLE {prefix}social_media_posts DROP COLUMN IF EXISTS text_hash')
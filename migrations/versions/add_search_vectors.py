@@ -0,0 +1,46 @@
+"""add full-text search_vector columns and GIN indexes
+
+Revision ID: add_search_vectors
+Revises: add_token_canonical_address
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from db.connection import get_env_prefix
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_search_vectors'
+down_revision: Union[str, None] = 'add_token_canonical_address'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of db.search.SEARCH_SOURCES: table suffix -> text column
+SEARCH_COLUMNS = {
+    'social_media_posts': 'text',
+    'token_reports': 'reasoning',
+    'token_opportunities': 'justification',
+}
+
+
+def upgrade() -> None:
+    prefix = get_env_prefix()
+    for table, column in SEARCH_COLUMNS.items():
+        # Adding a stored generated column computes it for every existing row
+        op.execute(
+            f"ALTER TABLE {prefix}{table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('english', coalesce({column}, ''))) STORED"
+        )
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS ix_{prefix}{table}_search_vector '
+            f'ON {prefix}{table} USING GIN (search_vector)'
+        )
+        op.execute(f'ANALYZE {prefix}{table}')
+
+
+def downgrade() -> None:
+    prefix = get_env_prefix()
+    for table in SEARCH_COLUMNS:
+        op.execute(f'DROP INDEX IF EXISTS ix_{prefix}{table}_search_vector')
+        op.execute(f'ALTER TABLE {prefix}{table} DROP COLUMN IF EXISTS search_vector')
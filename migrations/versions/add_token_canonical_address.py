@@ -0,0 +1,69 @@
+"""add generated canonical_address column on tokens
+
+Revision ID: add_token_canonical_address
+Revises: add_alpha_reports_keyset_index
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+from db.connection import get_env_prefix
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_token_canonical_address'
+down_revision: Union[str, None] = 'add_alpha_reports_keyset_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of db.models.token.CANONICAL_ADDRESS_SQL
+CANONICAL_ADDRESS_SQL = (
+    "CASE WHEN lower(left(address, 2)) = '0x' OR lower(chain) <> 'solana' "
+    "THEN lower(address) ELSE address END"
+)
+
+
+def upgrade() -> None:
+    prefix = get_env_prefix()
+    conn = op.get_bind()
+
+    # A stored generated column is computed for every existing row when added,
+    # which doubles as the backfill
+    op.execute(
+        f'ALTER TABLE {prefix}tokens ADD COLUMN IF NOT EXISTS canonical_address VARCHAR '
+        f'GENERATED ALWAYS AS ({CANONICAL_ADDRESS_SQL}) STORED'
+    )
+
+    duplicates = conn.execute(text(f"""
+        SELECT chain, canonical_address, COUNT(*) AS n
+        FROM {prefix}tokens
+        WHERE canonical_address IS NOT NULL
+        GROUP BY chain, canonical_address
+        HAVING COUNT(*) > 1
+        ORDER BY n DESC
+        LIMIT 10
+    """)).fetchall()
+    if duplicates:
+        listed = ", ".join(f"{row.chain}:{row.canonical_address} ({row.n})" for row in duplicates)
+        raise RuntimeError(
+            f"{prefix}tokens has tokens that differ only in address case: {listed}. "
+            f"Merge them (see db/scripts/cleanup_token_duplicates.sql) and rerun the migration."
+        )
+
+    op.execute(
+        f'CREATE UNIQUE INDEX IF NOT EXISTS ix_{prefix}tokens_chain_canonical_address '
+        f'ON {prefix}tokens (chain, canonical_address)'
+    )
+    op.execute(
+        f'CREATE INDEX IF NOT EXISTS ix_{prefix}tokens_canonical_address '
+        f'ON {prefix}tokens (canonical_address)'
+    )
+    op.execute(f'ANALYZE {prefix}tokens')
+
+
+def downgrade() -> None:
+    prefix = get_env_prefix()
+    op.execute(f'DROP INDEX IF EXISTS ix_{prefix}tokens_canonical_address')
+    op.execute(f'DROP INDEX IF EXISTS ix_{prefix}tokens_chain_canonical_address')
+    op.execute(f'ALTER TABLE {prefix}tokens DROP COLUMN IF EXISTS canonical_address')
@@ -0,0 +1,37 @@
+"""add newest-first per-token indexes on token_reports and token_opportunities
+
+Revision ID: add_token_child_recent_indexes
+Revises: add_token_stats_version
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from db.connection import get_env_prefix
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_token_child_recent_indexes'
+down_revision: Union[str, None] = 'add_token_stats_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['token_reports', 'token_opportunities']
+
+
+def upgrade() -> None:
+    prefix = get_env_prefix()
+
+    for table in TABLES:
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS ix_{prefix}{table}_token_recent '
+            f'ON {prefix}{table} (token_id, created_at, id)'
+        )
+        op.execute(f'ANALYZE {prefix}{table}')
+
+
+def downgrade() -> None:
+    prefix = get_env_prefix()
+
+    for table in TABLES:
+        op.execute(f'DROP INDEX IF EXISTS ix_{prefix}{table}_token_recent')
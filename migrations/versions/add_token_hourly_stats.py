@@ -0,0 +1,80 @@
+"""add token_hourly_stats and token_hourly_authors rollup tables
+
+Revision ID: add_token_hourly_stats
+Revises: add_search_vectors
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, text
+from db.connection import get_env_prefix
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_token_hourly_stats'
+down_revision: Union[str, None] = 'add_search_vectors'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    prefix = get_env_prefix()
+    conn = op.get_bind()
+    existing = set(sa.inspect(conn).get_table_names())
+
+    if f'{prefix}token_hourly_stats' not in existing:
+        op.create_table(
+            f'{prefix}token_hourly_stats',
+            Column('token_id', Integer, ForeignKey(f'{prefix}tokens.id', ondelete='CASCADE'), primary_key=True),
+            Column('bucket', DateTime, primary_key=True),
+            Column('mentions', Integer, nullable=False, server_default='0'),
+            Column('unique_authors', Integer, nullable=False, server_default='0'),
+            Column('reactions', Integer, nullable=False, server_default='0'),
+            Column('replies', Integer, nullable=False, server_default='0'),
+            Column('reposts', Integer, nullable=False, server_default='0'),
+            Column('updated_at', DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
+        )
+
+    if f'{prefix}token_hourly_authors' not in existing:
+        op.create_table(
+            f'{prefix}token_hourly_authors',
+            Column('token_id', Integer, ForeignKey(f'{prefix}tokens.id', ondelete='CASCADE'), primary_key=True),
+            Column('bucket', DateTime, primary_key=True),
+            Column('author_id', String, primary_key=True)
+        )
+
+    # Backfill from the posts already linked to tokens through token reports
+    conn.execute(text(f"""
+        INSERT INTO {prefix}token_hourly_authors (token_id, bucket, author_id)
+        SELECT DISTINCT r.token_id, date_trunc('hour', p.original_timestamp), p.author_id
+        FROM {prefix}token_reports r
+        JOIN {prefix}social_media_posts p ON p.token_report_id = r.id
+        WHERE r.token_id IS NOT NULL
+        ON CONFLICT DO NOTHING
+    """))
+    result = conn.execute(text(f"""
+        INSERT INTO {prefix}token_hourly_stats
+            (token_id, bucket, mentions, unique_authors, reactions, replies, reposts, updated_at)
+        SELECT
+            r.token_id,
+            date_trunc('hour', p.original_timestamp),
+            COUNT(*),
+            COUNT(DISTINCT p.author_id),
+            COALESCE(SUM(p.reactions_count), 0),
+            COALESCE(SUM(p.replies_count), 0),
+            COALESCE(SUM(p.reposts_count), 0),
+            NOW()
+        FROM {prefix}token_reports r
+        JOIN {prefix}social_media_posts p ON p.token_report_id = r.id
+        WHERE r.token_id IS NOT NULL
+        GROUP BY 1, 2
+        ON CONFLICT (token_id, bucket) DO NOTHING
+    """))
+    print(f"Backfilled {result.rowcount} {prefix}token_hourly_stats rows")
+
+
+def downgrade() -> None:
+    prefix = get_env_prefix()
+    op.execute(f'DROP TABLE IF EXISTS {prefix}token_hourly_authors')
+    op.execute(f'DROP TABLE IF EXISTS {prefix}token_hourly_stats')
@@ -0,0 +1,59 @@
+"""add composite keyset indexes for /api/tokens sort modes
+
+Revision ID: add_token_keyset_indexes
+Revises: add_token_stats_table
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from db.connection import get_env_prefix
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_token_keyset_indexes'
+down_revision: Union[str, None] = 'add_token_stats_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index suffix, table suffix, key columns, partial index predicate)
+KEYSET_INDEXES = [
+    ('token_stats_market_cap_keyset', 'token_stats', 'max_market_cap, token_id', 'max_market_cap IS NOT NULL'),
+    ('token_stats_opportunity_keyset', 'token_stats', 'last_opportunity_at, token_id', 'last_opportunity_at IS NOT NULL'),
+    ('token_stats_kol_events_keyset', 'token_stats', 'kol_events, token_id', 'kol_events > 0'),
+    ('token_stats_social_keyset', 'token_stats', 'last_social_at, token_id', 'last_social_at IS NOT NULL'),
+    ('tokens_created_at_keyset', 'tokens', 'created_at, id', None),
+]
+
+# Single-column indexes from add_token_stats_table, superseded by the keyset indexes
+SINGLE_COLUMN_INDEXES = ['max_market_cap', 'last_opportunity_at', 'kol_events', 'last_social_at']
+
+
+def upgrade() -> None:
+    prefix = get_env_prefix()
+
+    for index_name, table, columns, predicate in KEYSET_INDEXES:
+        where = f' WHERE {predicate}' if predicate else ''
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS ix_{prefix}{index_name} '
+            f'ON {prefix}{table} ({columns}){where}'
+        )
+
+    for column in SINGLE_COLUMN_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS ix_{prefix}token_stats_{column}')
+
+    op.execute(f'ANALYZE {prefix}token_stats')
+    op.execute(f'ANALYZE {prefix}tokens')
+
+
+def downgrade() -> None:
+    prefix = get_env_prefix()
+
+    for column in SINGLE_COLUMN_INDEXES:
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS ix_{prefix}token_stats_{column} '
+            f'ON {prefix}token_stats ({column})'
+        )
+
+    for index_name, _, _, _ in KEYSET_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS ix_{prefix}{index_name}')
@@ -0,0 +1,93 @@
+"""add token_stats table
+
+Revision ID: add_token_stats_table
+Revises: 81e4e96423f3
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, text
+from db.connection import get_env_prefix
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_token_stats_table'
+down_revision: Union[str, None] = '81e4e96423f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    prefix = get_env_prefix()
+    conn = op.get_bind()
+
+    stats_exists = conn.execute(
+        text(f"""
+        SELECT EXISTS (
+            SELECT 1
+            FROM information_schema.tables
+            WHERE table_schema = 'public'
+            AND table_name = '{prefix}token_stats'
+        )::boolean
+        """)
+    ).scalar()
+
+    if not stats_exists:
+        op.create_table(
+            f'{prefix}token_stats',
+            Column('token_id', Integer, ForeignKey(f'{prefix}tokens.id', ondelete='CASCADE'), primary_key=True),
+            Column('max_market_cap', Float, nullable=True),
+            Column('last_opportunity_at', DateTime, nullable=True),
+            Column('kol_events', Integer, nullable=False, server_default='0'),
+            Column('last_social_at', DateTime, nullable=True),
+            Column('updated_at', DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
+        )
+
+    for column in ['max_market_cap', 'last_opportunity_at', 'kol_events', 'last_social_at']:
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS ix_{prefix}token_stats_{column} '
+            f'ON {prefix}token_stats ({column})'
+        )
+
+    # Backfill from the existing report and opportunity history
+    result = conn.execute(text(f"""
+        INSERT INTO {prefix}token_stats
+            (token_id, max_market_cap, last_opportunity_at, kol_events, last_social_at, updated_at)
+        SELECT
+            t.id,
+            o.max_market_cap,
+            o.max_created_at,
+            COALESCE(k.total_events, 0),
+            k.max_timestamp,
+            NOW()
+        FROM {prefix}tokens t
+        LEFT JOIN (
+            SELECT token_id,
+                   MAX(market_cap) AS max_market_cap,
+                   MAX(created_at) AS max_created_at
+            FROM {prefix}token_opportunities
+            WHERE token_id IS NOT NULL
+            GROUP BY token_id
+        ) o ON o.token_id = t.id
+        LEFT JOIN (
+            SELECT r.token_id,
+                   COUNT(r.id)
+                   + COALESCE(SUM(p.reactions_count), 0)
+                   + COALESCE(SUM(p.replies_count), 0)
+                   + COALESCE(SUM(p.reposts_count), 0) AS total_events,
+                   MAX(p.timestamp) AS max_timestamp
+            FROM {prefix}token_reports r
+            LEFT JOIN {prefix}social_media_posts p ON p.token_report_id = r.id
+            WHERE r.token_id IS NOT NULL
+            GROUP BY r.token_id
+        ) k ON k.token_id = t.id
+        WHERE o.token_id IS NOT NULL OR k.token_id IS NOT NULL
+        ON CONFLICT (token_id) DO NOTHING
+    """))
+    print(f"Backfilled {result.rowcount} {prefix}token_stats rows")
+
+
+def downgrade() -> None:
+    prefix = get_env_prefix()
+    op.execute(f'DROP TABLE IF EXISTS {prefix}token_stats')
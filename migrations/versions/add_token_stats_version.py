@@ -0,0 +1,30 @@
+"""add version column to token_stats
+
+Revision ID: add_token_stats_version
+Revises: add_token_keyset_indexes
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from db.connection import get_env_prefix
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_token_stats_version'
+down_revision: Union[str, None] = 'add_token_keyset_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    prefix = get_env_prefix()
+    op.execute(
+        f'ALTER TABLE {prefix}token_stats '
+        f'ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1'
+    )
+
+
+def downgrade() -> None:
+    prefix = get_env_prefix()
+    op.execute(f'ALTER TABLE {prefix}token_stats DROP COLUMN IF EXISTS version')
@@ -0,0 +1,258 @@
+"""
+Prometheus metrics for HTTP requests, database pools, agents and external calls.
+
+/metrics serves, in the Prometheus text format:
+
+    alphadry_http_request_duration_seconds   histogram per method, route template and status class
+    alphadry_http_requests_in_progress       gauge of requests being handled
+    alphadry_db_pool_*                       size, checked out, overflow and idle connections per
+                                             engine, read at scrape time
+    alphadry_external_call_duration_seconds  histogram per service (openai, tavily, geckoterminal,
+                                             dexscreener) and outcome
+    alphadry_llm_tokens_total                prompt / completion tokens per model
+    alphadry_agent_step_duration_seconds     histogram per LangGraph node and per tool
+    alphadry_job_duration_seconds            histogram per background job kind and outcome
+    alphadry_token_candidate_posts_total     posts by how their token report was made: skipped for lack
+                                             of token candidates, reused from a post with the same text
+                                             or a near_duplicate one, or classified by the token finder
+
+OpenAI and Tavily calls, tools and graph nodes are timed by a LangChain callback
+handler registered for every run in the process, so chains and agents need no
+changes. GeckoTerminal and DexScreener calls go through plain HTTP clients and
+are wrapped in observe_external_call().
+
+Recording is a dict lookup and a histogram bucket increment per event, and the
+pool gauges cost nothing until scraped, so this stays on in production. Metrics
+are per process.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+HTTP_REQUEST_DURATION = Histogram(
+    "alphadry_http_request_duration_seconds",
+    "HTTP request latency, to the end of the response body",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "alphadry_http_requests_in_progress",
+    "HTTP requests currently being handled"
+)
+EXTERNAL_CALL_DURATION = Histogram(
+    "alphadry_external_call_duration_seconds",
+    "Latency of calls to external APIs",
+    ["service", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+)
+LLM_TOKENS = Counter(
+    "alphadry_llm_tokens",
+    "LLM tokens used, from the provider's usage report",
+    ["model", "kind"]
+)
+AGENT_STEP_DURATION = Histogram(
+    "alphadry_agent_step_duration_seconds",
+    "Duration of LangGraph nodes and agent tools",
+    ["kind", "name", "outcome"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+)
+JOB_DURATION = Histogram(
+    "alphadry_job_duration_seconds",
+    "Duration of background jobs run by the worker pool",
+    ["kind", "outcome"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 900)
+)
+TOKEN_CANDIDATE_POSTS = Counter(
+    "alphadry_token_candidate_posts",
+    "Posts by how their token report was made: skipped, reused, near_duplicate or classified",
+    ["outcome"]
+)
+
+class ExternalCall:
+    """Outcome of a call timed by observe_external_call(); set outcome = "error" on a failed response."""
+
+    def __init__(self):
+        self.outcome = "ok"
+
+@contextmanager
+def observe_external_call(service: str) -> Iterator[ExternalCall]:
+    """Time the block as a call to service; an exception counts it as an error."""
+    call = ExternalCall()
+    start = time.perf_counter()
+    try:
+        yield call
+    except BaseException:
+        call.outcome = "error"
+        raise
+    finally:
+        EXTERNAL_CALL_DURATION.labels(service, call.outcome).observe(time.perf_counter() - start)
+
+# --- HTTP ---
+
+def _route_label(scope: Scope) -> str:
+    """Route template of the request (e.g. /api/token/{address}), keeping label cardinality bounded."""
+    route = scope.get("route")
+    if route is None:
+        # Mounted apps such as /static; anything else matched no route
+        return scope.get("root_path") or "unmatched"
+    path = scope["path"]
+    # Routes of included routers may carry only their own part of the path; recover the prefix
+    for i in range(len(path)):
+        if (i == 0 or path[i] == "/") and route.path_regex.match(path[i:]):
+            return path[:i] + route.path_format
+    return route.path_format
+
+class MetricsMiddleware:
+    """Record each HTTP request's latency by method, route template and status class."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], _route_label(scope), f"{status_code // 100}xx"
+            ).observe(time.perf_counter() - start)
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+# --- Database pools ---
+
+class PoolCollector:
+    """Connection pool gauges for each engine created so far, read when scraped."""
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        gauges = {
+            "size": GaugeMetricFamily("alphadry_db_pool_size", "Configured pool size", labels=["engine"]),
+            "checked_out": GaugeMetricFamily("alphadry_db_pool_checked_out", "Connections in use", labels=["engine"]),
+            "overflow": GaugeMetricFamily("alphadry_db_pool_overflow", "Connections open beyond the pool size", labels=["engine"]),
+            "checked_in": GaugeMetricFamily("alphadry_db_pool_checked_in", "Idle connections in the pool", labels=["engine"]),
+        }
+        # Imported here: db imports this module (for its external call timings) while it loads
+        from db.connection import get_pools
+
+        for name, pool in get_pools().items():
+            gauges["size"].add_metric([name], pool.size())
+            gauges["checked_out"].add_metric([name], pool.checkedout())
+            gauges["overflow"].add_metric([name], max(pool.overflow(), 0))
+            gauges["checked_in"].add_metric([name], pool.checkedin())
+        return list(gauges.values())
+
+REGISTRY.register(PoolCollector())
+
+# --- LangChain runs ---
+
+# Run types the handler times: LLM calls and Tavily retrievals as external calls, tools and graph nodes as agent steps
+_LLM_SERVICES = {"ChatOpenAI": "openai", "OpenAI": "openai", "AzureChatOpenAI": "openai"}
+_RETRIEVER_SERVICES = {"TavilySearchAPIRetriever": "tavily"}
+
+def _class_name(serialized: Optional[Dict[str, Any]]) -> str:
+    if not serialized:
+        return ""
+    ids = serialized.get("id") or []
+    return ids[-1] if ids else serialized.get("name", "")
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Times LLM, retriever, tool and LangGraph node runs from their start and end callbacks."""
+
+    # Called inline rather than through an executor; every method is a few dict operations
+    run_inline = True
+
+    def __init__(self):
+        self._runs: Dict[UUID, tuple] = {}
+
+    def _start(self, run_id: UUID, metric, labels: tuple) -> None:
+        self._runs[run_id] = (metric, labels, time.perf_counter())
+
+    def _end(self, run_id: UUID, outcome: str) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            metric, labels, start = run
+            metric.labels(*labels, outcome).observe(time.perf_counter() - start)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, EXTERNAL_CALL_DURATION, (_LLM_SERVICES.get(_class_name(serialized), "llm"),))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start(run_id, EXTERNAL_CALL_DURATION, (_LLM_SERVICES.get(_class_name(serialized), "llm"),))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._end(run_id, "ok")
+        llm_output = response.llm_output or {}
+        usage = llm_output.get("token_usage") or {}
+        model = llm_output.get("model_name", "unknown")
+        if usage.get("prompt_tokens"):
+            LLM_TOKENS.labels(model, "prompt").inc(usage["prompt_tokens"])
+        if usage.get("completion_tokens"):
+            LLM_TOKENS.labels(model, "completion").inc(usage["completion_tokens"])
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, "error")
+
+    def on_retriever_start(self, serialized, query, *, run_id, **kwargs):
+        service = _RETRIEVER_SERVICES.get(_class_name(serialized))
+        if service:
+            self._start(run_id, EXTERNAL_CALL_DURATION, (service,))
+
+    def on_retriever_end(self, documents, *, run_id, **kwargs):
+        self._end(run_id, "ok")
+
+    def on_retriever_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, "error")
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._start(run_id, AGENT_STEP_DURATION, ("tool", (serialized or {}).get("name", "unknown")))
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id, "ok")
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, "error")
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, name=None, **kwargs):
+        # LangGraph runs each node as a chain named after the node, tagged with langgraph_node
+        node = (metadata or {}).get("langgraph_node")
+        if node and name == node and not node.startswith("__"):
+            self._start(run_id, AGENT_STEP_DURATION, ("node", node))
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id, "ok")
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, "error")
+
+# A ContextVar whose default is the handler attaches it to every LangChain run in every context
+_metrics_callback_handler: ContextVar[Optional[MetricsCallbackHandler]] = ContextVar(
+    "metrics_callback_handler", default=MetricsCallbackHandler()
+)
+register_configure_hook(_metrics_callback_handler, inheritable=True)
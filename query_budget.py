@@ -0,0 +1,88 @@
+"""
+Per-request SQL statement counts in response headers and logs, with query budgets.
+
+QueryStatsMiddleware tracks the statements each HTTP request runs (see
+db/query_stats.py) and reports them as X-DB-Queries and a Server-Timing "db"
+entry on the response. A request is logged when QUERY_STATS_LOG=1, when it
+exceeds its query budget, or when one statement repeats at least
+N_PLUS_ONE_THRESHOLD times (the shape of an N+1 lazy load).
+
+Endpoints declare a budget with @query_budget(n) under the route decorator;
+DEFAULT_QUERY_BUDGET applies to the rest. With QUERY_BUDGET_STRICT=1 (meant for
+tests) exceeding a budget raises QueryBudgetExceeded once the response has been
+sent, which TestClient re-raises in the calling test. Streaming responses are
+counted up to their first byte in the headers and in full in the log and check.
+"""
+import os
+from typing import Callable, Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from db.query_stats import QueryStats, track_queries
+
+_BUDGET_ATTRIBUTE = "__query_budget__"
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request runs more statements than its budget."""
+
+def query_budget(max_statements: int) -> Callable:
+    """Declare the most SQL statements a request to the decorated endpoint may run."""
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, _BUDGET_ATTRIBUTE, max_statements)
+        return endpoint
+    return decorator
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+class QueryStatsMiddleware:
+    """Count each request's SQL statements, report them in headers and logs, and check budgets."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_budget: Optional[int] = None,
+        strict: Optional[bool] = None,
+        log_all: Optional[bool] = None,
+        n_plus_one_threshold: Optional[int] = None
+    ):
+        self.app = app
+        self.default_budget = default_budget if default_budget is not None else _env_int("DEFAULT_QUERY_BUDGET")
+        self.strict = strict if strict is not None else os.getenv("QUERY_BUDGET_STRICT") == "1"
+        self.log_all = log_all if log_all is not None else os.getenv("QUERY_STATS_LOG") == "1"
+        self.n_plus_one_threshold = n_plus_one_threshold \
+            if n_plus_one_threshold is not None else _env_int("N_PLUS_ONE_THRESHOLD") or 5
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.statements)
+                    headers.append("Server-Timing", f'db;dur={stats.duration_ms:.1f};desc="{stats.statements} queries"')
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+            self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        endpoint = scope.get("endpoint")
+        budget = getattr(endpoint, _BUDGET_ATTRIBUTE, self.default_budget)
+        request = f"{scope['method']} {scope['path']}"
+
+        over_budget = budget is not None and stats.statements > budget
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if self.log_all or over_budget or repeated:
+            print(f"{request}: {stats.statements} queries, {stats.duration_ms:.1f} ms in the database")
+        for statement, count in repeated:
+            print(f"Possible N+1 in {request}: statement ran {count} times: {' '.join(statement.split())[:200]}")
+
+        if over_budget:
+            message = f"{request} ran {stats.statements} queries, over its budget of {budget}"
+            if self.strict:
+                raise QueryBudgetExceeded(message)
+            print(f"Warning: {message}")
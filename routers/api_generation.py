@@ -1,26 +1,47 @@
+import asyncio
 import os
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import APIKeyHeader
 from dotenv import load_dotenv
+from pydantic import ValidationError
 import sqlalchemy as sa
-from sqlalchemy import desc, func, and_, or_, not_, select
+from sqlalchemy import desc, and_, or_, not_, select
+from sqlalchemy.orm import selectinload
 
 from chains.seek_alpha_chain import base_seek_alpha, multi_hop_seek_alpha
 from chains.alpha_chain import Alpha
 from chains.social_summary_chain import social_summary_chain
 from agents.multi_agent_alpha_scout import multi_agent_alpha_scout
 from agents.multi_agent_token_finder import crypto_text_classifier
-from agents.models import TokenAlpha
+from agents.candidates import extract_token_candidates, no_candidates_report
 from agents.tools import IsTokenReport
 from database import (
-    create_alpha_report, TokenReportDB, get_session,
+    create_alpha_report, TokenReportDB, get_session, get_async_session, get_async_read_session,
     create_social_media_post, create_token_report,
     get_or_create_token
 )
 from db.operations.alpha import has_recent_token_report
-from db.operations.social import fetch_dex_screener_data
-from .api_models import Token, SocialMediaInput
+from db.operations.social import (
+    fetch_dex_screener_data, find_social_media_posts, insert_social_media_posts,
+    find_reusable_token_reports, token_report_data
+)
+from db.operations.token import find_token_row_by_address
+from db.operations.job import get_job
+from db.hooks import savepoint
+from db.near_duplicates import (
+    NearDuplicateIndex, near_duplicate_index, post_fingerprint,
+    find_near_duplicate_report, remember_post_on_commit
+)
+from .api_models import (
+    Token, SocialMediaInput, SocialMediaBatchInput, SocialPostAnalysis, SocialPostBatchResult,
+    JobAccepted, JobStatus
+)
+from job_queue import job_handler, submit_job
+from observability import TOKEN_CANDIDATE_POSTS
+from query_budget import query_budget
 from schemas import SocialMediaSummary
 from db.models.token import TokenDB
 from db.models.social import SocialMediaPostDB
@@ -38,24 +59,37 @@ def api_key_auth(api_key: str = Depends(header_scheme)):
 
 router = APIRouter(tags=["generation"])
 
+# Most posts per /analyze_social_posts request, and how many of them the token finder analyzes at once
+ANALYZE_BATCH_MAX_POSTS = 100
+ANALYZE_CONCURRENCY = int(os.getenv("ANALYZE_CONCURRENCY", "8"))
+
+# A post reuses the token report of a post with the same normalized text processed within
+# this many hours (0 turns reuse off)
+TEXT_REUSE_HOURS = float(os.getenv("TEXT_REUSE_HOURS", "24"))
+
+# Posts without an address, cashtag or DEX link get a negative report without the token finder;
+# TOKEN_CANDIDATE_FILTER=0 sends every post through it
+TOKEN_CANDIDATE_FILTER = os.getenv("TOKEN_CANDIDATE_FILTER", "1") != "0"
+
 @router.get(
     "/token/social_summary/{token_address}",
     dependencies=[Depends(api_key_auth)],
     response_model=SocialMediaSummary
 )
+@query_budget(3)
 async def get_token_social_summary(token_address: str):
     """Get a summary of all social media posts related to a token"""
     try:
-        with get_session() as session:
+        async with get_async_read_session() as session:
             # Get token from database (case-sensitive for Solana, case-insensitive for others)
-            token = session.query(TokenDB).filter(
-                sa.or_(
-                    # For Solana: exact match
-                    sa.and_(TokenDB.chain == 'solana', TokenDB.address == token_address),
-                    # For other chains: case-insensitive match
-                    sa.and_(TokenDB.chain != 'solana', func.lower(TokenDB.address) == token_address.lower())
-                )
-            ).first()
+            row = await find_token_row_by_address(
+                session,
+                token_address,
+                lambda condition: select(TokenDB).where(condition).options(
+                    selectinload(TokenDB.token_reports).selectinload(TokenReportDB.social_media_post)
+                ).limit(1)
+            )
+            token = row[0] if row else None
             if not token:
                 raise HTTPException(
                     status_code=404,
@@ -76,22 +110,23 @@ async def get_token_social_summary(token_address: str):
                         f"---\n"
                     )
                     social_posts.append(formatted_post)
-            
-            if not social_posts:
-                return SocialMediaSummary(
-                    summary="No social media posts found for this token.",
-                    total_posts=0
-                )
-            
-            # Generate summary using LLM chain with detailed post information
-            summary_result = await social_summary_chain.ainvoke({
-                "posts": "\n".join(social_posts)
-            })
-            
+        
+        if not social_posts:
             return SocialMediaSummary(
-                summary=summary_result,  # summary_result is already the text content
-                total_posts=len(social_posts)
+                summary="No social media posts found for this token.",
+                total_posts=0
             )
+        
+        # Generate summary using LLM chain with detailed post information; the
+        # connection has already gone back to the pool
+        summary_result = await social_summary_chain.ainvoke({
+            "posts": "\n".join(social_posts)
+        })
+        
+        return SocialMediaSummary(
+            summary=summary_result,  # summary_result is already the text content
+            total_posts=len(social_posts)
+        )
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -121,12 +156,37 @@ async def get_multi_hop_seek_alpha(token: Token):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _job_accepted(job, response: Response) -> JobAccepted:
+    """202 body for a queued job, pointing at /api/jobs/{id} in the Location header too."""
+    status_url = f"/api/jobs/{job.id}"
+    response.headers["Location"] = status_url
+    return JobAccepted(job_id=job.id, status=job.status, status_url=status_url)
+
 @router.post(
     "/multi_agent_alpha_scout",
     dependencies=[Depends(api_key_auth)],
-    response_model=TokenAlpha
+    response_model=JobAccepted,
+    status_code=status.HTTP_202_ACCEPTED
 )
-async def get_multi_agent_alpha_scout(data: dict):
+@query_budget(1)
+async def get_multi_agent_alpha_scout(data: dict, response: Response):
+    """Queue an alpha scout run; the TokenAlpha result is served by /api/jobs/{id}."""
+    if 'token_report' not in data:
+        raise HTTPException(status_code=400, detail="token_report is required")
+    try:
+        IsTokenReport(**data['token_report'])
+    except (TypeError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid token_report: {str(e)}")
+    try:
+        job = await submit_job("multi_agent_alpha_scout", data)
+    except Exception as e:
+        print(f"Error queueing multi_agent_alpha_scout: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return _job_accepted(job, response)
+
+@job_handler("multi_agent_alpha_scout")
+async def run_multi_agent_alpha_scout(data: dict):
+    """Run the alpha scout on a token report and save its opportunity; returns the TokenAlpha."""
     try:
         # Extract token_report and token_report_id from request data
         if 'token_report' not in data:
@@ -229,16 +289,43 @@ async def get_multi_agent_alpha_scout(data: dict):
                 
             except Exception as e:
                 session.rollback()
-                print(f"Database error in get_multi_agent_alpha_scout: {str(e)}")
+                print(f"Database error in run_multi_agent_alpha_scout: {str(e)}")
                 raise HTTPException(
                     status_code=500,
                     detail=f"Database error: {str(e)}"
                 )
                 
     except Exception as e:
-        print(f"Error in get_multi_agent_alpha_scout: {str(e)}")
+        print(f"Error in run_multi_agent_alpha_scout: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _skip_token_finder(text: str) -> bool:
+    """Whether a post can do without the token finder because it names no token candidate."""
+    if not TOKEN_CANDIDATE_FILTER or extract_token_candidates(text):
+        return False
+    TOKEN_CANDIDATE_POSTS.labels("skipped").inc()
+    return True
+
+def _text_reuse_since() -> Optional[datetime]:
+    """Oldest processing time of a post whose token report a post with the same text may reuse."""
+    if TEXT_REUSE_HOURS <= 0:
+        return None
+    return datetime.utcnow() - timedelta(hours=TEXT_REUSE_HOURS)
+
+def _find_reusable_token_report(session, social_post: SocialMediaPostDB) -> Optional[Dict[str, Any]]:
+    """Classification of a recent post with the same normalized text, if there is one."""
+    since = _text_reuse_since()
+    if since is None or not social_post.text_hash:
+        return None
+    report = find_reusable_token_reports(session, [social_post.text_hash], since).get(social_post.text_hash)
+    return token_report_data(report) if report else None
+
+def _find_near_duplicate_token_report(session, text: str) -> Optional[Dict[str, Any]]:
+    """Classification of a recent post nearly identical to text (see db/near_duplicates.py), if there is one."""
+    report_id = find_near_duplicate_report(text)
+    report = session.get(TokenReportDB, report_id) if report_id is not None else None
+    return token_report_data(report) if report else None
+
 @router.post(
     "/analyze_social_post",
     dependencies=[Depends(api_key_auth)],
@@ -290,15 +377,30 @@ async def analyze_social_post(input_data: SocialMediaInput, existing_session=Non
             session.add(social_post)
             session.flush()
 
-        # Analyze text for token mentions
-        token_report = await crypto_text_classifier.ainvoke({
-            'messages': [input_data.text]
-        })
+        # Analyze text for token mentions, unless it names no token candidate at all or
+        # a recent post with the same or nearly the same text (a recast, a shill campaign) already was
+        reused_report = None
+        has_candidates = not _skip_token_finder(input_data.text)
+        if not has_candidates:
+            token_report = no_candidates_report()
+        else:
+            reused_report = _find_reusable_token_report(session, social_post)
+            if reused_report:
+                TOKEN_CANDIDATE_POSTS.labels("reused").inc()
+                token_report = reused_report
+            elif (reused_report := _find_near_duplicate_token_report(session, input_data.text)):
+                TOKEN_CANDIDATE_POSTS.labels("near_duplicate").inc()
+                token_report = reused_report
+            else:
+                TOKEN_CANDIDATE_POSTS.labels("classified").inc()
+                token_report = await crypto_text_classifier.ainvoke({
+                    'messages': [input_data.text]
+                })
         if not token_report:
             raise HTTPException(status_code=500, detail="Failed to analyze text with token finder agent")
 
-        # Fetch additional DEX data if token address available
-        if token_report.get('token_address'):
+        # Fetch additional DEX data if token address available (a reused report's token already has it)
+        if token_report.get('token_address') and not reused_report:
             dex_data = await fetch_dex_screener_data(token_report['token_address'])
             if dex_data:
                 token_report.update(dex_data)
@@ -315,6 +417,8 @@ async def analyze_social_post(input_data: SocialMediaInput, existing_session=Non
         
         if not db_token_report:
             raise ValueError("Failed to create token report")
+        if has_candidates:
+            remember_post_on_commit(session, input_data.text, db_token_report.id)
             
         # Verify the relationship
         session.refresh(social_post)
@@ -335,13 +439,252 @@ async def analyze_social_post(input_data: SocialMediaInput, existing_session=Non
         if manage_session:
             session.close()
 
+def _social_post_row(input_data: SocialMediaInput, post_id: str, now: datetime) -> Dict[str, Any]:
+    """Column values of a new SocialMediaPostDB row, as analyze_social_post creates it."""
+    raw_data = input_data.dict()
+    if raw_data.get('original_timestamp'):
+        raw_data['original_timestamp'] = raw_data['original_timestamp'].isoformat()
+    return {
+        'source': input_data.source,
+        'post_id': post_id,
+        'author_id': input_data.author_id,
+        'author_username': input_data.author_username,
+        'author_display_name': input_data.author_display_name,
+        'text': input_data.text,
+        'original_timestamp': input_data.original_timestamp or now,
+        'timestamp': now,
+        'reactions_count': input_data.reactions_count,
+        'replies_count': input_data.replies_count,
+        'reposts_count': input_data.reposts_count,
+        'raw_data': raw_data,
+        'created_at': now
+    }
+
+def _store_new_social_posts(posts: Dict[str, SocialMediaInput], now: datetime):
+    """Insert the posts not stored yet.
+
+    Returns {post_id: (id, text_hash)} of the posts still to analyze,
+    {text_hash: classification} of recent posts with the same text as any of them,
+    and {post_id: token_report_id} of the posts another request inserted in the
+    meantime (it analyzes them; token_report_id is None until it has saved the report).
+    Posts that already had a token report are left out of all three.
+    """
+    with get_session() as session:
+        existing = find_social_media_posts(session, posts.keys())
+        to_analyze = {
+            post_id: (db_id, text_hash) for post_id, (db_id, token_report_id, text_hash) in existing.items()
+            if token_report_id is None
+        }
+        new_posts = [post_id for post_id in posts if post_id not in existing]
+        inserted = insert_social_media_posts(session, [
+            _social_post_row(posts[post_id], post_id, now) for post_id in new_posts
+        ])
+        to_analyze.update(inserted)
+        # The insert waited for the requests that won the conflicts to commit, so their rows are visible now
+        conflicting = find_social_media_posts(session, [post_id for post_id in new_posts if post_id not in inserted])
+        concurrent = {post_id: token_report_id for post_id, (_, token_report_id, _) in conflicting.items()}
+        session.commit()
+
+        since = _text_reuse_since()
+        reusable = {}
+        if since is not None:
+            reports = find_reusable_token_reports(session, (text_hash for _, text_hash in to_analyze.values()), since)
+            reusable = {text_hash: token_report_data(report) for text_hash, report in reports.items()}
+    return to_analyze, reusable, concurrent
+
+async def _classify_social_post(text: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """Run the token finder on a post's text and add DEX data for the token it names."""
+    async with semaphore:
+        token_report = await crypto_text_classifier.ainvoke({'messages': [text]})
+        if not token_report:
+            raise ValueError("Failed to analyze text with token finder agent")
+        if token_report.get('token_address'):
+            dex_data = await fetch_dex_screener_data(token_report['token_address'])
+            if dex_data:
+                token_report.update(dex_data)
+        return token_report
+
+def _load_token_reports(report_ids) -> Dict[int, Dict[str, Any]]:
+    """Classifications of stored token reports by id, for posts that reuse them."""
+    with get_session() as session:
+        reports = session.execute(select(TokenReportDB).where(TokenReportDB.id.in_(report_ids))).scalars()
+        return {report.id: token_report_data(report) for report in reports}
+
+def _save_token_reports(token_reports: Dict[str, Tuple[Dict[str, Any], int, Optional[str]]]) -> Dict[str, Any]:
+    """Create the token reports (and tokens) for stored posts in one transaction.
+
+    Takes {post_id: (classification, post database id, text)} and returns
+    {post_id: saved report} with the exception instead for a post whose report
+    failed; each post is saved in its own savepoint so a failure only rolls back
+    that post. Passing a post's text adds it to the near-duplicate index once committed.
+    """
+    saved: Dict[str, Any] = {}
+    with get_session() as session:
+        session.begin()
+        for post_id, (token_report, post_db_id, text) in token_reports.items():
+            try:
+                with savepoint(session):
+                    db_token_report = create_token_report(
+                        report_data=token_report,
+                        post_id=post_db_id,
+                        existing_session=session
+                    )
+                    if not db_token_report:
+                        raise ValueError("Failed to create token report")
+                    if text is not None:
+                        remember_post_on_commit(session, text, db_token_report.id)
+                    saved[post_id] = {**token_report, "id": db_token_report.id}
+            except Exception as e:
+                saved[post_id] = e
+        session.commit()
+    return saved
+
+@router.post(
+    "/analyze_social_posts",
+    dependencies=[Depends(api_key_auth)],
+    response_model=SocialPostBatchResult
+)
+async def analyze_social_posts(batch: SocialMediaBatchInput):
+    """Analyze a batch of social media posts for token mentions and create a token report for each.
+
+    Known post_ids are found with one IN query and new posts stored with one
+    multi-row insert. Posts whose text matches or nearly matches a recent post's
+    reuse its report, and posts in the batch with the same or nearly the same
+    text share one token finder run; the token finder runs on up to
+    ANALYZE_CONCURRENCY posts at a time. The reports are saved in one transaction.
+    """
+    if len(batch.posts) > ANALYZE_BATCH_MAX_POSTS:
+        raise HTTPException(status_code=400, detail=f"At most {ANALYZE_BATCH_MAX_POSTS} posts per request")
+
+    now = datetime.utcnow()
+    results: List[Optional[SocialPostAnalysis]] = [None] * len(batch.posts)
+    posts: Dict[str, SocialMediaInput] = {}
+    positions: Dict[str, int] = {}
+    for i, input_data in enumerate(batch.posts):
+        post_id = input_data.post_id or f"generated_{int(now.timestamp())}_{i}"
+        if post_id in posts:
+            results[i] = SocialPostAnalysis(post_id=post_id, status="duplicate")
+            continue
+        posts[post_id] = input_data
+        positions[post_id] = i
+
+    try:
+        to_analyze, reusable, concurrent = await run_in_threadpool(_store_new_social_posts, posts, now)
+    except Exception as e:
+        print(f"Error storing social posts: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # Posts to classify, grouped by text so each distinct text goes through the token finder once
+    token_reports: Dict[str, Any] = {}
+    same_text: Dict[str, List[str]] = {}
+    near_duplicates: Dict[str, int] = {}
+    without_candidates = set()
+    for post_id, (_, text_hash) in to_analyze.items():
+        if _skip_token_finder(posts[post_id].text):
+            without_candidates.add(post_id)
+            token_reports[post_id] = no_candidates_report()
+        elif text_hash in reusable:
+            TOKEN_CANDIDATE_POSTS.labels("reused").inc()
+            token_reports[post_id] = dict(reusable[text_hash])
+        elif (report_id := find_near_duplicate_report(posts[post_id].text)) is not None:
+            near_duplicates[post_id] = report_id
+        else:
+            same_text.setdefault(text_hash or post_id, []).append(post_id)
+
+    if near_duplicates:
+        try:
+            near_reports = await run_in_threadpool(_load_token_reports, set(near_duplicates.values()))
+        except Exception as e:
+            print(f"Error loading near-duplicate token reports: {str(e)}")
+            near_reports = {}
+        for post_id, report_id in near_duplicates.items():
+            if report_id in near_reports:
+                TOKEN_CANDIDATE_POSTS.labels("near_duplicate").inc()
+                token_reports[post_id] = dict(near_reports[report_id])
+            else:
+                same_text.setdefault(to_analyze[post_id][1] or post_id, []).append(post_id)
+
+    # Nearly identical texts within the batch join the group of the first of them
+    if near_duplicate_index.enabled and len(same_text) > 1:
+        batch_index = NearDuplicateIndex(threshold=near_duplicate_index.threshold)
+        groups: Dict[str, List[str]] = {}
+        for key, post_ids in same_text.items():
+            fingerprint = post_fingerprint(posts[post_ids[0]].text)
+            match = batch_index.find(fingerprint) if fingerprint else None
+            if match:
+                groups[match[0]].extend(post_ids)
+                continue
+            groups[key] = post_ids
+            if fingerprint:
+                batch_index.add(fingerprint, key)
+        same_text = groups
+
+    semaphore = asyncio.Semaphore(ANALYZE_CONCURRENCY)
+    classified = await asyncio.gather(
+        *(_classify_social_post(posts[post_ids[0]].text, semaphore) for post_ids in same_text.values()),
+        return_exceptions=True
+    )
+    for post_ids, token_report in zip(same_text.values(), classified):
+        TOKEN_CANDIDATE_POSTS.labels("classified").inc()
+        TOKEN_CANDIDATE_POSTS.labels("reused").inc(len(post_ids) - 1)
+        for post_id in post_ids:
+            token_reports[post_id] = token_report if isinstance(token_report, BaseException) else dict(token_report)
+
+    # Failed classifications and the reports saved, or the error saving them, by post_id
+    saved: Dict[str, Any] = {}
+    to_save = {}
+    for post_id, (db_id, _) in to_analyze.items():
+        token_report = token_reports[post_id]
+        if isinstance(token_report, BaseException):
+            saved[post_id] = token_report
+        else:
+            to_save[post_id] = (token_report, db_id, None if post_id in without_candidates else posts[post_id].text)
+    if to_save:
+        try:
+            saved.update(await run_in_threadpool(_save_token_reports, to_save))
+        except Exception as e:
+            saved.update((post_id, e) for post_id in to_save)
+
+    for post_id, outcome in saved.items():
+        if isinstance(outcome, BaseException):
+            print(f"Error analyzing social post {post_id}: {str(outcome)}")
+            results[positions[post_id]] = SocialPostAnalysis(post_id=post_id, status="failed", error=str(outcome))
+        else:
+            results[positions[post_id]] = SocialPostAnalysis(post_id=post_id, status="analyzed", token_report=outcome)
+
+    for post_id, token_report_id in concurrent.items():
+        results[positions[post_id]] = SocialPostAnalysis(
+            post_id=post_id, status="in_progress" if token_report_id is None else "skipped"
+        )
+
+    for post_id, i in positions.items():
+        if results[i] is None:
+            results[i] = SocialPostAnalysis(post_id=post_id, status="skipped")
+
+    return SocialPostBatchResult(results=results)
+
 @router.post(
     "/analyze_and_scout",
     dependencies=[Depends(api_key_auth)],
-    response_model=TokenAlpha | None
+    response_model=JobAccepted,
+    status_code=status.HTTP_202_ACCEPTED
 )
-async def analyze_and_scout(input_data: SocialMediaInput):
+@query_budget(1)
+async def analyze_and_scout(input_data: SocialMediaInput, response: Response):
+    """Queue analysis of a social media post followed by the alpha scout; the result
+    (TokenAlpha, or null when no scouting was warranted) is served by /api/jobs/{id}."""
+    try:
+        job = await submit_job("analyze_and_scout", input_data.dict())
+    except Exception as e:
+        print(f"Error queueing analyze_and_scout: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return _job_accepted(job, response)
+
+@job_handler("analyze_and_scout")
+async def run_analyze_and_scout(payload: dict):
     """Analyze social media post and scout for token opportunities in one step."""
+    input_data = SocialMediaInput(**payload)
+    session = None
     try:
         session = get_session()
         try:
@@ -403,8 +746,8 @@ async def analyze_and_scout(input_data: SocialMediaInput):
                     reasoning=token_report['reasoning']
                 )
                 
-                # Call the multi_agent_alpha_scout endpoint with token_report_id
-                token_alpha = await get_multi_agent_alpha_scout({
+                # Run the alpha scout in this job, with token_report_id
+                token_alpha = await run_multi_agent_alpha_scout({
                     'token_report': token_report_model.dict(),
                     'token_report_id': token_report['id']
                 })
@@ -419,8 +762,33 @@ async def analyze_and_scout(input_data: SocialMediaInput):
             raise e
             
     except Exception as e:
-        print(f"Error in analyze_and_scout: {str(e)}")
+        print(f"Error in run_analyze_and_scout: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if session:
             session.__exit__(None, None, None)
+
+@router.get(
+    "/jobs/{job_id}",
+    dependencies=[Depends(api_key_auth)],
+    response_model=JobStatus
+)
+@query_budget(1)
+async def get_job_status(job_id: int):
+    """Status of a queued job, with its result once it has succeeded or its error once it has failed"""
+    # Read from the primary: a job's status changes too often for a lagging replica
+    async with get_async_session() as session:
+        job = await get_job(session, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return JobStatus(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        attempts=job.attempts,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
@@ -66,3 +66,47 @@ class SocialMediaInput(BaseModel):
     reactions_count: int = Field(default=0, description="Number of reactions to the post")
     replies_count: int = Field(default=0, description="Number of replies to the post")
     reposts_count: int = Field(default=0, description="Number of reposts of the post")
+
+class SocialMediaBatchInput(BaseModel):
+    """Input model for batch social media text analysis"""
+    posts: List[SocialMediaInput] = Field(..., description="Posts to analyze, each as for /analyze_social_post")
+
+class SocialPostAnalysis(BaseModel):
+    """Outcome of analyzing one post of a batch"""
+    post_id: str
+    status: str = Field(..., description="analyzed, skipped (already has a token report), in_progress (being analyzed by a concurrent request), duplicate (repeated in the batch) or failed")
+    token_report: Optional[Dict[str, Any]] = Field(default=None, description="The token report created for the post, as from /analyze_social_post")
+    error: Optional[str] = None
+
+class SocialPostBatchResult(BaseModel):
+    results: List[SocialPostAnalysis] = Field(..., description="One result per input post, in input order")
+
+class TokenLookupItem(BaseModel):
+    chain: str
+    address: str
+
+class TokenLookupRequest(BaseModel):
+    """Input model for batch token lookup"""
+    tokens: List[TokenLookupItem] = Field(..., description="(chain, address) pairs to resolve")
+    fields: Optional[str] = Field(default=None, description="Comma-separated token columns to return, as in /tokens")
+    include: Optional[str] = Field(default=None, description="Comma-separated related data to load, as in /tokens")
+    reports_limit: Optional[int] = Field(default=None, ge=0, description="Keep only each token's newest N reports")
+    opportunities_limit: Optional[int] = Field(default=None, ge=0, description="Keep only each token's newest N opportunities")
+
+class JobAccepted(BaseModel):
+    """Response to a request queued as a background job"""
+    job_id: int
+    status: str
+    status_url: str = Field(..., description="Poll this URL for the job's status and result")
+
+class JobStatus(BaseModel):
+    """Status of a background job"""
+    id: int
+    kind: str
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    attempts: int
+    result: Optional[Any] = Field(default=None, description="Return value of the job once it has succeeded")
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
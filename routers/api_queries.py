@@ -1,30 +1,379 @@
+import asyncio
 from datetime import datetime, timedelta
-from typing import Optional
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import joinedload, selectinload
-from sqlalchemy import desc, func, and_, or_, not_, select, literal
+from typing import Dict, Optional
+from fastapi import APIRouter, HTTPException, Header, Query, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+from sqlalchemy.orm import joinedload, selectinload, load_only, aliased
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import desc, func, or_, select, literal, tuple_, true, union_all
 
 from database import (
     TokenDB, AlphaReportDB, TokenOpportunityDB, TokenReportDB, 
-    SocialMediaPostDB, get_session
+    SocialMediaPostDB, TokenStatsDB, TokenHourlyStatsDB, TokenHourlyAuthorDB, get_async_session, get_async_read_session,
+    canonical_token_address
 )
-from datetime import datetime
-from .api_models import AlphaReport, TokenOpportunity, TokenData
+from db.operations.token import find_token_row_by_address, find_token_rows_by_chain_addresses
+from db.search import SEARCH_CONFIG, SEARCH_SOURCES, search_query, search_vector
+from db.feed import FeedEvent, FeedSubscriber, feed
+from db.near_duplicates import near_duplicate_index
+from db.cache import (
+    response_cache, token_identity_cache, token_tag, tokens_sort_tag, alpha_reports_date_tag,
+    ALPHA_REPORTS_ALL_TAG, TOKENS_MARKET_CAP_FILTER_TAG
+)
+from .api_models import TokenLookupRequest
+from query_budget import query_budget
+
+router = APIRouter(tags=["queries"], default_response_class=ORJSONResponse)
+
+# token_stats column backing each /tokens sort_by option
+TOKEN_SORT_COLUMNS = {
+    'market_cap': TokenStatsDB.max_market_cap,
+    'recent_opportunity': TokenStatsDB.last_opportunity_at,
+    'kol_events': TokenStatsDB.kol_events,
+    'recent_social': TokenStatsDB.last_social_at
+}
+
+def _json_bytes_response(body: bytes, headers: Optional[dict] = None) -> Response:
+    """Wrap already-serialized JSON (e.g. a cached body) without decoding it again."""
+    return Response(content=body, media_type="application/json; charset=utf-8", headers=headers)
+
+def _compact(data: dict) -> dict:
+    """Drop None values, as /alpha_reports has always omitted them."""
+    return {key: value for key, value in data.items() if value is not None}
+
+def _alpha_opportunity_dict(opp: TokenOpportunityDB) -> dict:
+    token = opp.token
+    post = opp.token_report.social_media_post if opp.token_report else None
+    token_report = None
+    if opp.token_report:
+        token_report = {
+            "social_media_post": _compact({
+                "source": post.source,
+                "author_display_name": post.author_display_name,
+                "text": post.text,
+                "timestamp": post.timestamp
+            })
+        } if post else {}
+
+    return _compact({
+        "name": opp.name,
+        "chain": str(opp.chain),
+        "contract_address": opp.contract_address,
+        "market_cap": float(opp.market_cap) if opp.market_cap else None,
+        "community_score": opp.community_score,
+        "safety_score": opp.safety_score,
+        "justification": opp.justification,
+        "sources": opp.sources,
+        "recommendation": opp.recommendation,
+        "created_at": opp.created_at,
+        "token": _compact({
+            "symbol": token.symbol,
+            "name": token.name,
+            "chain": str(token.chain),
+            "address": token.address,
+            "image_url": token.image_url,
+            "website_url": token.website_url,
+            "warpcast_url": token.warpcast_url,
+            "twitter_url": token.twitter_url,
+            "telegram_url": token.telegram_url,
+            "signal_url": token.signal_url
+        }) if token else None,
+        "token_report": token_report
+    })
+
+def _alpha_report_dict(report: AlphaReportDB) -> dict:
+    """Serialize an alpha report with its eager-loaded opportunities for orjson.
+
+    Datetimes are left to orjson, which writes them in isoformat.
+    """
+    return _compact({
+        "id": report.id,
+        "is_relevant": report.is_relevant,
+        "analysis": report.analysis,
+        "message": report.message,
+        "created_at": report.created_at,
+        "opportunities": [_alpha_opportunity_dict(opp) for opp in report.opportunities]
+    })
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag using weak comparison."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in candidates}
 
-router = APIRouter(tags=["queries"])
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+# Token columns selectable through /tokens?fields=, in response order
+TOKEN_FIELDS = (
+    'id', 'symbol', 'name', 'chain', 'address', 'created_at', 'image_url',
+    'website_url', 'warpcast_url', 'twitter_url', 'telegram_url', 'signal_url'
+)
+
+# Related data selectable through /tokens?include=
+TOKEN_INCLUDES = ('reports', 'posts', 'opportunities', 'stats')
+DEFAULT_TOKEN_INCLUDE = ('reports', 'posts', 'opportunities')
+
+def _parse_token_fields(fields: Optional[str]) -> tuple:
+    """Parse a fields= list into TOKEN_FIELDS order; id is always returned."""
+    if fields is None:
+        return TOKEN_FIELDS
+    requested = {f.strip() for f in fields.split(',') if f.strip()}
+    unknown = requested - set(TOKEN_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    requested.add('id')
+    return tuple(f for f in TOKEN_FIELDS if f in requested)
+
+def _parse_token_include(include: Optional[str]) -> tuple:
+    """Parse an include= list; posts implies reports. None means the default set."""
+    if include is None:
+        return DEFAULT_TOKEN_INCLUDE
+    requested = {i.strip() for i in include.split(',') if i.strip()}
+    unknown = requested - set(TOKEN_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}"
+        )
+    if 'posts' in requested:
+        requested.add('reports')
+    return tuple(i for i in TOKEN_INCLUDES if i in requested)
+
+def _social_media_post_dict(post: SocialMediaPostDB) -> dict:
+    return {
+        "id": post.id,
+        "source": post.source,
+        "post_id": post.post_id,
+        "author_id": post.author_id,
+        "author_username": post.author_username,
+        "author_display_name": post.author_display_name,
+        "text": post.text,
+        "original_timestamp": post.original_timestamp,
+        "timestamp": post.timestamp,
+        "reactions_count": post.reactions_count,
+        "replies_count": post.replies_count,
+        "reposts_count": post.reposts_count,
+        "created_at": post.created_at
+    }
+
+def _token_report_dict(report: TokenReportDB, include_post: bool = True) -> dict:
+    data = {
+        "id": report.id,
+        "mentions_purchasable_token": report.mentions_purchasable_token,
+        "token_symbol": report.token_symbol,
+        "token_chain": report.token_chain,
+        "token_address": report.token_address,
+        "is_listed_on_dex": report.is_listed_on_dex,
+        "trading_pairs": report.trading_pairs,
+        "confidence_score": report.confidence_score,
+        "reasoning": report.reasoning,
+        "created_at": report.created_at
+    }
+    if include_post:
+        data["social_media_post"] = _social_media_post_dict(report.social_media_post) \
+            if report.social_media_post else None
+    return data
+
+def _token_opportunity_dict(opp: TokenOpportunityDB) -> dict:
+    return {
+        "id": opp.id,
+        "name": opp.name,
+        "chain": str(opp.chain),
+        "contract_address": opp.contract_address,
+        "market_cap": float(opp.market_cap) if opp.market_cap else None,
+        "community_score": opp.community_score,
+        "safety_score": opp.safety_score,
+        "justification": opp.justification,
+        "sources": opp.sources,
+        "recommendation": opp.recommendation,
+        "created_at": opp.created_at
+    }
+
+def _token_stats_dict(stats: Optional[TokenStatsDB]) -> Optional[dict]:
+    if stats is None:
+        return None
+    return {
+        "max_market_cap": stats.max_market_cap,
+        "last_opportunity_at": stats.last_opportunity_at,
+        "kol_events": stats.kol_events,
+        "last_social_at": stats.last_social_at
+    }
+
+def _token_dict(
+    token: TokenDB,
+    fields: tuple,
+    include: tuple,
+    stats: Optional[TokenStatsDB] = None,
+    report_counts: Optional[Dict[int, int]] = None,
+    opportunity_counts: Optional[Dict[int, int]] = None
+) -> dict:
+    """Serialize a token with the given columns and related data, which must already be loaded.
+
+    Datetimes are left for orjson to write in isoformat.
+
+    When a collection was truncated by _load_recent_children, its full size is added
+    as token_reports_count / token_opportunities_count.
+    """
+    data = {}
+    for field in fields:
+        value = getattr(token, field)
+        if field == 'chain':
+            value = str(value)
+        data[field] = value
+
+    if 'reports' in include:
+        data["token_reports"] = [
+            _token_report_dict(report, include_post='posts' in include)
+            for report in token.token_reports
+        ]
+        if report_counts is not None:
+            data["token_reports_count"] = report_counts.get(token.id, 0)
+    if 'opportunities' in include:
+        data["token_opportunities"] = [_token_opportunity_dict(opp) for opp in token.token_opportunities]
+        if opportunity_counts is not None:
+            data["token_opportunities_count"] = opportunity_counts.get(token.id, 0)
+    if 'stats' in include:
+        data["stats"] = _token_stats_dict(stats)
+    return data
+
+async def _load_recent_children(
+    session,
+    tokens: list,
+    model,
+    collection: str,
+    limit: int,
+    nested: Optional[str] = None
+) -> Dict[int, int]:
+    """Fill each token's collection with only its `limit` newest rows.
+
+    Rows come from a single LATERAL (... ORDER BY created_at DESC, id DESC LIMIT n)
+    over the (token_id, created_at, id) index, so the work per token is bounded by
+    the limit however many rows it has. nested names a relationship of the child to
+    selectinload. Returns the full row count per token id.
+    """
+    token_ids = [token.id for token in tokens]
+    if not token_ids:
+        return {}
+
+    recent = select(model)\
+        .where(model.token_id == TokenDB.id)\
+        .order_by(desc(model.created_at), desc(model.id))\
+        .limit(limit)\
+        .lateral()
+    recent_model = aliased(model, recent)
+    query = select(recent_model)\
+        .select_from(TokenDB)\
+        .join(recent, true())\
+        .where(TokenDB.id.in_(token_ids))\
+        .order_by(TokenDB.id, desc(recent_model.created_at), desc(recent_model.id))
+    if nested:
+        query = query.options(selectinload(getattr(recent_model, nested)))
+
+    result = await session.execute(query)
+    children_by_token = {token_id: [] for token_id in token_ids}
+    for child in result.unique().scalars():
+        children_by_token[child.token_id].append(child)
+    for token in tokens:
+        set_committed_value(token, collection, children_by_token[token.id])
+
+    result = await session.execute(
+        select(model.token_id, func.count(model.id))
+        .where(model.token_id.in_(token_ids))
+        .group_by(model.token_id)
+    )
+    return dict(result.all())
+
+def _token_relationship_options(include: tuple, reports_limit: Optional[int], opportunities_limit: Optional[int]) -> list:
+    """selectinload options for the included relationships, one round trip each.
+
+    Collections with a limit are left out; _load_limited_token_children fills them.
+    """
+    options = []
+    if reports_limit is None:
+        if 'posts' in include:
+            options.append(selectinload(TokenDB.token_reports).selectinload(TokenReportDB.social_media_post))
+        elif 'reports' in include:
+            options.append(selectinload(TokenDB.token_reports))
+    if 'opportunities' in include and opportunities_limit is None:
+        options.append(selectinload(TokenDB.token_opportunities))
+    return options
+
+async def _load_limited_token_children(
+    session,
+    tokens: list,
+    include: tuple,
+    reports_limit: Optional[int],
+    opportunities_limit: Optional[int]
+) -> tuple:
+    """Load the included collections that have a limit. Returns (report_counts, opportunity_counts)."""
+    report_counts = opportunity_counts = None
+    if 'reports' in include and reports_limit is not None:
+        report_counts = await _load_recent_children(
+            session, tokens, TokenReportDB, 'token_reports', reports_limit,
+            'social_media_post' if 'posts' in include else None
+        )
+    if 'opportunities' in include and opportunities_limit is not None:
+        opportunity_counts = await _load_recent_children(
+            session, tokens, TokenOpportunityDB, 'token_opportunities', opportunities_limit
+        )
+    return report_counts, opportunity_counts
+
+async def _paginate_token_children(session, address: str, model, cursor: Optional[str], per_page: int, *options):
+    """Keyset-paginate a token's reports or opportunities, newest first.
+
+    Returns (rows, next_cursor, has_more).
+    """
+    row = await find_token_row_by_address(
+        session, address, lambda condition: select(TokenDB.id).where(condition).limit(1)
+    )
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Token not found"
+        )
+    token_id = row[0]
+
+    query = select(model).where(model.token_id == token_id)
+    if cursor:
+        cursor_created_at, cursor_id = _decode_token_cursor(None, cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(cursor_created_at, cursor_id))
+
+    result = await session.execute(
+        query
+        .order_by(desc(model.created_at), desc(model.id))
+        .limit(per_page + 1)
+        .options(*options)
+    )
+    rows = result.unique().scalars().all()
+
+    has_more = len(rows) > per_page
+    if has_more:
+        rows = rows[:-1]
+    next_cursor = _encode_token_cursor(rows[-1].created_at, rows[-1].id) if has_more and rows else None
+    return rows, next_cursor, has_more
 
 @router.get("/latest_warpcast/{username}")
 async def get_latest_warpcast(username: str):
     """Get the timestamp of the latest processed warpcast for a user"""
     try:
-        with get_session() as session:
+        # Read from the primary: the scout resumes from here right after writing posts
+        async with get_async_session() as session:
             # Query for the latest post by this user
-            post = session.query(SocialMediaPostDB).filter(
-                SocialMediaPostDB.author_username == username,
-                SocialMediaPostDB.source == "warpcast"
-            ).order_by(desc(SocialMediaPostDB.original_timestamp)).first()
+            result = await session.execute(
+                select(SocialMediaPostDB).where(
+                    SocialMediaPostDB.author_username == username,
+                    SocialMediaPostDB.source == "warpcast"
+                ).order_by(desc(SocialMediaPostDB.original_timestamp)).limit(1)
+            )
+            post = result.scalars().first()
             
             if post:
                 return {
@@ -46,16 +395,72 @@ async def get_latest_warpcast(username: str):
             detail=f"Failed to fetch latest warpcast: {str(e)}"
         )
 
+# Default and maximum page size for /alpha_reports
+ALPHA_REPORTS_PER_PAGE = 100
+ALPHA_REPORTS_MAX_PER_PAGE = 500
+
 @router.get("/alpha_reports")
-async def get_alpha_reports(date: Optional[str] = None):
-    """Get all alpha reports from the database."""
+@query_budget(4)
+async def get_alpha_reports(
+    date: Optional[str] = None,
+    cursor: Optional[str] = None,
+    per_page: int = Query(ALPHA_REPORTS_PER_PAGE, ge=1, le=ALPHA_REPORTS_MAX_PER_PAGE),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get alpha reports from the database, newest first, optionally for a single day.
+
+    Pages are keyset-paginated on (created_at, id); when more reports follow, the
+    cursor for the next page is returned in the X-Next-Cursor header.
+
+    Responses carry an ETag built from the count and max id of the reports in range
+    and the token_stats versions of their opportunities' tokens, and a matching
+    If-None-Match is answered with 304 before any report is loaded.
+    """
     try:
-        with get_session() as session:
-            # Use joinedload to eagerly load the opportunities and their related token_reports and social_media_posts
-            query = session.query(AlphaReportDB).options(
-                joinedload(AlphaReportDB.opportunities)
+        cache_key = ("alpha_reports", date, cursor, per_page)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            etag, body, next_cursor = cached
+            if _etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+            return _json_bytes_response(body, headers=_alpha_reports_headers(etag, next_cursor))
+        cache_version = response_cache.version
+
+        async with get_async_read_session() as session:
+            date_filter = []
+            if date:
+                # Convert date string to datetime
+                target_date = datetime.strptime(date, '%Y-%m-%d')
+                next_date = target_date + timedelta(days=1)
+                date_filter = [
+                    AlphaReportDB.created_at >= target_date,
+                    AlphaReportDB.created_at < next_date
+                ]
+
+            # Reports are written once with their opportunities, so count and max id
+            # change whenever the set of reports for the range does. The opportunities'
+            # tokens are embedded too, and their metadata can change on its own; token
+            # versions only grow, so their sum changes with any of them
+            token_versions = select(func.coalesce(func.sum(TokenStatsDB.version), 0)).where(
+                TokenStatsDB.token_id.in_(
+                    select(TokenOpportunityDB.token_id)
+                    .join(AlphaReportDB, AlphaReportDB.id == TokenOpportunityDB.report_id)
+                    .where(*date_filter)
+                )
+            ).correlate(None).scalar_subquery()
+            result = await session.execute(
+                select(func.count(AlphaReportDB.id), func.max(AlphaReportDB.id), token_versions).where(*date_filter)
+            )
+            report_count, max_report_id, token_version_sum = result.one()
+            etag = f'W/"alpha-reports-{date or "all"}-{report_count}-{max_report_id or 0}-{token_version_sum}"'
+            if _etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+
+            # Opportunities are selectin-loaded so the LIMIT applies to reports only
+            query = select(AlphaReportDB).options(
+                selectinload(AlphaReportDB.opportunities)
                 .joinedload(TokenOpportunityDB.token),
-                joinedload(AlphaReportDB.opportunities)
+                selectinload(AlphaReportDB.opportunities)
                 .joinedload(TokenOpportunityDB.token_report)
                 .joinedload(TokenReportDB.social_media_post)
                 .load_only(
@@ -64,82 +469,37 @@ async def get_alpha_reports(date: Optional[str] = None):
                     SocialMediaPostDB.text,
                     SocialMediaPostDB.timestamp
                 )
-            )
-            
-            if date:
-                # Convert date string to datetime
-                target_date = datetime.strptime(date, '%Y-%m-%d')
-                next_date = target_date + timedelta(days=1)
-                
-                # Filter reports for the specified date
-                query = query.filter(
-                    AlphaReportDB.created_at >= target_date,
-                    AlphaReportDB.created_at < next_date
-                )
-            
-            reports = query.all()
-            
-            # Convert SQLModel objects to Pydantic models
-            reports_data = [
-                AlphaReport(
-                    id=report.id,
-                    is_relevant=report.is_relevant,
-                    analysis=report.analysis,
-                    message=report.message,
-                    created_at=report.created_at,
-                    opportunities=[
-                        TokenOpportunity(
-                            name=opp.name,
-                            chain=str(opp.chain),
-                            contract_address=opp.contract_address,
-                            market_cap=float(opp.market_cap) if opp.market_cap else None,
-                            community_score=opp.community_score,
-                            safety_score=opp.safety_score,
-                            justification=opp.justification,
-                            sources=opp.sources,
-                            recommendation=opp.recommendation,
-                            created_at=opp.created_at,
-                            token=TokenData(
-                                symbol=opp.token.symbol,
-                                name=opp.token.name,
-                                chain=str(opp.token.chain),
-                                address=opp.token.address,
-                                image_url=opp.token.image_url,
-                                website_url=opp.token.website_url,
-                                warpcast_url=opp.token.warpcast_url,
-                                twitter_url=opp.token.twitter_url,
-                                telegram_url=opp.token.telegram_url,
-                                signal_url=opp.token.signal_url
-                            ) if opp.token else None,
-                            token_report={
-                                "social_media_post": {
-                                    "source": opp.token_report.social_media_post.source if opp.token_report and opp.token_report.social_media_post else None,
-                                    "author_display_name": opp.token_report.social_media_post.author_display_name if opp.token_report and opp.token_report.social_media_post else None,
-                                    "text": opp.token_report.social_media_post.text if opp.token_report and opp.token_report.social_media_post else None,
-                                    "timestamp": opp.token_report.social_media_post.timestamp if opp.token_report and opp.token_report.social_media_post else None
-                                } if opp.token_report and opp.token_report.social_media_post else None
-                            } if opp.token_report else None
-                        )
-                        for opp in report.opportunities
-                    ]
+            ).where(*date_filter)
+
+            if cursor:
+                cursor_created_at, cursor_id = _decode_token_cursor(None, cursor)
+                query = query.where(
+                    tuple_(AlphaReportDB.created_at, AlphaReportDB.id) < tuple_(cursor_created_at, cursor_id)
                 )
-                for report in reports
-            ]
-            
-            # Convert Pydantic models to JSON with proper formatting
-            json_data = jsonable_encoder(
-                [report.dict(by_alias=True) for report in reports_data],
-                exclude_none=True,
-                custom_encoder={
-                    datetime: lambda dt: dt.isoformat()
-                }
+
+            result = await session.execute(
+                query
+                .order_by(desc(AlphaReportDB.created_at), desc(AlphaReportDB.id))
+                .limit(per_page + 1)
             )
+            reports = result.unique().scalars().all()
+
+            next_cursor = None
+            if len(reports) > per_page:
+                reports = reports[:per_page]
+                next_cursor = _encode_token_cursor(reports[-1].created_at, reports[-1].id)
             
-            # Return a properly formatted JSON response
-            return JSONResponse(
-                content=json_data,
-                headers={"Content-Type": "application/json; charset=utf-8"}
+            # Serialize rows straight to JSON bytes, cached as-is for later hits
+            body = orjson.dumps([_alpha_report_dict(report) for report in reports])
+            cache_tags = {alpha_reports_date_tag(target_date) if date else ALPHA_REPORTS_ALL_TAG}
+            cache_tags.update(
+                token_tag(opp.token_id) for report in reports for opp in report.opportunities if opp.token_id
             )
+            response_cache.set(cache_key, (etag, body, next_cursor), tags=cache_tags, version=cache_version)
+            
+            return _json_bytes_response(body, headers=_alpha_reports_headers(etag, next_cursor))
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in get_alpha_reports: {str(e)}")
         raise HTTPException(
@@ -147,99 +507,113 @@ async def get_alpha_reports(date: Optional[str] = None):
             detail=f"Failed to fetch reports: {str(e)}"
         )
 
+def _alpha_reports_headers(etag: str, next_cursor: Optional[str]) -> dict:
+    headers = {"ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return headers
+
+@router.get("/alpha_reports/dates")
+@query_budget(1)
+async def get_alpha_report_dates():
+    """Get the days that have alpha reports, newest first, with the number of reports on each."""
+    try:
+        cached = response_cache.get(("alpha_report_dates",))
+        if cached is not None:
+            return _json_bytes_response(cached)
+        cache_version = response_cache.version
+
+        async with get_async_read_session() as session:
+            day = func.date(AlphaReportDB.created_at).label('day')
+            result = await session.execute(
+                select(day, func.count(AlphaReportDB.id))
+                .group_by(day)
+                .order_by(desc(day))
+            )
+            body = orjson.dumps([
+                {"date": report_day.isoformat(), "count": count}
+                for report_day, count in result.all()
+            ])
+
+        # Every new report carries the all-reports tag, whatever its day
+        response_cache.set(("alpha_report_dates",), body, tags=[ALPHA_REPORTS_ALL_TAG], version=cache_version)
+        return _json_bytes_response(body)
+    except Exception as e:
+        print(f"Error in get_alpha_report_dates: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch report dates: {str(e)}"
+        )
+
 @router.get("/token/{address}")
-async def get_token(address: str):
-    """Get detailed information about a specific token including all relationships."""
+# Seven with both limits set, plus the address probe after a stale identity cache hit
+@query_budget(8)
+async def get_token(
+    address: str,
+    reports_limit: Optional[int] = Query(None, ge=0),
+    opportunities_limit: Optional[int] = Query(None, ge=0),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get detailed information about a specific token including all relationships.
+
+    reports_limit / opportunities_limit return only the newest N of each collection
+    plus its total count; the rest is paged through /token/{address}/reports and
+    /token/{address}/opportunities.
+
+    The ETag is the token's token_stats version, bumped by every report, opportunity
+    or metadata update, so a matching If-None-Match gets a 304 from a single-row lookup.
+    """
     try:
-        with get_session() as session:
-            # For Base/ETH addresses use case-insensitive comparison, for Solana use exact match
-            token = session.query(TokenDB)\
-                .filter(
-                    # If address starts with 0x, use case-insensitive match (Base/ETH)
-                    # Otherwise use exact match (Solana)
-                    or_(
-                        and_(
-                            TokenDB.address.startswith('0x'),
-                            func.lower(TokenDB.address) == func.lower(address)
-                        ),
-                        and_(
-                            not_(TokenDB.address.startswith('0x')),
-                            TokenDB.address == address
-                        )
-                    )
-                )\
-                .options(
-                    joinedload(TokenDB.token_reports).joinedload(TokenReportDB.social_media_post),
-                    joinedload(TokenDB.token_opportunities)
-                )\
-                .first()
+        async with get_async_read_session() as session:
+            stamp = await find_token_row_by_address(
+                session,
+                address,
+                lambda condition: select(TokenDB.id, TokenStatsDB.version)
+                .outerjoin(TokenStatsDB, TokenStatsDB.token_id == TokenDB.id)
+                .where(condition)
+                .limit(1)
+            )
             
-            if not token:
+            if not stamp:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Token not found"
                 )
+
+            token_id, version = stamp
+            etag = f'W/"token-{token_id}-{version or 0}"'
+            if _etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+
+            options = []
+            if reports_limit is None:
+                options.append(joinedload(TokenDB.token_reports).joinedload(TokenReportDB.social_media_post))
+            if opportunities_limit is None:
+                options.append(joinedload(TokenDB.token_opportunities))
+            result = await session.execute(
+                select(TokenDB)
+                .where(TokenDB.id == token_id)
+                .options(*options)
+            )
+            token = result.unique().scalars().first()
+
+            report_counts = opportunity_counts = None
+            if reports_limit is not None:
+                report_counts = await _load_recent_children(
+                    session, [token], TokenReportDB, 'token_reports', reports_limit, 'social_media_post'
+                )
+            if opportunities_limit is not None:
+                opportunity_counts = await _load_recent_children(
+                    session, [token], TokenOpportunityDB, 'token_opportunities', opportunities_limit
+                )
             
-            return {
-                "id": token.id,
-                "symbol": token.symbol,
-                "name": token.name,
-                "chain": str(token.chain),
-                "address": token.address,
-                "created_at": token.created_at.isoformat(),
-                "image_url": token.image_url,
-                "website_url": token.website_url,
-                "warpcast_url": token.warpcast_url,
-                "twitter_url": token.twitter_url,
-                "telegram_url": token.telegram_url,
-                "signal_url": token.signal_url,
-                "token_reports": [
-                    {
-                        "id": report.id,
-                        "mentions_purchasable_token": report.mentions_purchasable_token,
-                        "token_symbol": report.token_symbol,
-                        "token_chain": report.token_chain,
-                        "token_address": report.token_address,
-                        "is_listed_on_dex": report.is_listed_on_dex,
-                        "trading_pairs": report.trading_pairs,
-                        "confidence_score": report.confidence_score,
-                        "reasoning": report.reasoning,
-                        "created_at": report.created_at.isoformat(),
-                        "social_media_post": {
-                            "id": report.social_media_post.id,
-                            "source": report.social_media_post.source,
-                            "post_id": report.social_media_post.post_id,
-                            "author_id": report.social_media_post.author_id,
-                            "author_username": report.social_media_post.author_username,
-                            "author_display_name": report.social_media_post.author_display_name,
-                            "text": report.social_media_post.text,
-                            "original_timestamp": report.social_media_post.original_timestamp.isoformat(),
-                            "timestamp": report.social_media_post.timestamp.isoformat(),
-                            "reactions_count": report.social_media_post.reactions_count,
-                            "replies_count": report.social_media_post.replies_count,
-                            "reposts_count": report.social_media_post.reposts_count,
-                            "created_at": report.social_media_post.created_at.isoformat()
-                        } if report.social_media_post else None
-                    }
-                    for report in token.token_reports
-                ],
-                "token_opportunities": [
-                    {
-                        "id": opp.id,
-                        "name": opp.name,
-                        "chain": str(opp.chain),
-                        "contract_address": opp.contract_address,
-                        "market_cap": float(opp.market_cap) if opp.market_cap else None,
-                        "community_score": opp.community_score,
-                        "safety_score": opp.safety_score,
-                        "justification": opp.justification,
-                        "sources": opp.sources,
-                        "recommendation": opp.recommendation,
-                        "created_at": opp.created_at.isoformat()
-                    }
-                    for opp in token.token_opportunities
-                ]
-            }
+            return ORJSONResponse(
+                _token_dict(
+                    token, TOKEN_FIELDS, DEFAULT_TOKEN_INCLUDE,
+                    report_counts=report_counts, opportunity_counts=opportunity_counts
+                ),
+                headers={"ETag": etag}
+            )
     except HTTPException:
         raise
     except Exception as e:
@@ -248,288 +622,188 @@ async def get_token(address: str):
             detail=f"Failed to fetch token: {str(e)}"
         )
 
+def _token_keyset_columns(sort_by: Optional[str]):
+    """Return the (sort column, id column) pair a /tokens sort mode is keyed on.
+
+    Each pair matches a composite index, so a cursor on it turns into a single
+    index range scan regardless of how deep the page is.
+    """
+    if sort_by in TOKEN_SORT_COLUMNS:
+        return TOKEN_SORT_COLUMNS[sort_by], TokenStatsDB.token_id
+    return TokenDB.created_at, TokenDB.id
+
+def _encode_token_cursor(value, token_id: int) -> str:
+    """Encode the last row of a /tokens page as a '<sort value>_<token id>' cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return f"{value}_{token_id}"
+
+def _decode_token_cursor(sort_by: Optional[str], cursor: str):
+    """Decode a cursor produced by _encode_token_cursor into a (sort value, token id) pair."""
+    try:
+        value, token_id = cursor.rsplit('_', 1)
+        if sort_by == 'market_cap':
+            return float(value), int(token_id)
+        if sort_by == 'kol_events':
+            return int(value), int(token_id)
+        return datetime.fromisoformat(value), int(token_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {cursor}"
+        )
+
+def build_tokens_query(
+    sort_by: Optional[str] = None,
+    chains: Optional[str] = None,
+    market_cap_max: Optional[float] = None,
+    cursor: Optional[str] = None
+):
+    """Build the keyset-paginated (TokenDB, TokenStatsDB) select behind /tokens.
+
+    Limit and relationship loading are left to the caller.
+    """
+    sort_column, id_column = _token_keyset_columns(sort_by)
+
+    if sort_by in TOKEN_SORT_COLUMNS:
+        # Drive the scan from token_stats so its (sort column, token_id) index gives the order
+        query = select(TokenDB, TokenStatsDB)\
+            .join(TokenStatsDB, TokenStatsDB.token_id == TokenDB.id)
+        if sort_by == 'kol_events':
+            # Only include tokens that have KOL events
+            query = query.where(TokenStatsDB.kol_events > 0)
+        else:
+            # Only include tokens that have data for the sort column
+            query = query.where(sort_column.isnot(None))
+    else:
+        query = select(TokenDB, TokenStatsDB)\
+            .outerjoin(TokenStatsDB, TokenStatsDB.token_id == TokenDB.id)
+
+    query = query.where(TokenDB.address.isnot(None))
+
+    # Apply chain filter
+    if chains:
+        selected_chains = [c.lower() for c in chains.split(',')]
+        query = query.where(func.lower(TokenDB.chain).in_(selected_chains))
+    else:
+        # Default to base and solana if no chains specified
+        query = query.where(func.lower(TokenDB.chain).in_(['base', 'solana']))
+
+    # Apply market cap filter if specified
+    if market_cap_max is not None:
+        query = query.where(
+            or_(
+                TokenStatsDB.max_market_cap.is_(None),
+                TokenStatsDB.max_market_cap <= market_cap_max
+            )
+        )
+
+    # Apply cursor-based pagination as a row comparison on the index key
+    if cursor:
+        cursor_value, cursor_id = _decode_token_cursor(sort_by, cursor)
+        query = query.where(tuple_(sort_column, id_column) < tuple_(cursor_value, cursor_id))
+
+    return query.order_by(desc(sort_column), desc(id_column))
+
 @router.get("/tokens")
+@query_budget(6)
 async def get_tokens(
     cursor: Optional[str] = None,
     per_page: int = 10,
     chains: Optional[str] = None,
     market_cap_max: Optional[float] = None,
-    sort_by: Optional[str] = None
+    sort_by: Optional[str] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    reports_limit: Optional[int] = Query(None, ge=0),
+    opportunities_limit: Optional[int] = Query(None, ge=0)
 ):
-    """Get filtered and sorted tokens from the database."""
+    """Get filtered and sorted tokens from the database.
+
+    fields= limits the token columns selected and returned (id is always included).
+    include= picks the related data loaded, from reports, posts, opportunities and
+    stats; it defaults to reports,posts,opportunities and an empty value loads none.
+    reports_limit / opportunities_limit cap each token's included collections to
+    the newest N rows and add their total counts.
+    """
     try:
-        with get_session() as session:
-            # Base query with joins
-            query = session.query(TokenDB)\
-                .filter(TokenDB.address.isnot(None))
-
-            # Apply chain filter
-            if chains:
-                selected_chains = [c.lower() for c in chains.split(',')]
-                query = query.filter(func.lower(TokenDB.chain).in_(selected_chains))
-            else:
-                # Default to base and solana if no chains specified
-                query = query.filter(func.lower(TokenDB.chain).in_(['base', 'solana']))
-
-            # Create opportunities subquery if needed for market cap filtering or sorting
-            if market_cap_max is not None or sort_by in ['recent_opportunity', 'market_cap']:
-                opp_subquery = (
-                    session.query(
-                        TokenOpportunityDB.token_id,
-                        func.max(TokenOpportunityDB.created_at).label('max_created_at'),
-                        func.max(TokenOpportunityDB.market_cap).label('max_market_cap')
-                    )
-                    .group_by(TokenOpportunityDB.token_id)
-                    .subquery()
-                )
-                query = query.outerjoin(opp_subquery, TokenDB.id == opp_subquery.c.token_id)
-
-                # Apply market cap filter if specified
-                if market_cap_max is not None:
-                    query = query.filter(
-                        or_(
-                            opp_subquery.c.max_market_cap.is_(None),
-                            opp_subquery.c.max_market_cap <= market_cap_max
-                        )
-                    )
-
-            # Create additional subqueries for sorting if needed
-            if sort_by == 'kol_events':
-                # Subquery for KOL events
-                kol_subquery = (
-                    session.query(
-                        TokenReportDB.token_id,
-                        (func.count(TokenReportDB.id) +
-                         func.coalesce(func.sum(SocialMediaPostDB.reactions_count), 0) +
-                         func.coalesce(func.sum(SocialMediaPostDB.replies_count), 0) +
-                         func.coalesce(func.sum(SocialMediaPostDB.reposts_count), 0)
-                        ).label('total_events')
-                    )
-                    .outerjoin(TokenReportDB.social_media_post)
-                    .group_by(TokenReportDB.token_id)
-                    .subquery()
-                )
-                query = query.outerjoin(kol_subquery, TokenDB.id == kol_subquery.c.token_id)
-
-            elif sort_by == 'recent_social':
-                # Subquery for recent social posts
-                social_subquery = (
-                    session.query(
-                        TokenReportDB.token_id,
-                        func.max(SocialMediaPostDB.timestamp).label('max_timestamp')
-                    )
-                    .join(TokenReportDB.social_media_post)
-                    .group_by(TokenReportDB.token_id)
-                    .subquery()
-                )
-                query = query.outerjoin(social_subquery, TokenDB.id == social_subquery.c.token_id)
+        # Normalize parameters so equivalent requests share a cache entry
+        if sort_by not in TOKEN_SORT_COLUMNS:
+            sort_by = None
+        if chains:
+            chains = ','.join(sorted({c.strip().lower() for c in chains.split(',') if c.strip()}))
+        fields = _parse_token_fields(fields)
+        include = _parse_token_include(include)
+        cache_key = (
+            "tokens", cursor, per_page, chains or 'base,solana', market_cap_max, sort_by,
+            fields, include, reports_limit, opportunities_limit
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return _json_bytes_response(cached)
+        cache_version = response_cache.version
 
-            # Apply cursor-based pagination
-            if cursor:
-                cursor_data = cursor.split('_')
-                if sort_by == 'market_cap':
-                    market_cap_value = float(cursor_data[0]) if cursor_data[0] != 'null' else None
-                    token_id = int(cursor_data[1])
-                    if market_cap_value is None:
-                        query = query.filter(
-                            or_(
-                                opp_subquery.c.max_market_cap.isnot(None),
-                                and_(
-                                    opp_subquery.c.max_market_cap.is_(None),
-                                    TokenDB.id > token_id
-                                )
-                            )
-                        )
-                    else:
-                        query = query.filter(
-                            or_(
-                                opp_subquery.c.max_market_cap < market_cap_value,
-                                and_(
-                                    opp_subquery.c.max_market_cap == market_cap_value,
-                                    TokenDB.id > token_id
-                                )
-                            )
-                        )
-
-                elif sort_by == 'recent_opportunity':
-                    timestamp = datetime.fromisoformat(cursor_data[0])
-                    token_id = int(cursor_data[1])
-                    query = query.filter(
-                        or_(
-                            opp_subquery.c.max_created_at < timestamp,
-                            and_(
-                                opp_subquery.c.max_created_at == timestamp,
-                                TokenDB.id > token_id
-                            )
-                        )
-                    )
-
-                elif sort_by == 'kol_events':
-                    events = int(cursor_data[0])
-                    token_id = int(cursor_data[1])
-                    query = query.filter(
-                        or_(
-                            kol_subquery.c.total_events < events,
-                            and_(
-                                kol_subquery.c.total_events == events,
-                                TokenDB.id > token_id
-                            )
-                        )
-                    )
-
-                elif sort_by == 'recent_social':
-                    timestamp = datetime.fromisoformat(cursor_data[0])
-                    token_id = int(cursor_data[1])
-                    query = query.filter(
-                        or_(
-                            social_subquery.c.max_timestamp < timestamp,
-                            and_(
-                                social_subquery.c.max_timestamp == timestamp,
-                                TokenDB.id > token_id
-                            )
-                        )
-                    )
+        async with get_async_read_session() as session:
+            query = build_tokens_query(sort_by, chains, market_cap_max, cursor)
 
-                else:
-                    timestamp = datetime.fromisoformat(cursor_data[0])
-                    token_id = int(cursor_data[1])
-                    query = query.filter(
-                        or_(
-                            TokenDB.created_at < timestamp,
-                            and_(
-                                TokenDB.created_at == timestamp,
-                                TokenDB.id > token_id
-                            )
-                        )
-                    )
-
-            # Apply sorting and related filters
-            if sort_by == 'recent_opportunity':
-                # Only include tokens that have opportunities
-                query = query.filter(opp_subquery.c.max_created_at.isnot(None))
-                query = query.order_by(desc(opp_subquery.c.max_created_at))
-            elif sort_by == 'market_cap':
-                # Only include tokens that have market cap data
-                query = query.filter(opp_subquery.c.max_market_cap.isnot(None))
-                query = query.order_by(desc(opp_subquery.c.max_market_cap))
-            elif sort_by == 'kol_events':
-                # Only include tokens that have KOL events
-                query = query.filter(kol_subquery.c.total_events > 0)
-                query = query.order_by(desc(kol_subquery.c.total_events))
-            elif sort_by == 'recent_social':
-                # Only include tokens that have social media posts
-                query = query.filter(social_subquery.c.max_timestamp.isnot(None))
-                query = query.order_by(desc(social_subquery.c.max_timestamp))
+            # Select only the requested columns, plus those the cursor is built from
+            sort_column, _ = _token_keyset_columns(sort_by)
+            token_columns = {getattr(TokenDB, f) for f in fields}
+            stats_columns = {TokenStatsDB.token_id}
+            if sort_by in TOKEN_SORT_COLUMNS:
+                stats_columns.add(sort_column)
             else:
-                query = query.order_by(desc(TokenDB.created_at))
+                token_columns.add(TokenDB.created_at)
+            if 'stats' in include:
+                stats_columns.update(TOKEN_SORT_COLUMNS.values())
+            options = [load_only(*token_columns), load_only(*stats_columns)]
+
+            options.extend(_token_relationship_options(include, reports_limit, opportunities_limit))
 
-            # Fetch tokens with relationships
-            tokens = query\
-                .limit(per_page + 1)\
-                .options(
-                    selectinload(TokenDB.token_reports).selectinload(TokenReportDB.social_media_post),
-                    selectinload(TokenDB.token_opportunities)
-                )\
-                .all()
+            result = await session.execute(query.limit(per_page + 1).options(*options))
+            rows = result.all()
 
             # Check if there are more tokens
-            has_more = len(tokens) > per_page
+            has_more = len(rows) > per_page
             if has_more:
-                tokens = tokens[:-1]  # Remove the extra token we fetched
+                rows = rows[:-1]  # Remove the extra token we fetched
+            tokens = [token for token, _ in rows]
 
-            # Generate next cursor
+            report_counts, opportunity_counts = await _load_limited_token_children(
+                session, tokens, include, reports_limit, opportunities_limit
+            )
+
+            # Generate next cursor from the index key of the last row
             next_cursor = None
-            if has_more and tokens:
-                last_token = tokens[-1]
-                if sort_by == 'market_cap':
-                    last_market_cap = max((opp.market_cap for opp in last_token.token_opportunities if opp.market_cap is not None), default=None)
-                    next_cursor = f"{str(last_market_cap) if last_market_cap is not None else 'null'}_{last_token.id}"
-                elif sort_by == 'recent_opportunity':
-                    last_opp_date = max((opp.created_at for opp in last_token.token_opportunities), default=last_token.created_at)
-                    next_cursor = f"{last_opp_date.isoformat()}_{last_token.id}"
-                elif sort_by == 'kol_events':
-                    last_events = sum(1 + (report.social_media_post.reactions_count or 0) + 
-                                   (report.social_media_post.replies_count or 0) + 
-                                   (report.social_media_post.reposts_count or 0)
-                                   for report in last_token.token_reports if report.social_media_post)
-                    next_cursor = f"{last_events}_{last_token.id}"
-                elif sort_by == 'recent_social':
-                    last_social = max((report.social_media_post.timestamp for report in last_token.token_reports 
-                                    if report.social_media_post), default=last_token.created_at)
-                    next_cursor = f"{last_social.isoformat()}_{last_token.id}"
+            if has_more and rows:
+                last_token, last_stats = rows[-1]
+                if sort_by in TOKEN_SORT_COLUMNS:
+                    last_value = getattr(last_stats, sort_column.key)
                 else:
-                    next_cursor = f"{last_token.created_at.isoformat()}_{last_token.id}"
+                    last_value = last_token.created_at
+                next_cursor = _encode_token_cursor(last_value, last_token.id)
 
             # Convert tokens to response format
             token_list = [
-                {
-                    "id": token.id,
-                    "symbol": token.symbol,
-                    "name": token.name,
-                    "chain": str(token.chain),
-                    "address": token.address,
-                    "created_at": token.created_at.isoformat(),
-                    "image_url": token.image_url,
-                    "website_url": token.website_url,
-                    "warpcast_url": token.warpcast_url,
-                    "twitter_url": token.twitter_url,
-                    "telegram_url": token.telegram_url,
-                    "signal_url": token.signal_url,
-                    "token_reports": [
-                        {
-                            "id": report.id,
-                            "mentions_purchasable_token": report.mentions_purchasable_token,
-                            "token_symbol": report.token_symbol,
-                            "token_chain": report.token_chain,
-                            "token_address": report.token_address,
-                            "is_listed_on_dex": report.is_listed_on_dex,
-                            "trading_pairs": report.trading_pairs,
-                            "confidence_score": report.confidence_score,
-                            "reasoning": report.reasoning,
-                            "created_at": report.created_at.isoformat(),
-                            "social_media_post": {
-                                "id": report.social_media_post.id,
-                                "source": report.social_media_post.source,
-                                "post_id": report.social_media_post.post_id,
-                                "author_id": report.social_media_post.author_id,
-                                "author_username": report.social_media_post.author_username,
-                                "author_display_name": report.social_media_post.author_display_name,
-                                "text": report.social_media_post.text,
-                                "original_timestamp": report.social_media_post.original_timestamp.isoformat(),
-                                "timestamp": report.social_media_post.timestamp.isoformat(),
-                                "reactions_count": report.social_media_post.reactions_count,
-                                "replies_count": report.social_media_post.replies_count,
-                                "reposts_count": report.social_media_post.reposts_count,
-                                "created_at": report.social_media_post.created_at.isoformat()
-                            } if report.social_media_post else None
-                        }
-                        for report in token.token_reports
-                    ],
-                    "token_opportunities": [
-                        {
-                            "id": opp.id,
-                            "name": opp.name,
-                            "chain": str(opp.chain),
-                            "contract_address": opp.contract_address,
-                            "market_cap": float(opp.market_cap) if opp.market_cap else None,
-                            "community_score": opp.community_score,
-                            "safety_score": opp.safety_score,
-                            "justification": opp.justification,
-                            "sources": opp.sources,
-                            "recommendation": opp.recommendation,
-                            "created_at": opp.created_at.isoformat()
-                        }
-                        for opp in token.token_opportunities
-                    ]
-                }
-                for token in tokens
+                _token_dict(token, fields, include, stats, report_counts, opportunity_counts)
+                for token, stats in rows
             ]
             
-            return {
+            body = orjson.dumps({
                 "tokens": token_list,
                 "next_cursor": next_cursor,
                 "has_more": has_more
-            }
+            })
+
+            cache_tags = {tokens_sort_tag(sort_by)}
+            cache_tags.update(token_tag(token.id) for token in tokens)
+            if market_cap_max is not None:
+                cache_tags.add(TOKENS_MARKET_CAP_FILTER_TAG)
+            response_cache.set(cache_key, body, tags=cache_tags, version=cache_version)
+
+            return _json_bytes_response(body)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in get_tokens: {str(e)}")  # Add detailed logging
         print(f"Request parameters - cursor: {cursor}, sort_by: {sort_by}, chains: {chains}, market_cap_max: {market_cap_max}")
@@ -543,3 +817,550 @@ async def get_tokens(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch tokens: {str(e)}"
         )
+
+TOKEN_LOOKUP_MAX_PAIRS = 500
+
+@router.post("/tokens/lookup")
+@query_budget(7)
+async def lookup_tokens(request: TokenLookupRequest):
+    """Resolve up to TOKEN_LOOKUP_MAX_PAIRS (chain, address) pairs in one request.
+
+    All pairs are matched by a single query on the (chain, canonical_address) index,
+    and each included relationship is loaded with one selectinload round trip for
+    every matched token. fields, include, reports_limit and opportunities_limit work
+    as on /tokens.
+
+    Returns {"tokens": {address: token or null}}, keyed by the addresses as sent.
+    """
+    try:
+        if len(request.tokens) > TOKEN_LOOKUP_MAX_PAIRS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {TOKEN_LOOKUP_MAX_PAIRS} tokens can be looked up at once"
+            )
+        fields = _parse_token_fields(request.fields)
+        include = _parse_token_include(request.include)
+
+        pairs = {}
+        for item in request.tokens:
+            chain, address = item.chain.strip().lower(), item.address.strip()
+            if not chain or not address:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Each token needs a chain and an address"
+                )
+            if pairs.setdefault(address, chain) != chain:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Address {address} requested on more than one chain"
+                )
+
+        # Chain and canonical_address are needed to match rows back to the requested pairs
+        token_columns = {getattr(TokenDB, f) for f in fields}
+        token_columns.update((TokenDB.chain, TokenDB.address, TokenDB.canonical_address))
+        options = [load_only(*token_columns)]
+        options.extend(_token_relationship_options(include, request.reports_limit, request.opportunities_limit))
+
+        def build_query(condition):
+            if 'stats' in include:
+                query = select(TokenDB, TokenStatsDB)\
+                    .outerjoin(TokenStatsDB, TokenStatsDB.token_id == TokenDB.id)\
+                    .options(load_only(TokenStatsDB.token_id, *TOKEN_SORT_COLUMNS.values()))
+            else:
+                query = select(TokenDB)
+            return query.where(condition).options(*options)
+
+        async with get_async_read_session() as session:
+            rows = await find_token_rows_by_chain_addresses(
+                session, [(chain, address) for address, chain in pairs.items()], build_query
+            )
+            report_counts, opportunity_counts = await _load_limited_token_children(
+                session, [row[0] for row in rows.values()], include,
+                request.reports_limit, request.opportunities_limit
+            )
+
+            tokens = {}
+            for address, chain in pairs.items():
+                row = rows.get((chain, canonical_token_address(address, chain)))
+                tokens[address] = _token_dict(
+                    row[0], fields, include, row[1] if 'stats' in include else None,
+                    report_counts, opportunity_counts
+                ) if row else None
+
+            return _json_bytes_response(orjson.dumps({"tokens": tokens}))
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in lookup_tokens: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to look up tokens: {str(e)}"
+        )
+
+@router.get("/token/{address}/reports")
+@query_budget(3)
+async def get_token_reports(address: str, cursor: Optional[str] = None, per_page: int = 20):
+    """Page through a token's reports (with their social media posts), newest first."""
+    try:
+        async with get_async_read_session() as session:
+            reports, next_cursor, has_more = await _paginate_token_children(
+                session, address, TokenReportDB, cursor, per_page,
+                selectinload(TokenReportDB.social_media_post)
+            )
+            return ORJSONResponse({
+                "token_reports": [_token_report_dict(report) for report in reports],
+                "next_cursor": next_cursor,
+                "has_more": has_more
+            })
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in get_token_reports: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch token reports: {str(e)}"
+        )
+
+@router.get("/token/{address}/opportunities")
+@query_budget(2)
+async def get_token_opportunities(address: str, cursor: Optional[str] = None, per_page: int = 20):
+    """Page through a token's opportunities, newest first."""
+    try:
+        async with get_async_read_session() as session:
+            opportunities, next_cursor, has_more = await _paginate_token_children(
+                session, address, TokenOpportunityDB, cursor, per_page
+            )
+            return ORJSONResponse({
+                "token_opportunities": [_token_opportunity_dict(opp) for opp in opportunities],
+                "next_cursor": next_cursor,
+                "has_more": has_more
+            })
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in get_token_opportunities: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch token opportunities: {str(e)}"
+        )
+
+TIMESERIES_INTERVALS = ('hour', 'day')
+
+@router.get("/token/{address}/timeseries")
+@query_budget(2)
+async def get_token_timeseries(
+    address: str,
+    interval: str = 'hour',
+    days: int = Query(7, ge=1, le=90)
+):
+    """Get a token's social mentions, unique authors and engagement per hour or day.
+
+    Reads the hourly rollups maintained as token reports are written. The window
+    covers the last `days` days up to the current hour (or day); buckets are oldest
+    first and empty ones are returned as zeros. With interval=day, unique_authors
+    counts each author once per day.
+    """
+    if interval not in TIMESERIES_INTERVALS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid interval. Must be one of: {', '.join(TIMESERIES_INTERVALS)}"
+        )
+    try:
+        now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        if interval == 'hour':
+            step = timedelta(hours=1)
+            end = now
+            start = end - timedelta(hours=days * 24 - 1)
+        else:
+            step = timedelta(days=1)
+            end = now.replace(hour=0)
+            start = end - timedelta(days=days - 1)
+
+        async with get_async_read_session() as session:
+            row = await find_token_row_by_address(
+                session, address, lambda condition: select(TokenDB.id).where(condition).limit(1)
+            )
+            if row is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Token not found"
+                )
+            token_id = row[0]
+
+            cache_key = ("token_timeseries", token_id, interval, days, end)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return _json_bytes_response(cached)
+            cache_version = response_cache.version
+
+            hourly = TokenHourlyStatsDB
+            in_window = [hourly.token_id == token_id, hourly.bucket >= start]
+            if interval == 'hour':
+                result = await session.execute(
+                    select(
+                        hourly.bucket, hourly.mentions, hourly.unique_authors,
+                        hourly.reactions, hourly.replies, hourly.reposts
+                    ).where(*in_window)
+                )
+                rows = {r.bucket: r._asdict() for r in result}
+            else:
+                day = func.date_trunc('day', hourly.bucket)
+                result = await session.execute(
+                    select(
+                        day.label("bucket"),
+                        func.sum(hourly.mentions).label("mentions"),
+                        func.sum(hourly.reactions).label("reactions"),
+                        func.sum(hourly.replies).label("replies"),
+                        func.sum(hourly.reposts).label("reposts")
+                    ).where(*in_window).group_by(day)
+                )
+                rows = {r.bucket: r._asdict() for r in result}
+
+                # Authors are only unique per hour in the rollup; count them per day
+                authors = TokenHourlyAuthorDB
+                author_day = func.date_trunc('day', authors.bucket)
+                result = await session.execute(
+                    select(author_day, func.count(func.distinct(authors.author_id)))
+                    .where(authors.token_id == token_id, authors.bucket >= start)
+                    .group_by(author_day)
+                )
+                for bucket, unique_authors in result:
+                    if bucket in rows:
+                        rows[bucket]["unique_authors"] = unique_authors
+
+        points = []
+        bucket = start
+        while bucket <= end:
+            data = rows.get(bucket, {})
+            points.append({
+                "bucket": bucket,
+                "mentions": int(data.get("mentions") or 0),
+                "unique_authors": int(data.get("unique_authors") or 0),
+                "reactions": int(data.get("reactions") or 0),
+                "replies": int(data.get("replies") or 0),
+                "reposts": int(data.get("reposts") or 0)
+            })
+            bucket += step
+
+        body = orjson.dumps({
+            "token_id": token_id,
+            "interval": interval,
+            "start": start,
+            "end": end,
+            "points": points
+        })
+        response_cache.set(cache_key, body, tags=[token_tag(token_id)], version=cache_version)
+        return _json_bytes_response(body)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in get_token_timeseries: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch token timeseries: {str(e)}"
+        )
+
+SEARCH_MAX_LIMIT = 100
+
+def _parse_search_types(types: Optional[str]) -> tuple:
+    """Validate a comma-separated types= value against SEARCH_SOURCES."""
+    if not types:
+        return tuple(SEARCH_SOURCES)
+    requested = {t.strip() for t in types.split(',') if t.strip()}
+    unknown = requested - set(SEARCH_SOURCES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown search types: {', '.join(sorted(unknown))}. "
+                   f"Allowed: {', '.join(SEARCH_SOURCES)}"
+        )
+    return tuple(t for t in SEARCH_SOURCES if t in requested)
+
+def _search_token_dict(token: Optional[TokenDB]) -> Optional[dict]:
+    if token is None:
+        return None
+    return _token_dict(token, ('id', 'symbol', 'name', 'chain', 'address', 'image_url'), ())
+
+@router.get("/search")
+@query_budget(6)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0, le=1000)
+):
+    """Full-text search over social media posts, token report reasoning and opportunity justifications.
+
+    q accepts web-search syntax ("quoted phrases", or, -excluded); types limits the
+    sources (post, report, opportunity). Hits are ranked by ts_rank_cd, newest first
+    on ties, and carry a highlighted snippet and the linked token.
+    """
+    selected = _parse_search_types(types)
+    try:
+        async with get_async_read_session() as session:
+            tsquery = search_query(q)
+
+            # Rank ids across all selected sources off the GIN indexes, then load one page
+            subqueries = []
+            for name in selected:
+                model, _ = SEARCH_SOURCES[name]
+                subqueries.append(
+                    select(
+                        literal(name).label("type"),
+                        model.id.label("id"),
+                        func.ts_rank_cd(search_vector(model), tsquery).label("rank"),
+                        model.created_at.label("created_at")
+                    ).where(search_vector(model).op('@@')(tsquery))
+                )
+            ranked = union_all(*subqueries).subquery()
+            result = await session.execute(
+                select(ranked)
+                .order_by(desc(ranked.c.rank), desc(ranked.c.created_at), desc(ranked.c.id))
+                .limit(limit + 1)
+                .offset(offset)
+            )
+            page = result.all()
+            has_more = len(page) > limit
+            page = page[:limit]
+
+            ids_by_type: Dict[str, list] = {}
+            for hit in page:
+                ids_by_type.setdefault(hit.type, []).append(hit.id)
+
+            # Load the page's rows with their token linkage and a highlighted snippet
+            loaders = {
+                'post': (
+                    [
+                        selectinload(SocialMediaPostDB.token_report).joinedload(TokenReportDB.token)
+                    ],
+                    lambda post: post.token_report.token if post.token_report else None,
+                    _social_media_post_dict
+                ),
+                'report': (
+                    [
+                        joinedload(TokenReportDB.token),
+                        selectinload(TokenReportDB.social_media_post)
+                    ],
+                    lambda report: report.token,
+                    _token_report_dict
+                ),
+                'opportunity': (
+                    [joinedload(TokenOpportunityDB.token)],
+                    lambda opp: opp.token,
+                    _token_opportunity_dict
+                ),
+            }
+            hits: Dict[tuple, dict] = {}
+            for name, ids in ids_by_type.items():
+                model, column = SEARCH_SOURCES[name]
+                options, token_of, serialize = loaders[name]
+                snippet = func.ts_headline(
+                    SEARCH_CONFIG,
+                    getattr(model, column),
+                    tsquery,
+                    'MaxFragments=2, MaxWords=30, MinWords=10'
+                )
+                result = await session.execute(
+                    select(model, snippet).where(model.id.in_(ids)).options(*options)
+                )
+                for row, row_snippet in result.unique().all():
+                    hits[(name, row.id)] = {
+                        "snippet": row_snippet,
+                        "token": _search_token_dict(token_of(row)),
+                        name: serialize(row)
+                    }
+
+            return {
+                "results": [
+                    {"type": hit.type, "rank": hit.rank, **hits[(hit.type, hit.id)]}
+                    for hit in page
+                    if (hit.type, hit.id) in hits
+                ],
+                "has_more": has_more
+            }
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in search: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search: {str(e)}"
+        )
+
+# Rows fetched per round trip by the export endpoints' server-side cursors
+EXPORT_BATCH_SIZE = 500
+
+def _parse_export_range(start: Optional[str], end: Optional[str]) -> list:
+    """Turn inclusive YYYY-MM-DD start/end dates into created_at bounds."""
+    try:
+        bounds = []
+        if start:
+            bounds.append(datetime.strptime(start, '%Y-%m-%d'))
+        else:
+            bounds.append(None)
+        if end:
+            bounds.append(datetime.strptime(end, '%Y-%m-%d') + timedelta(days=1))
+        else:
+            bounds.append(None)
+        return bounds
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start and end must be dates in YYYY-MM-DD format"
+        )
+
+async def _stream_ndjson(query, serialize, name: str):
+    """Yield one JSON line per row of query, read through a server-side cursor.
+
+    Rows arrive EXPORT_BATCH_SIZE at a time and nothing holds on to them once written
+    (the session's identity map is weak-referencing), so memory stays flat however
+    large the export is. Rows must be ordered by id so a client can resume after the
+    last id it received.
+    """
+    try:
+        async with get_async_read_session() as session:
+            result = await session.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for partition in result.scalars().partitions():
+                yield b"".join(orjson.dumps(serialize(row)) + b"\n" for row in partition)
+    except Exception as e:
+        # Headers are already sent, so the truncated stream is the only signal left
+        print(f"Error in {name} export: {str(e)}")
+
+@router.get("/export/alpha_reports")
+async def export_alpha_reports(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    after_id: Optional[int] = None
+):
+    """Stream alpha reports created between start and end (inclusive) as NDJSON.
+
+    Reports are ordered by id; pass the last id received as after_id to resume.
+    """
+    start_at, end_before = _parse_export_range(start, end)
+
+    query = select(AlphaReportDB).options(
+        selectinload(AlphaReportDB.opportunities).selectinload(TokenOpportunityDB.token),
+        selectinload(AlphaReportDB.opportunities)
+        .selectinload(TokenOpportunityDB.token_report)
+        .selectinload(TokenReportDB.social_media_post)
+        .load_only(
+            SocialMediaPostDB.source,
+            SocialMediaPostDB.author_display_name,
+            SocialMediaPostDB.text,
+            SocialMediaPostDB.timestamp
+        )
+    )
+    if start_at:
+        query = query.where(AlphaReportDB.created_at >= start_at)
+    if end_before:
+        query = query.where(AlphaReportDB.created_at < end_before)
+    if after_id is not None:
+        query = query.where(AlphaReportDB.id > after_id)
+
+    return StreamingResponse(
+        _stream_ndjson(query.order_by(AlphaReportDB.id), _alpha_report_dict, "alpha_reports"),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/export/tokens")
+async def export_tokens(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    after_id: Optional[int] = None
+):
+    """Stream tokens created between start and end (inclusive) with their reports,
+    posts and opportunities as NDJSON.
+
+    Tokens are ordered by id; pass the last id received as after_id to resume.
+    """
+    start_at, end_before = _parse_export_range(start, end)
+
+    query = select(TokenDB).options(
+        selectinload(TokenDB.token_reports).selectinload(TokenReportDB.social_media_post),
+        selectinload(TokenDB.token_opportunities)
+    )
+    if start_at:
+        query = query.where(TokenDB.created_at >= start_at)
+    if end_before:
+        query = query.where(TokenDB.created_at < end_before)
+    if after_id is not None:
+        query = query.where(TokenDB.id > after_id)
+
+    return StreamingResponse(
+        _stream_ndjson(
+            query.order_by(TokenDB.id),
+            lambda token: _token_dict(token, TOKEN_FIELDS, DEFAULT_TOKEN_INCLUDE),
+            "tokens"
+        ),
+        media_type="application/x-ndjson"
+    )
+
+FEED_EVENT_TYPES = ('opportunity', 'token_report')
+# Comment line sent when no event arrived for this long, so proxies keep the stream open
+FEED_HEARTBEAT_SECONDS = 15
+
+def _sse_message(event: FeedEvent) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event.id, event.type.encode(), orjson.dumps(event.data))
+
+async def _stream_feed(subscriber: FeedSubscriber, backlog: list, types: tuple):
+    """Yield buffered then live feed events as SSE until the client goes away or falls behind."""
+    try:
+        yield b"retry: 3000\n\n"
+        for event in backlog:
+            if event.type in types:
+                yield _sse_message(event)
+        while not subscriber.overflowed:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), FEED_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if event.type in types:
+                yield _sse_message(event)
+    finally:
+        feed.unsubscribe(subscriber)
+
+@router.get("/feed")
+async def get_feed(
+    types: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None)
+):
+    """Stream newly committed opportunities and token reports as server-sent events.
+
+    Each event's name is its type (opportunity, token_report) and its data a JSON
+    summary of the new row with its token. types= limits the stream to some event
+    types. Browsers reconnecting with Last-Event-ID get the events they missed, as
+    long as they are still in the replay buffer.
+    """
+    if types:
+        selected = tuple(t.strip() for t in types.split(',') if t.strip())
+        unknown = set(selected) - set(FEED_EVENT_TYPES)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown feed types: {', '.join(sorted(unknown))}. "
+                       f"Allowed: {', '.join(FEED_EVENT_TYPES)}"
+            )
+    else:
+        selected = FEED_EVENT_TYPES
+
+    try:
+        resume_after = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_after = None
+
+    subscriber, backlog = feed.subscribe(resume_after)
+    return StreamingResponse(
+        _stream_feed(subscriber, backlog, selected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get hit/miss counters and occupancy of the in-process response, token identity and near-duplicate caches."""
+    return {
+        **response_cache.stats(),
+        "token_identity": token_identity_cache.stats(),
+        "near_duplicates": near_duplicate_index.stats()
+    }
@@ -6,6 +6,8 @@ import argparse
 # Process arguments
 parser = argparse.ArgumentParser(description='Scout Warpcasts for opportunities')
 parser.add_argument('--test', action='store_true', help='Run in test mode (process only 3 casts total)')
+parser.add_argument('--scout', action='store_true', help='Also run the alpha scout on each cast (queued analyze_and_scout jobs)')
+parser.add_argument('--job-timeout', type=int, default=1800, help='Seconds to wait for queued scout jobs before giving up on them')
 args = parser.parse_args()
 
 import asyncio
@@ -51,12 +53,12 @@ async def get_following_usernames(client):
         return []
 
 
-async def process_cast(session, api_url, headers, cast, client, total_processed, total_opportunities):
-    """Process a single cast"""
+# Seconds between polls of the queued scout jobs
+JOB_POLL_INTERVAL = 5
+
+async def process_cast(session, api_url, headers, cast, client, total_processed, total_opportunities, pending_jobs, scout=False):
+    """Analyze a single cast, or with scout queue it for analysis and alpha scouting"""
     try:
-        # Add 5 second delay before processing
-        await asyncio.sleep(5)
-        
         # Create social media input object
         cast_dict = cast.dict()
         
@@ -82,6 +84,18 @@ async def process_cast(session, api_url, headers, cast, client, total_processed,
             "recasts_count": cast_dict.get('recasts', {}).get('count', 0)
         }
         
+        if scout:
+            # Queue it; the API answers at once and its workers run the analysis and the scout
+            async with session.post(f"{api_url}/api/analyze_and_scout", json=social_media_input, headers=headers) as response:
+                if response.status == 202:
+                    total_processed[0] += 1
+                    job = await response.json()
+                    pending_jobs[job['status_url']] = cast_dict.get('text', '')
+                    return True
+                response_text = await response.text()
+                logging.error(f"Error from API: {response.status} - {response_text}")
+                return False
+
         # Send to analyze_social_post endpoint
         async with session.post(f"{api_url}/api/analyze_social_post", json=social_media_input, headers=headers) as response:
             if response.status == 200:
@@ -119,7 +133,45 @@ async def get_latest_post_timestamp(session: aiohttp.ClientSession, api_url: str
         logging.error(f"Error getting latest post timestamp for {username}: {e}")
         return datetime(2000, 1, 1)
 
-async def process_user(session: aiohttp.ClientSession, api_url: str, headers: dict, username: str, client, total_casts_target: int, total_processed: list, total_opportunities: list):
+async def wait_for_jobs(session: aiohttp.ClientSession, api_url: str, headers: dict, pending_jobs: dict, timeout: float) -> int:
+    """Poll the queued scout jobs until all have finished or timeout seconds have passed; returns the number that found an opportunity"""
+    opportunities = 0
+    deadline = asyncio.get_running_loop().time() + timeout
+    while pending_jobs:
+        for status_url, text in list(pending_jobs.items()):
+            try:
+                async with session.get(f"{api_url}{status_url}", headers=headers) as response:
+                    if response.status == 404:
+                        del pending_jobs[status_url]
+                        logging.error(f"Scout job {status_url} no longer exists")
+                        continue
+                    if response.status != 200:
+                        logging.error(f"Error from API for {status_url}: {response.status}")
+                        continue
+                    job = await response.json()
+            except Exception as e:
+                logging.error(f"Error polling {status_url}: {e}")
+                continue
+
+            if job['status'] == 'succeeded':
+                del pending_jobs[status_url]
+                if job['result']:
+                    opportunities += 1
+                    logging.info(f"Found opportunity in cast: {text[:100]}...")
+            elif job['status'] == 'failed':
+                del pending_jobs[status_url]
+                logging.error(f"Scout job {status_url} failed: {job['error']}")
+
+        if pending_jobs:
+            if asyncio.get_running_loop().time() >= deadline:
+                # Jobs stay queued if no worker runs them (JOB_WORKERS=0 without job_queue.py)
+                logging.error(f"Gave up after {timeout}s on {len(pending_jobs)} scout jobs: {', '.join(pending_jobs)}")
+                break
+            logging.info(f"Waiting for {len(pending_jobs)} scout jobs")
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+    return opportunities
+
+async def process_user(session: aiohttp.ClientSession, api_url: str, headers: dict, username: str, client, total_casts_target: int, total_processed: list, total_opportunities: list, pending_jobs: dict, scout: bool = False):
     """Process casts for a single user"""
     try:
         logging.info(f"\nProcessing user: {username}")
@@ -128,22 +180,20 @@ async def process_user(session: aiohttp.ClientSession, api_url: str, headers: di
         user = client.get_user_by_username(username)
         if not user:
             logging.warning(f"Could not find user: {username}")
-            return 0, 0
+            return 0
         
         # Get user's casts
         casts_response = client.get_casts(user.fid, limit=10)
         if not casts_response or not casts_response.casts:
             logging.warning(f"No casts found for user: {username}")
-            return 0, 0
+            return 0
         
         user_casts_processed = 0
-        user_opportunities_found = 0
         
         # Get latest processed post timestamp for this user
         latest_timestamp = await get_latest_post_timestamp(session, api_url, headers, username)
         logging.info(f"Latest processed post timestamp for {username}: {latest_timestamp}")
         
-        # Process casts sequentially to maintain 5-second buffer between API calls
         for cast in casts_response.casts:
             if total_processed[0] >= total_casts_target:
                 break
@@ -165,20 +215,23 @@ async def process_user(session: aiohttp.ClientSession, api_url: str, headers: di
                 logging.error(f"Error parsing cast timestamp: {e}")
                 continue
                 
-            success = await process_cast(session, api_url, headers, cast, client, total_processed, total_opportunities)
+            success = await process_cast(
+                session, api_url, headers, cast, client, total_processed, total_opportunities, pending_jobs, scout
+            )
             if success:
                 user_casts_processed += 1
         
         logging.info(f"Processed {user_casts_processed} casts for {username}")
-        return user_casts_processed, user_opportunities_found
+        return user_casts_processed
         
     except Exception as e:
         logging.error(f"Error processing user {username}: {e}")
-        return 0, 0
+        return 0
 
-async def scout_warpcasts(test_mode: bool = False):
+async def scout_warpcasts(test_mode: bool = False, scout: bool = False, job_timeout: float = 1800):
     """
-    Fetch recent warpcasts and send them to the analyze_social_post endpoint
+    Fetch recent warpcasts and analyze them with the analyze_social_post endpoint, or with scout
+    queue them with the analyze_and_scout endpoint and wait for the results
     """
     # Get required environment variables
     mnemonic = os.environ.get("MNEMONIC_ENV_VAR")
@@ -217,19 +270,22 @@ async def scout_warpcasts(test_mode: bool = False):
     # Use lists to allow modification in nested functions
     total_processed = [0]
     total_opportunities = [0]
+    pending_jobs = {}
     
     logging.info(f"Target number of casts to process: {total_casts_target}")
     
     async with aiohttp.ClientSession() as session:
-        # Process users sequentially to maintain 5-second buffer between API calls
+        # With scout, queue every new cast first, then wait for the API's workers to get through them
         for username in following_usernames:
             if total_processed[0] >= total_casts_target:
                 break
             
             await process_user(
                 session, api_url, headers, username, client,
-                total_casts_target, total_processed, total_opportunities
+                total_casts_target, total_processed, total_opportunities, pending_jobs, scout
             )
+
+        total_opportunities[0] += await wait_for_jobs(session, api_url, headers, pending_jobs, job_timeout)
     
     logging.info(f"\nFinished processing {total_processed[0]} casts")
     logging.info(f"Found {total_opportunities[0]} total opportunities")
@@ -238,7 +294,7 @@ def main():
     """Main entry point for the script"""
     try:
         # Run the async function
-        asyncio.run(scout_warpcasts(test_mode=args.test))
+        asyncio.run(scout_warpcasts(test_mode=args.test, scout=args.scout, job_timeout=args.job_timeout))
     except Exception as e:
         logging.error(f"Fatal error: {e}")
         sys.exit(1)
@@ -154,6 +154,25 @@ export async function fetchToken(address) {
     return data;
 }
 
+// Poll a background job (/api/jobs/{id}) until it finishes; resolves to its result
+export async function waitForJob(statusUrl, apiKey, intervalMs = 3000) {
+    while (true) {
+        const response = await fetch(statusUrl, { headers: { 'x-key': apiKey } });
+        if (!response.ok) {
+            const errorText = await response.text();
+            throw new Error(errorText || `Failed to fetch job status: ${response.status}`);
+        }
+        const job = await response.json();
+        if (job.status === 'succeeded') {
+            return job.result;
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Job failed');
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
 export async function runTokenAlphaScout(tokenReport, tokenReportId) {
     try {
         const apiKey = document.querySelector('meta[name="api-key"]').content;
@@ -183,7 +202,9 @@ export async function runTokenAlphaScout(tokenReport, tokenReportId) {
             throw new Error(errorText || 'Failed to run alpha scout');
         }
 
-        const result = await response.json();
+        // The scout runs as a background job; wait for its result
+        const job = await response.json();
+        const result = await waitForJob(job.status_url, apiKey);
         console.log('Alpha scout response:', result);
 
         if (!result || typeof result !== 'object') {
@@ -209,12 +230,36 @@ export async function runTokenAlphaScout(tokenReport, tokenReportId) {
 }
 
 export async function fetchAlphaReports(date = null) {
-    const url = date ? `/api/alpha_reports?date=${date}` : '/api/alpha_reports';
-    const response = await fetch(url);
+    const baseUrl = date ? `/api/alpha_reports?date=${date}` : '/api/alpha_reports';
+    let reports = [];
+    let cursor = null;
+    do {
+        const url = cursor
+            ? `${baseUrl}${date ? '&' : '?'}cursor=${encodeURIComponent(cursor)}`
+            : baseUrl;
+        const response = await fetch(url);
+        if (!response.ok) {
+            const errorText = await response.text();
+            throw new Error(`HTTP error! status: ${response.status}. ${errorText}`);
+        }
+        reports = reports.concat(await parseAlphaReports(response));
+        // A day is loaded in full; without a date only the newest page is needed
+        cursor = date ? response.headers.get('X-Next-Cursor') : null;
+    } while (cursor);
+    return reports;
+}
+
+// Function to fetch the days that have alpha reports (newest first) with their counts
+export async function fetchAlphaReportDates() {
+    const response = await fetch('/api/alpha_reports/dates');
     if (!response.ok) {
         const errorText = await response.text();
         throw new Error(`HTTP error! status: ${response.status}. ${errorText}`);
     }
+    return response.json();
+}
+
+async function parseAlphaReports(response) {
     try {
         const text = await response.text();
         // Add missing commas between properties
@@ -259,3 +304,21 @@ export async function fetchAlphaReports(date = null) {
         throw new Error(`Failed to parse API response: ${error.message}`);
     }
 }
+
+// Subscribe to newly committed opportunities / token reports pushed by the server.
+// onEvent(type, data) is called for each event; the browser reconnects on its own
+// and resumes from the last event it saw. Returns the EventSource so callers can close it.
+export function subscribeToFeed(types, onEvent) {
+    const source = new EventSource(`/api/feed?types=${encodeURIComponent(types.join(','))}`);
+    types.forEach(type => {
+        source.addEventListener(type, event => {
+            try {
+                onEvent(type, JSON.parse(event.data));
+            } catch (error) {
+                console.error('Error handling feed event:', error, event.data);
+            }
+        });
+    });
+    source.onerror = () => console.warn('Feed connection lost, reconnecting...');
+    return source;
+}
@@ -35,11 +35,21 @@ export function createDateNavigation(dates, currentDateIndex, container) {
         return date.toISOString().split('T')[0];
     };
 
+    // Step to the previous/next day that has reports, using the dates from
+    // /api/alpha_reports/dates (most recent first); plain day steps otherwise
+    const stepDate = (dateStr, days) => {
+        const reportDates = window.sortedDates || [];
+        const candidates = days < 0
+            ? reportDates.filter(date => date < dateStr)
+            : reportDates.filter(date => date > dateStr).reverse();
+        return candidates.length > 0 ? candidates[0] : adjustDate(dateStr, days);
+    };
+
     // Create click handlers
     const handlePrevClick = () => {
         const urlParams = new URLSearchParams(window.location.search);
         const currentDate = urlParams.get('date') || new Date().toISOString().split('T')[0];
-        const newDate = adjustDate(currentDate, -1);
+        const newDate = stepDate(currentDate, -1);
         
         const url = new URL(window.location);
         url.searchParams.set('date', newDate);
@@ -49,7 +59,7 @@ export function createDateNavigation(dates, currentDateIndex, container) {
     const handleNextClick = () => {
         const urlParams = new URLSearchParams(window.location.search);
         const currentDate = urlParams.get('date') || new Date().toISOString().split('T')[0];
-        const newDate = adjustDate(currentDate, 1);
+        const newDate = stepDate(currentDate, 1);
         
         const url = new URL(window.location);
         url.searchParams.set('date', newDate);
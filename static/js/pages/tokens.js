@@ -2,6 +2,11 @@ let nextCursor = null;
 let isLoading = false;
 let hasMoreTokens = true;
 const TOKENS_PER_PAGE = 10;
+// Only what the grid cards render; KOL events come from the precomputed stats
+const TOKEN_CARD_FIELDS = 'symbol,chain,address,image_url,created_at';
+const TOKEN_CARD_INCLUDE = 'opportunities,stats';
+// Tokens on screen by address, so opportunities pushed by /api/feed can update their cards
+const displayedTokens = new Map();
 
 // Get filter values
 function getSelectedChains() {
@@ -29,6 +34,7 @@ const observer = new IntersectionObserver((entries) => {
 }, { threshold: 0.1 });
 
 function calculateKoiEvents(token) {
+    if (token.stats) return token.stats.kol_events || 0;
     if (!token.token_reports) return 0;
     
     // Count unique social media posts and their engagement
@@ -99,6 +105,8 @@ async function fetchTokens(cursor = null) {
         
         // Add required parameters
         params.append('per_page', TOKENS_PER_PAGE);
+        params.append('fields', TOKEN_CARD_FIELDS);
+        params.append('include', TOKEN_CARD_INCLUDE);
         
         // Add chain filter
         const chains = getSelectedChains();
@@ -236,7 +244,10 @@ function displayTokens(tokens, append = false) {
     } else {
         // Replace all content
         tokenGrid.innerHTML = tokensHtml;
+        displayedTokens.clear();
+        document.querySelector('.feed-notice')?.remove();
     }
+    tokens.forEach(token => displayedTokens.set(token.address, token));
 
     // Add loading indicator if there are more tokens
     if (hasMoreTokens) {
@@ -303,6 +314,52 @@ function escapeHtml(unsafe) {
         .replace(/'/g, "&#039;");
 }
 
+// Apply an opportunity pushed by /api/feed: refresh the token's card if it is on
+// screen, and offer a reload when the listing order may have changed
+function handleNewOpportunity(opp) {
+    const address = opp.token?.address;
+    if (!address) return;
+
+    const token = displayedTokens.get(address);
+    if (token) {
+        token.token_opportunities = [opp, ...(token.token_opportunities || [])];
+        const link = document.querySelector(`.token-grid .token-link[href="/token?address=${encodeURIComponent(address)}"]`);
+        const details = link?.querySelector('.token-details');
+        if (details) {
+            details.innerHTML = renderOpportunityDetails(token);
+        }
+    }
+
+    const sortBy = getSortBy();
+    if (sortBy === 'recent_opportunity' || (sortBy === 'market_cap' && opp.market_cap)) {
+        showFeedNotice();
+    }
+}
+
+function showFeedNotice() {
+    if (document.querySelector('.feed-notice')) return;
+    const notice = document.createElement('button');
+    notice.className = 'feed-notice apply-button';
+    notice.textContent = 'New opportunities - show latest';
+    notice.addEventListener('click', () => {
+        notice.remove();
+        nextCursor = null;
+        hasMoreTokens = true;
+        fetchTokens(null);
+    });
+    const tokenGrid = document.querySelector('.token-grid');
+    tokenGrid.parentNode.insertBefore(notice, tokenGrid);
+}
+
+const feedSource = new EventSource('/api/feed?types=opportunity');
+feedSource.addEventListener('opportunity', event => {
+    try {
+        handleNewOpportunity(JSON.parse(event.data));
+    } catch (error) {
+        console.error('Error handling feed event:', error, event.data);
+    }
+});
+
 // Add event listener for Apply button
 document.getElementById('apply-filters').addEventListener('click', () => {
     // Reset cursor when applying filters
@@ -1,7 +1,7 @@
 import { createAlphaCard } from '../js/components/AlphaCard.js';
 import { createDateNavigation } from '../js/components/DateNavigation.js';
-import { formatDate, groupOpportunitiesByDate, filterMostRecentPerToken } from '../js/utils/date.js';
-import { showLoading, submitReport, showError, fetchAlphaReports } from '../js/api/alphaApi.js';
+import { formatDate, getDateKey, groupOpportunitiesByDate, filterMostRecentPerToken } from '../js/utils/date.js';
+import { showLoading, submitReport, showError, fetchAlphaReports, fetchAlphaReportDates, subscribeToFeed } from '../js/api/alphaApi.js';
 
 // Helper function to preserve navigation while clearing container
 function preserveNavigationAndClear(container) {
@@ -41,24 +41,31 @@ async function loadAlphaFeed(dateIndex = null) {
         }
 
         showLoading();
-        
-        // If dateIndex is provided, use it to fetch data for that specific date
-        let data;
-        if (dateIndex !== null) {
-            const sortedDates = window.sortedDates || [];
-            if (sortedDates[dateIndex]) {
-                data = await fetchAlphaReports(sortedDates[dateIndex]);
-                // Update URL with the selected date
-                updateUrlWithDate(sortedDates[dateIndex]);
-            } else {
-                data = await fetchAlphaReports();
+
+        // Load the days that have reports (most recent first) once, for navigation
+        if (!window.sortedDates) {
+            try {
+                const dates = await fetchAlphaReportDates();
+                window.sortedDates = dates.map(day => day.date);
+            } catch (datesError) {
+                console.error('Error fetching report dates:', datesError);
+                window.sortedDates = [];
             }
+        }
+        const sortedDates = window.sortedDates;
+        
+        // Pick the day to show: the requested index, the URL date, or the most recent day
+        let targetDate = null;
+        if (dateIndex !== null && sortedDates[dateIndex]) {
+            targetDate = sortedDates[dateIndex];
+            // Update URL with the selected date
+            updateUrlWithDate(targetDate);
         } else if (urlDate) {
-            // If no dateIndex but URL has date parameter, fetch that date
-            data = await fetchAlphaReports(urlDate);
+            targetDate = urlDate;
         } else {
-            data = await fetchAlphaReports();
+            targetDate = sortedDates[0] || null;
         }
+        const data = await fetchAlphaReports(targetDate);
         
         console.log('Raw API response:', data);
         
@@ -195,16 +202,13 @@ async function loadAlphaFeed(dateIndex = null) {
         const groupedOpportunities = groupOpportunitiesByDate(allOpportunities);
         console.log('Grouped opportunities:', groupedOpportunities);
         
-        // Get sorted dates (most recent first)
-        const sortedDates = Object.keys(groupedOpportunities)
+        // Get the dates present in the loaded reports (most recent first)
+        const loadedDates = Object.keys(groupedOpportunities)
             .filter(date => groupedOpportunities[date].length > 0)
             .sort((a, b) => b.localeCompare(a));
-            
-        // Store dates globally for navigation
-        window.sortedDates = sortedDates;
-        console.log('Sorted dates:', sortedDates);
+        console.log('Loaded dates:', loadedDates);
         
-        if (sortedDates.length === 0) {
+        if (loadedDates.length === 0) {
             // Clear container but preserve navigation
             preserveNavigationAndClear(container);
             const noDataDiv = document.createElement('div');
@@ -214,30 +218,16 @@ async function loadAlphaFeed(dateIndex = null) {
             return;
         }
         
-        // If dateIndex is null or invalid, check URL date or use most recent
-        if (dateIndex === null || dateIndex < 0 || dateIndex >= sortedDates.length) {
-            if (urlDate) {
-                // Find the index of the URL date in sortedDates
-                dateIndex = sortedDates.indexOf(urlDate);
-                // If date not found, default to most recent
-                if (dateIndex === -1) {
-                    dateIndex = 0;
-                }
-            } else {
-                dateIndex = 0;
-            }
-        }
+        // Show the target date if it was loaded, otherwise the most recent loaded date
+        const currentDate = loadedDates.includes(targetDate) ? targetDate : loadedDates[0];
         
         // Store current index globally for navigation
-        window.currentDateIndex = dateIndex;
+        window.currentDateIndex = sortedDates.indexOf(currentDate);
         
         // Clear existing cards but keep navigation
         preserveNavigationAndClear(container);
         
         try {
-            // Get opportunities for current date
-            const currentDate = sortedDates[dateIndex];
-            
             // Update navigation with current date
             if (window.navigation?.element) {
                 window.navigation.update(currentDate);
@@ -297,6 +287,57 @@ async function loadAlphaFeed(dateIndex = null) {
     }
 }
 
+// Add an opportunity pushed by /api/feed to the page without reloading the day
+function handleNewOpportunity(opp) {
+    const chain = (opp.chain || '').toLowerCase();
+    if (!opp.created_at || (chain !== 'base' && chain !== 'solana')) {
+        return;
+    }
+    const day = getDateKey(opp.created_at);
+    if (!day) {
+        return;
+    }
+
+    // A new day becomes the most recent one in the navigation
+    if (window.sortedDates && !window.sortedDates.includes(day)) {
+        window.sortedDates.unshift(day);
+        if (window.currentDateIndex !== undefined && window.currentDateIndex >= 0) {
+            window.currentDateIndex += 1;
+        }
+    }
+
+    // Only the day on screen gets the card
+    const shownDate = window.sortedDates?.[window.currentDateIndex];
+    const container = document.getElementById('alphaContainer');
+    if (!container || shownDate !== day) {
+        return;
+    }
+    container.querySelector('.no-data')?.remove();
+
+    const alpha = {
+        ...opp,
+        name: (opp.token?.symbol || opp.name || 'Unknown Token').toUpperCase(),
+        recommendation: opp.recommendation || 'hold',
+        justification: opp.justification || 'No analysis provided.',
+        community_score: opp.community_score || 'N/A',
+        safety_score: opp.safety_score || 'N/A'
+    };
+
+    // Keep one card per token, as on a full load: the newest replaces the previous one
+    if (alpha.contract_address) {
+        const href = `/token?address=${encodeURIComponent(alpha.contract_address)}`;
+        container.querySelectorAll('.alpha-card').forEach(card => {
+            if (card.querySelector(`.token-link[href="${href}"]`)) {
+                card.remove();
+            }
+        });
+    }
+
+    const card = createAlphaCard(alpha);
+    const nav = container.querySelector('.date-navigation');
+    container.insertBefore(card, nav ? nav.nextSibling : container.firstChild);
+}
+
 // Make loadAlphaFeed and submitReport available globally
 window.loadAlphaFeed = loadAlphaFeed;
 window.submitReport = submitReport;
@@ -305,4 +346,5 @@ window.submitReport = submitReport;
 document.addEventListener('DOMContentLoaded', () => {
     // Small delay to ensure all modules are loaded
     setTimeout(loadAlphaFeed, 100);
+    subscribeToFeed(['opportunity'], (type, opp) => handleNewOpportunity(opp));
 });
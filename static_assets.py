@@ -0,0 +1,210 @@
+"""
+Content-hashed, precompressed copies of the files under static/.
+
+build_static_assets() copies every file to static/dist with a hash of its
+content in the name (css/styles.css -> css/styles.1a2b3c4d5e.css), writes .br
+(when brotli is installed) and .gz siblings for text assets, and records the
+mapping in static/dist/manifest.json. References between assets (CSS @import
+and url(), JS imports and literal "/static/..." paths) are rewritten to the
+hashed names first, so a change to any file renames everything that loads it.
+
+/static/dist is served with a one-year immutable Cache-Control and pages point
+at it through the static_url() template helper. The unhashed /static tree stays
+mounted for paths built at runtime (e.g. the chain icons picked in JS), and is
+revalidated by ETag on every use.
+"""
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import stat
+from typing import Dict, Optional, Set
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from compression import accepted_encodings, brotli
+
+STATIC_DIR = "static"
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_NAME = "manifest.json"
+STATIC_URL_PREFIX = "/static/"
+DIST_URL_PREFIX = "/static/dist/"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Assets whose references to other assets are rewritten, and those worth precompressing
+REWRITE_SUFFIXES = ('.css', '.js')
+COMPRESSIBLE_SUFFIXES = ('.css', '.js', '.svg', '.json', '.html', '.txt')
+
+# Precompressed siblings, in order of preference
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+_CSS_REFERENCE = re.compile(r"""(@import\s+(?:url\()?|url\()\s*(['"]?)([^'"()\s;]+)\2""")
+_JS_REFERENCE = re.compile(r"""(\bfrom\s*|\bimport\s*\(?\s*)(['"])([^'"]+)\2""")
+_STATIC_LITERAL = re.compile(r"""(['"])(/static/[^'"$`\s]+)\1""")
+
+_manifest: Dict[str, str] = {}
+
+def static_url(path: str) -> str:
+    """URL of a file under static/, by its hashed name when it has been built."""
+    path = path.lstrip("/")
+    hashed = _manifest.get(path)
+    return DIST_URL_PREFIX + hashed if hashed else STATIC_URL_PREFIX + path
+
+def _hashed_name(path: str, content: bytes) -> str:
+    stem, suffix = posixpath.splitext(path)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:10]}{suffix}"
+
+def _resolve(reference: str, referrer: str, sources: Dict[str, str]) -> Optional[str]:
+    """Logical path (relative to static/) of an asset reference, or None if it isn't one."""
+    if '?' in reference or '#' in reference or ':' in reference:
+        return None
+    if reference.startswith(STATIC_URL_PREFIX):
+        path = reference[len(STATIC_URL_PREFIX):]
+    elif reference.startswith('/'):
+        return None
+    else:
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(referrer), reference))
+    return path if path in sources else None
+
+def _write_atomic(path: str, content: bytes) -> None:
+    # Several workers may build at once; each file appears complete or not at all
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def build_static_assets(static_dir: str = STATIC_DIR, dist_dir: str = DIST_DIR) -> Dict[str, str]:
+    """Write hashed and precompressed copies of static_dir into dist_dir.
+
+    Returns the manifest ({logical path: hashed path}), which static_url() uses from
+    then on. Output is content-addressed, so rebuilding unchanged files is a no-op;
+    files left over from earlier builds are removed.
+    """
+    global _manifest
+
+    sources = {}
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and os.path.join(root, d) != dist_dir]
+        for name in files:
+            if not name.startswith('.'):
+                full_path = os.path.join(root, name)
+                sources[os.path.relpath(full_path, static_dir).replace(os.sep, '/')] = full_path
+
+    manifest: Dict[str, str] = {}
+    outputs: Dict[str, bytes] = {}
+    in_progress: Set[str] = set()
+
+    def build(path: str) -> Optional[str]:
+        if path in manifest:
+            return manifest[path]
+        if path in in_progress:
+            # Import cycle: this reference keeps pointing at the unhashed file
+            return None
+        in_progress.add(path)
+
+        with open(sources[path], 'rb') as f:
+            content = f.read()
+        if path.endswith(REWRITE_SUFFIXES):
+            content = _rewrite_references(path, content.decode('utf-8'), sources, build).encode('utf-8')
+
+        hashed = _hashed_name(path, content)
+        manifest[path] = hashed
+        outputs[hashed] = content
+        in_progress.discard(path)
+        return hashed
+
+    for path in sorted(sources):
+        build(path)
+
+    expected = {MANIFEST_NAME}
+    for hashed, content in outputs.items():
+        target = os.path.join(dist_dir, hashed)
+        expected.add(hashed)
+        if not os.path.exists(target):
+            _write_atomic(target, content)
+        if not hashed.endswith(COMPRESSIBLE_SUFFIXES):
+            continue
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if encoding == 'br' and brotli is None:
+                continue
+            expected.add(hashed + suffix)
+            if os.path.exists(target + suffix):
+                continue
+            if encoding == 'br':
+                compressed = brotli.compress(content, quality=11)
+            else:
+                compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            _write_atomic(target + suffix, compressed)
+
+    _write_atomic(
+        os.path.join(dist_dir, MANIFEST_NAME),
+        json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+    )
+
+    for root, _, files in os.walk(dist_dir):
+        for name in files:
+            full_path = os.path.join(root, name)
+            if os.path.relpath(full_path, dist_dir).replace(os.sep, '/') not in expected \
+                    and not name.endswith('.tmp'):
+                os.remove(full_path)
+
+    _manifest = manifest
+    return manifest
+
+def _rewrite_references(path: str, text: str, sources: Dict[str, str], build) -> str:
+    """Point references to other assets in a CSS or JS file at their hashed URLs."""
+
+    def hashed_url(reference: str) -> Optional[str]:
+        target = _resolve(reference, path, sources)
+        hashed = build(target) if target else None
+        return DIST_URL_PREFIX + hashed if hashed else None
+
+    def replace_reference(match) -> str:
+        url = hashed_url(match.group(3))
+        if url is None:
+            return match.group(0)
+        return f"{match.group(1)}{match.group(2)}{url}{match.group(2)}"
+
+    def replace_literal(match) -> str:
+        url = hashed_url(match.group(2))
+        return f"{match.group(1)}{url}{match.group(1)}" if url else match.group(0)
+
+    if path.endswith('.css'):
+        return _CSS_REFERENCE.sub(replace_reference, text)
+    text = _JS_REFERENCE.sub(replace_reference, text)
+    return _STATIC_LITERAL.sub(replace_literal, text)
+
+class StaticAssetFiles(StaticFiles):
+    """StaticFiles with a fixed Cache-Control that serves a precompressed .br/.gz
+    sibling of a text asset when the client accepts that encoding."""
+
+    def __init__(self, *args, cache_control: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+
+    async def get_response(self, path: str, scope):
+        response = None
+        compressible = path.endswith(COMPRESSIBLE_SUFFIXES)
+        if compressible:
+            accepted = accepted_encodings(Headers(scope=scope))
+            for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+                if encoding not in accepted:
+                    continue
+                full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+                if stat_result and stat.S_ISREG(stat_result.st_mode):
+                    # The media type is guessed from the full name, e.g. styles.css.br -> text/css
+                    response = self.file_response(full_path, stat_result, scope)
+                    response.headers["Content-Encoding"] = encoding
+                    break
+
+        if response is None:
+            response = await super().get_response(path, scope)
+        response.headers["Cache-Control"] = self.cache_control
+        if compressible:
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
@@ -0,0 +1,63 @@
+import pytest
+from agents.candidates import extract_token_candidates, no_candidates_report, NO_CANDIDATES_REASONING
+
+EVM_ADDRESS = "0x4ed4E862860beD51a9570b96d89aF5E1B0Efefed"
+SOLANA_MINT = "EKpQGSJtjMFqKZ9KQanSqYXRcF8fBopzLHYxdM65zcjm"
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "gm frens",
+        "",
+        "this is up $5k since yesterday and $1.2m volume",
+        "email me at dev$team@example.com",
+        "Thisisaverylongwordwithoutanydigitsatallinthepost",
+        "123456789123456789123456789123456789",
+        "0x4ed4E862860beD51a9570b96d89aF5E1B0Efef is one hex digit short",
+    ]
+)
+def test_posts_without_token_candidates(text):
+    assert not extract_token_candidates(text)
+
+def test_evm_address():
+    candidates = extract_token_candidates(f"ape {EVM_ADDRESS} now")
+    assert candidates.evm_addresses == [EVM_ADDRESS]
+    assert candidates
+
+def test_solana_mint_needs_mixed_case_and_a_digit():
+    assert extract_token_candidates(f"CA: {SOLANA_MINT}").solana_mints == [SOLANA_MINT]
+    # Base58 only: a 0 makes it something else
+    assert extract_token_candidates("CA: 0KpQGSJtjMFqKZ9KQanSqYXRcF8fBopzLHYxdM65zcjm").solana_mints == []
+
+@pytest.mark.parametrize(
+    "text,cashtags",
+    [
+        ("$degen is sending", ["DEGEN"]),
+        ("$WIF and $bonk, not $5 or $100k", ["WIF", "BONK"]),
+        ("price$TAG is not a cashtag", []),
+    ]
+)
+def test_cashtags_are_not_prices(text, cashtags):
+    assert extract_token_candidates(text).cashtags == cashtags
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "chart: https://dexscreener.com/base/0xabc",
+        "on www.pump.fun/coin/xyz",
+        "HTTPS://GeckoTerminal.com/solana/pools/abc",
+        "trade it on app.uniswap.org",
+    ]
+)
+def test_dex_links(text):
+    candidates = extract_token_candidates(text)
+    assert len(candidates.dex_urls) == 1
+    assert candidates
+
+def test_other_links_are_not_dex_links():
+    assert not extract_token_candidates("read https://example.com/dexscreener-review")
+
+def test_no_candidates_report_is_negative_and_marked():
+    report = no_candidates_report()
+    assert report["mentions_purchasable_token"] is False
+    assert report["reasoning"] == NO_CANDIDATES_REASONING
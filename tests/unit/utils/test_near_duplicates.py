@@ -0,0 +1,122 @@
+import time
+import pytest
+from db.near_duplicates import (
+    NearDuplicateIndex, post_fingerprint, post_words, token_reference_key, SIGNATURE_SIZE
+)
+
+POST = "ape into $SHL right now before this chart goes vertical, dev is based and the community is cooking"
+
+def fingerprint(text):
+    result = post_fingerprint(text)
+    assert result is not None
+    return result
+
+def test_words_drop_emojis_punctuation_and_case():
+    assert post_words("GM 🚀🚀 frens!!! $SHL is SENDING...") == ["gm", "frens", "$shl", "is", "sending"]
+
+def test_signature_is_deterministic_and_sized():
+    first, second = fingerprint(POST), fingerprint(POST)
+    assert first == second
+    assert len(first.signature) == SIGNATURE_SIZE * 4
+
+def test_short_posts_are_not_fingerprinted():
+    assert post_fingerprint("$SHL to the moon") is None
+
+def test_token_reference_key_is_canonical():
+    address = "0x4ed4E862860beD51a9570b96d89aF5E1B0Efefed"
+    assert token_reference_key(f"$shl {address} $SHL") == ("$SHL", address.lower())
+
+@pytest.mark.parametrize(
+    "variant",
+    [
+        "🚀🚀 " + POST + " 🔥",
+        POST.upper() + "!!!",
+        POST + " not financial advice, do your own research",
+    ]
+)
+def test_near_duplicates_match(variant):
+    index = NearDuplicateIndex(threshold=0.7)
+    index.add(fingerprint(POST), 42)
+
+    match = index.find(fingerprint(variant))
+
+    assert match is not None
+    assert match[0] == 42
+    assert 0.7 <= match[1] <= 1.0
+
+def test_other_token_never_matches():
+    index = NearDuplicateIndex(threshold=0.7)
+    index.add(fingerprint(POST), 42)
+
+    assert index.find(fingerprint(POST.replace("$SHL", "$OTHER"))) is None
+
+def test_different_text_does_not_match():
+    index = NearDuplicateIndex(threshold=0.7)
+    index.add(fingerprint(POST), 42)
+
+    assert index.find(fingerprint("$SHL stealth launch, liquidity locked and renounced, early holders are up big")) is None
+
+def test_threshold_decides_the_match():
+    variant = fingerprint(POST + " not financial advice, do your own research")
+    loose, strict = NearDuplicateIndex(threshold=0.5), NearDuplicateIndex(threshold=1.0)
+    for index in (loose, strict):
+        index.add(fingerprint(POST), 42)
+
+    assert loose.find(variant) is not None
+    assert strict.find(variant) is None
+    assert strict.find(fingerprint(POST)) == (42, 1.0)
+
+def test_newest_of_equal_matches_wins():
+    index = NearDuplicateIndex(threshold=0.7)
+    now = time.time()
+    index.add(fingerprint(POST), 1, now - 10)
+    index.add(fingerprint(POST), 2, now - 5)
+
+    assert index.find(fingerprint(POST)) == (2, 1.0)
+
+def test_expired_entries_are_ignored_and_dropped():
+    index = NearDuplicateIndex(threshold=0.7, max_age_seconds=60)
+    index.add(fingerprint(POST), 1, time.time() - 120)
+    assert index.find(fingerprint(POST)) is None
+
+    # The next add expires it from the front of the window
+    index.add(fingerprint("$OTHER stealth launch, liquidity locked and renounced, early holders are up"), 2)
+    assert len(index) == 1
+
+def test_expiry_collapses_shared_buckets():
+    index = NearDuplicateIndex(threshold=0.7, max_age_seconds=3600)
+    post = fingerprint(POST)
+    now = time.time()
+    for value, age in ((1, 120), (2, 30), (3, 20)):
+        index.add(post, value, now - age)
+
+    def buckets():
+        return [index._bands[band][band_hash] for band, band_hash in index._band_hashes(post)]
+
+    assert buckets() == [[0, 1, 2]] * len(index._bands)
+
+    # Each add expires what has left the window; a bucket down to one entry holds its bare id
+    index.max_age_seconds = 60
+    index.add(fingerprint(POST.replace("$SHL", "$OTHER")), 4)
+    assert buckets() == [[1, 2]] * len(index._bands)
+
+    index.max_age_seconds = 25
+    index.add(fingerprint(POST.replace("$SHL", "$THIRD")), 5)
+    assert buckets() == [2] * len(index._bands)
+    assert index.find(post) == (3, 1.0)
+
+def test_disabled_index_stores_nothing():
+    index = NearDuplicateIndex(threshold=0)
+    index.add(fingerprint(POST), 1)
+
+    assert not index.enabled
+    assert len(index) == 0
+    assert index.find(fingerprint(POST)) is None
+
+def test_stats_count_hits_and_misses():
+    index = NearDuplicateIndex(threshold=0.7)
+    index.add(fingerprint(POST), 1)
+    index.find(fingerprint(POST))
+    index.find(fingerprint(POST.replace("$SHL", "$OTHER")))
+
+    assert index.stats() == {"entries": 1, "threshold": 0.7, "hits": 1, "misses": 1, "hit_rate": 0.5}
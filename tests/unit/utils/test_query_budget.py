@@ -0,0 +1,67 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from query_budget import QueryBudgetExceeded, QueryStatsMiddleware, query_budget
+
+@pytest.fixture
+def test_db_engine():
+    """In-memory SQLite engine; statement counting hooks every engine."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    yield engine
+    engine.dispose()
+
+def create_app(test_db_engine) -> FastAPI:
+    """App whose endpoints run a given number of statements against a budget of two."""
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    def run_statements(n: int) -> None:
+        with test_db_engine.connect() as conn:
+            for _ in range(n):
+                conn.execute(text("SELECT 1"))
+
+    @app.get("/within")
+    @query_budget(2)
+    def within_budget():
+        run_statements(2)
+        return {"ok": True}
+
+    @app.get("/over")
+    @query_budget(2)
+    def over_budget():
+        run_statements(3)
+        return {"ok": True}
+
+    return app
+
+@pytest.fixture
+def client(test_db_engine, monkeypatch) -> TestClient:
+    """Client with budgets checked in strict mode, as tests run them."""
+    monkeypatch.setenv("QUERY_BUDGET_STRICT", "1")
+    with TestClient(create_app(test_db_engine)) as client:
+        yield client
+
+def test_endpoint_within_budget_passes_and_reports_its_queries(client):
+    response = client.get("/within")
+
+    assert response.status_code == 200
+    assert response.headers["X-DB-Queries"] == "2"
+    assert 'desc="2 queries"' in response.headers["Server-Timing"]
+
+def test_endpoint_over_budget_fails_in_strict_mode(client):
+    with pytest.raises(QueryBudgetExceeded, match="ran 3 queries, over its budget of 2"):
+        client.get("/over")
+
+def test_endpoint_over_budget_only_warns_outside_strict_mode(test_db_engine, monkeypatch, capsys):
+    monkeypatch.delenv("QUERY_BUDGET_STRICT", raising=False)
+    with TestClient(create_app(test_db_engine)) as client:
+        response = client.get("/over")
+
+    assert response.status_code == 200
+    assert "over its budget of 2" in capsys.readouterr().out
@@ -0,0 +1,32 @@
+from db.cache import ResponseCache
+
+def test_store_skipped_only_for_recently_invalidated_tags():
+    cache = ResponseCache(settle_seconds=60)
+    cache.invalidate("token:1")
+
+    cache.set("token-1", {"id": 1}, tags=["token:1"])
+    cache.set("token-2", {"id": 2}, tags=["token:2"])
+
+    assert cache.get("token-1") is None
+    assert cache.get("token-2") == {"id": 2}
+
+def test_store_allowed_once_the_tag_has_settled():
+    cache = ResponseCache(settle_seconds=0.01)
+    cache.invalidate("token:1")
+    cache._invalidated_at["token:1"] -= 1
+
+    cache.set("token-1", {"id": 1}, tags=["token:1"])
+
+    assert cache.get("token-1") == {"id": 1}
+
+def test_invalidation_drops_tagged_entries_without_a_settle_window():
+    cache = ResponseCache()
+    cache.set("token-1", {"id": 1}, tags=["token:1"])
+    cache.set("tokens", [1, 2], tags=["token:1", "token:2"])
+    cache.set("token-2", {"id": 2}, tags=["token:2"])
+
+    assert cache.invalidate("token:1") == 2
+    assert cache.get("token-1") is None
+    assert cache.get("tokens") is None
+    assert cache.get("token-2") == {"id": 2}
+    assert cache._invalidated_at == {}